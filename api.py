@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP/JSON API for the LunchSquad application.
+
+A small stdlib HTTP server (a thread pool serves the connections) that
+runs next to the Streamlit app and works on the same order managers, so
+scripts and chat bots can submit orders without a browser session:
+
+    POST   /api/orders             one order (JSON object) or a batch (JSON array)
+    GET    /api/orders             current orders; filters: type, shop, name,
+                                   since, until (ISO timestamps, until exclusive)
+    DELETE /api/orders/<id>        remove one order
+    GET    /api/summary            kitchen summary
+    GET    /metrics                performance metrics (Prometheus text format)
+
+All /api routes take ?team=<name> to work on the orders of a team (see
+teams.py); without it they work on the default team, like the app.
+
+Orders are checked with the same validators as the forms; a batch is
+only added if all of its orders are valid, and then in a single write.
+Errors are answered as {"error": "..."} or, for invalid orders,
+{"errors": {"<position>": "..."}}.
+
+Usage:
+    python api.py [port]    (standalone, without the Streamlit app)
+"""
+
+import hmac
+import json
+import queue
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from config import API_HOST, API_IDLE_TIMEOUT, API_MAX_BODY_BYTES, API_PORT, API_TOKEN, API_WORKERS
+from metrics import METRICS
+from validation import validate_orders
+
+# Query parameters of GET /api/orders -> arguments of OrderManager.query_orders
+ORDER_FILTERS = {"type": "order_type", "shop": "shop", "name": "name", "since": "since", "until": "until"}
+
+
+class ApiError(Exception):
+    """Error answered with an HTTP status and a JSON body"""
+
+    def __init__(self, status, body):
+        super().__init__(body)
+        self.status = status
+        self.body = body if isinstance(body, dict) else {"error": body}
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer that handles connections in a fixed pool of worker threads.
+    The workers are daemon threads, so open keep-alive connections don't
+    keep the process from exiting.
+    """
+
+    def __init__(self, address, handler_class, teams, workers=API_WORKERS, token=API_TOKEN):
+        self.teams = teams
+        self.token = token
+        self._connections = queue.Queue()
+        super().__init__(address, handler_class)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"lunch-api-{number}", daemon=True)
+            for number in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def process_request(self, request, client_address):
+        self._connections.put((request, client_address))
+
+    def _work(self):
+        while True:
+            request, client_address = self._connections.get()
+            if request is None:
+                return
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._workers:
+            self._connections.put((None, None))
+
+
+class OrderApiHandler(BaseHTTPRequestHandler):
+    """Request handler of the order API"""
+
+    # Keep-alive, so a client can send many orders over one connection
+    protocol_version = "HTTP/1.1"
+    server_version = "LunchSquadAPI"
+    # Idle keep-alive connections are closed after this many seconds, so
+    # they don't hold a worker
+    timeout = API_IDLE_TIMEOUT
+    # Headers and body are written separately; without TCP_NODELAY the
+    # body waits for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch({
+            ("api", "orders"): self._get_orders,
+            ("api", "summary"): self._get_summary,
+            ("metrics",): self._get_metrics,
+        })
+
+    def do_POST(self):
+        self._dispatch({("api", "orders"): self._post_orders})
+
+    def do_DELETE(self):
+        self._dispatch({("api", "orders", None): self._delete_order})
+
+    def _dispatch(self, routes):
+        """Find the route of the request path and answer with its result"""
+        url = urlsplit(self.path)
+        parts = tuple(unquote(part) for part in url.path.strip("/").split("/"))
+        for route, handler in routes.items():
+            if len(route) == len(parts) and all(r is None or r == p for r, p in zip(route, parts)):
+                break
+        else:
+            # An unread request body would be taken for the next request
+            self.close_connection = True
+            self._send_json(404, {"error": "Nicht gefunden."})
+            return
+        name = f"api_{self.command.lower()}_{route[-1] or route[-2]}"
+        with METRICS.timer(name) as timer:
+            try:
+                self._check_token()
+                status, body = handler(parts, parse_qs(url.query))
+            except ApiError as e:
+                status, body = e.status, e.body
+            except Exception as e:
+                print(f"Error handling API request {self.command} {self.path}: {e}")
+                status, body = 500, {"error": "Interner Fehler."}
+            timer.bytes = self._send(status, body)
+
+    def _check_token(self):
+        if self.server.token is None:
+            return
+        expected = f"Bearer {self.server.token}"
+        if not hmac.compare_digest(self.headers.get("Authorization", ""), expected):
+            self.close_connection = True
+            raise ApiError(401, "Ungültiges oder fehlendes Token.")
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            raise ApiError(411, "Content-Length fehlt.")
+        if length > API_MAX_BODY_BYTES:
+            # The body is not read, so the connection can't be reused
+            self.close_connection = True
+            raise ApiError(413, f"Anfrage zu groß (maximal {API_MAX_BODY_BYTES} Bytes).")
+        try:
+            return json.loads(self.rfile.read(length))
+        except (UnicodeDecodeError, ValueError) as e:
+            raise ApiError(400, f"Ungültiges JSON: {e}")
+
+    def _order_manager(self, query):
+        """Order manager of the team in the query (removed from the query)"""
+        team = query.pop("team", [None])[-1]
+        try:
+            return self.server.teams.get(team)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+    def _post_orders(self, parts, query):
+        data = self._read_json()
+        order_manager = self._order_manager(query)
+        batch = isinstance(data, list)
+        orders = data if batch else [data]
+        if not orders:
+            raise ApiError(400, "Keine Bestellungen.")
+        errors = validate_orders(orders)
+        if errors:
+            raise ApiError(422, {"errors": {str(row): message for row, message in errors.items()}})
+
+        if not order_manager.add_orders(orders):
+            raise ApiError(507, f"Bestelllimit des Teams erreicht (höchstens {order_manager.max_orders}).")
+        return 201, orders if batch else orders[0]
+
+    def _get_orders(self, parts, query):
+        order_manager = self._order_manager(query)
+        unknown = set(query) - set(ORDER_FILTERS)
+        if unknown:
+            raise ApiError(400, f"Unbekannter Filter: {', '.join(sorted(unknown))}")
+        filters = {ORDER_FILTERS[key]: values[-1] for key, values in query.items()}
+        # Pick up orders written by other processes (e.g. a second app server)
+        order_manager.refresh_orders()
+        return 200, list(order_manager.query_orders(**filters))
+
+    def _delete_order(self, parts, query):
+        order_manager = self._order_manager(query)
+        if not order_manager.remove_order(parts[-1]):
+            raise ApiError(404, "Bestellung nicht gefunden.")
+        return 200, {"removed": parts[-1]}
+
+    def _get_summary(self, parts, query):
+        order_manager = self._order_manager(query)
+        order_manager.refresh_orders()
+        return 200, order_manager.get_summary().as_dict()
+
+    def _get_metrics(self, parts, query):
+        return 200, METRICS.to_prometheus()
+
+    def _send(self, status, body):
+        """Send a JSON body (or text for str bodies); returns the body size"""
+        if isinstance(body, str):
+            return self._send_bytes(status, body.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        return self._send_json(status, body)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        return self._send_bytes(status, data, "application/json; charset=utf-8")
+
+    def _send_bytes(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def log_message(self, format, *args):
+        # Only errors are printed (one line per request would flood the log)
+        pass
+
+    def log_error(self, format, *args):
+        print(f"API: {format % args}")
+
+
+def start_api_server(teams, host=API_HOST, port=API_PORT, workers=API_WORKERS, token=API_TOKEN):
+    """
+    Start the API in a background thread.
+
+    Args:
+        teams (TeamRegistry): The order managers of the teams to work on
+        host (str): Address to listen on
+        port (int): Port to listen on (0 picks a free port)
+        workers (int): Number of worker threads
+        token (str): Bearer token required in the Authorization header
+            (None: no token)
+
+    Returns:
+        PooledHTTPServer: The running server (server_address holds the
+            actual port), or None if the port is not available
+    """
+    try:
+        server = PooledHTTPServer((host, port), OrderApiHandler, teams, workers=workers, token=token)
+    except OSError as e:
+        print(f"Error starting the order API on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="lunch-api", daemon=True).start()
+    return server
+
+
+def main(port=API_PORT):
+    from teams import TeamRegistry
+    server = PooledHTTPServer((API_HOST, port), OrderApiHandler, TeamRegistry())
+    print(f"Order API listening on http://{API_HOST}:{server.server_address[1]}/api/orders")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else API_PORT)
@@ -9,32 +9,39 @@ restaurants (YamYam, Döner, Edeka) with customizable orders.
 """
 
 import streamlit as st
-import pandas as pd
 import os
-import json
-from datetime import datetime
-from PIL import Image
+import threading
+from datetime import datetime, timedelta
 
-from models import OrderManager
+from teams import get_team_registry, normalize_team
+from api import start_api_server
+from importer import ImportJob
 from config import (
     APP_TITLE, 
     YAMYAM_OPTIONS, 
     DONER_OPTIONS, 
     EDEKA_OPTIONS, 
-    DEFAULT_ORDER_FILE
+    DEFAULT_ORDER_FILE,
+    API_ENABLED,
+    METRICS_FILE,
+    METRICS_FILE_INTERVAL,
+    ORDER_TABLE_REFRESH_SECONDS
 )
 from utils import (
-    create_download_link,
-    create_download_link_json,
-    create_download_link_text,
-    create_text_report,
-    create_image_report,
-    create_download_link_image,
+    create_export,
+    write_csv_export,
+    write_json_export,
+    write_text_export,
+    write_image_export,
+    image_report_page_count,
+    load_report_fonts,
     validate_yamyam_order,
     validate_doner_order,
     validate_edeka_order
 )
+from rendering import PRODUCT_LABELS, RESTAURANT_LABELS, SAUCE_LABELS, SHOP_LABELS, format_orders_dataframe
 from cloud_storage import CloudStorage
+from metrics import METRICS
 
 # Set page config
 st.set_page_config(
@@ -49,87 +56,141 @@ if "current_view" not in st.session_state:
 if "selected_shop" not in st.session_state:
     st.session_state.selected_shop = None
 
-# Initialize order manager if not already present
-# This will automatically handle cloud persistence
-if "order_manager" not in st.session_state:
-    st.session_state.order_manager = OrderManager()
+# Hidden admin view with the performance metrics (not in the navigation,
+# opened with ?admin=metrics)
+if st.query_params.get("admin") == "metrics":
+    st.session_state.current_view = "admin"
 
-# Ensure orders are properly initialized in session state
-# This maintains backward compatibility with existing code
-if "orders" not in st.session_state:
-    st.session_state.orders = st.session_state.order_manager.get_orders()
-else:
-    # Make sure order_manager has the latest orders if they were modified elsewhere
-    if len(st.session_state.orders) != len(st.session_state.order_manager.orders):
-        st.session_state.order_manager.orders = st.session_state.orders
+def _warm_up_display(order_manager):
+    """Import pandas, build the order table and load the report fonts"""
+    try:
+        order_manager.get_orders_dataframe()
+        load_report_fonts()
+    except Exception as e:
+        print(f"Error warming up: {e}")
+
+@st.cache_resource
+def warm_up():
+    """
+    Load everything that is shared by all sessions once per process.
+    The orders of the default team (and with them the summary), pandas,
+    the order table and the report fonts are loaded in the background, so
+    this doesn't wait for them.
+    The order API (api.py) is started here as well and works on the same
+    order managers.
+
+    Returns:
+        TeamRegistry: The order managers of all teams
+    """
+    teams = get_team_registry()
+    threading.Thread(target=_warm_up_display, args=(teams.get(),), daemon=True).start()
+    METRICS.start_file_export(METRICS_FILE, METRICS_FILE_INTERVAL)
+    if API_ENABLED:
+        start_api_server(teams)
+    return teams
+
+# The team comes from the URL (?team=<name>); every team has its own orders
+try:
+    team = normalize_team(st.query_params.get("team"))
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+if st.session_state.get("team") != team:
+    # The revision seen of another team's orders means nothing here
+    st.session_state.pop("orders_revision", None)
+    st.session_state.team = team
+
+def current_order_manager():
+    """
+    The process-wide order manager of the session's team, shared by all
+    sessions of the team (no per-session copies). Asked from the registry
+    every time, so a team dropped from memory as idle is loaded again.
+    """
+    return warm_up().get(st.session_state.team)
+
+# Pick up orders written by other server processes
+current_order_manager().refresh_orders()
+
+# Sessions keep no copy of the orders, only the revision of the order list
+# they showed last (orders_revision, set by the order tables). Changes go
+# through the shared order manager, which checks the change feed since
+# that revision where it matters (see clear_orders)
 
 def save_orders():
     """Save orders to persistent storage"""
-    # Make sure OrderManager has the current list
-    st.session_state.order_manager.orders = st.session_state.orders
-    # Save orders
-    success = st.session_state.order_manager.save_orders()
-    if success:
+    # Write the changes the background writer has not written yet
+    # (all other orders are saved already)
+    if current_order_manager().flush():
         st.success("Bestellungen wurden erfolgreich gespeichert.")
     else:
-        st.error("Bestellungen konnten nicht gespeichert werden.")
+        st.error("Die Bestellungen konnten nicht gespeichert werden; es wird erneut versucht.")
 
 def add_order(order_data):
     """Add a new order"""
-    # Add order to session state
-    order_data["timestamp"] = datetime.now().isoformat()
-    st.session_state.orders.append(order_data)
-    # Update order manager
-    st.session_state.order_manager.orders = st.session_state.orders
-    # Save orders explicitly
-    st.session_state.order_manager.save_orders()
-    
-    # Inform user
-    st.success(f"Bestellung für {order_data['name']} hinzugefügt!")
+    # Add order via the shared order manager (persists only the new order)
+    order_manager = current_order_manager()
+    if not order_manager.add_order(order_data):
+        st.error(f"Das Team hat bereits {order_manager.max_orders} Bestellungen, "
+                 "mehr sind nicht möglich.")
+        return
     
-    # Return to main view
-    st.session_state.current_view = "order_list"
-    st.rerun()
+    # Inform user; only the form's fragment reruns, the form stays open
+    # for the next order
+    count = len(order_manager.get_orders())
+    st.success(f"Bestellung für {order_data['name']} hinzugefügt! ({count} Bestellungen insgesamt)")
 
-def remove_order(index):
-    """Remove an order by index"""
-    if 0 <= index < len(st.session_state.orders):
-        del st.session_state.orders[index]
-        # Update order manager
-        st.session_state.order_manager.orders = st.session_state.orders
-        # Save orders explicitly
-        st.session_state.order_manager.save_orders()
-        st.success("Bestellung entfernt.")
-        st.rerun()
+def remove_order(order_id):
+    """
+    Remove an order by its ID. Used as button callback, so the order
+    table drawn afterwards (in the same fragment run) no longer shows it.
+    """
+    # Remove order via the shared order manager (persists only the removal)
+    if current_order_manager().remove_order(order_id):
+        st.session_state.order_notice = "Bestellung entfernt."
+    else:
+        st.session_state.order_notice = "Die Bestellung wurde bereits entfernt."
 
 def clear_orders():
-    """Clear all orders"""
-    # Clear session state orders
-    st.session_state.orders = []
-    # Update the order manager with empty list
-    st.session_state.order_manager.orders = []
-    # Call the clear_orders method which should also save the empty list
-    success = st.session_state.order_manager.clear_orders()
-    # Save explicitly to ensure persistence
-    st.session_state.order_manager.save_orders()
-    if success:
+    """
+    Clear all orders (persisted by the order manager). Orders added since
+    this session last showed the order list are not cleared unseen.
+    """
+    if current_order_manager().clear_orders(st.session_state.get("orders_revision")):
         st.success("Alle Bestellungen wurden gelöscht.")
     else:
-        st.error("Fehler beim Löschen der Bestellungen.")
-    st.rerun()
+        st.warning("Inzwischen wurden neue Bestellungen hinzugefügt. Bitte prüfe die Liste und lösche dann erneut.")
+
+def clear_confirmed_orders():
+    """
+    Clear all orders once the checkbox confirms it. Used as button callback,
+    so it runs before the order list is redrawn and checks against the
+    revision the user actually saw.
+    """
+    if st.session_state.get("confirm_checkbox"):
+        clear_orders()
+    else:
+        st.error("Bitte bestätige zuerst, dass du alle Bestellungen löschen möchtest.")
 
 def change_view(view_name):
     """Change the current view"""
     st.session_state.current_view = view_name
+    st.query_params.pop("admin", None)
     st.rerun()
 
 def select_shop(shop_value):
     """Select a specific döner shop"""
     st.session_state.selected_shop = shop_value
 
+def counts_frame(counts, labels=None, limit=None):
+    """Turn (value, count) tuples into a DataFrame for st.bar_chart"""
+    import pandas as pd
+    counts = counts[:limit] if limit else counts
+    index = [labels.get(value, value) if labels else value for value, _ in counts]
+    return pd.DataFrame({"Anzahl": [count for _, count in counts]}, index=index)
+
 # Sidebar navigation
 st.sidebar.title("LunchSquad 🍱")
-st.sidebar.caption("Team Lunch Organizer")
+st.sidebar.caption(f"Team {st.session_state.team}" if st.session_state.team else "Team Lunch Organizer")
 
 # Navigation buttons
 if st.sidebar.button("Hauptmenü", use_container_width=True):
@@ -138,67 +199,140 @@ if st.sidebar.button("Hauptmenü", use_container_width=True):
 if st.sidebar.button("Alle Bestellungen", use_container_width=True):
     change_view("order_list")
 
+if st.sidebar.button("Zusammenfassung", use_container_width=True):
+    change_view("summary")
+
+if st.sidebar.button("Verlauf", use_container_width=True):
+    change_view("history")
+
 # Export/Import section in sidebar
+# The sidebar panels, the restaurant forms and the order tables are
+# fragments: interacting with one of them only reruns that fragment, not
+# the whole script (and not the order table)
 st.sidebar.markdown("---")
-st.sidebar.subheader("Bestellungen verwalten")
 
-if st.sidebar.button("Speichern", use_container_width=True):
-    save_orders()
+# Export download button
+# The payload is only generated when the button is clicked, so reruns
+# don't build (or send) the export
+def export_payload(order_manager, export_format):
+    """Create a callable that builds the export in the given format"""
+    def build():
+        if export_format == "JSON":
+            return create_export(write_json_export, list(order_manager.get_orders()))
+        elif export_format == "CSV":
+            return create_export(write_csv_export, order_manager.get_orders_dataframe())
+        orders, summary = order_manager.get_orders_and_summary()
+        if export_format == "TXT":
+            return create_export(write_text_export, orders, summary=summary)
+        return create_export(write_image_export, orders, summary=summary)
+    return build
 
-# Export options dropdown in sidebar
-export_option = st.sidebar.selectbox(
-    "Export Format",
-    ["JSON", "CSV", "TXT", "Bild (PNG)"]
-)
+EXPORT_FILES = {
+    "JSON": ("lunch_orders.json", "application/json"),
+    "CSV": ("lunch_orders.csv", "text/csv"),
+    "TXT": ("lunch_orders.txt", "text/plain"),
+    "Bild (PNG)": ("lunch_orders.png", "image/png"),
+}
 
-# Export button
-if st.sidebar.button("Exportieren", use_container_width=True):
-    if len(st.session_state.orders) == 0:
-        st.sidebar.warning("Keine Bestellungen zum Exportieren vorhanden.")
-    else:
-        if export_option == "JSON":
-            # Create download link for JSON
-            json_href = create_download_link_json(st.session_state.orders)
-            st.sidebar.markdown(f'<a href="{json_href}" download="lunch_orders.json">Download JSON</a>', unsafe_allow_html=True)
-        
-        elif export_option == "CSV":
-            # Convert to dataframe and create CSV download link
-            df = st.session_state.order_manager.get_orders_dataframe()
-            csv_href = create_download_link(df)
-            st.sidebar.markdown(f'<a href="{csv_href}" download="lunch_orders.csv">Download CSV</a>', unsafe_allow_html=True)
-        
-        elif export_option == "TXT":
-            # Create text report and download link
-            text_report = create_text_report(st.session_state.orders)
-            txt_href = create_download_link_text(text_report)
-            st.sidebar.markdown(f'<a href="{txt_href}" download="lunch_orders.txt">Download TXT</a>', unsafe_allow_html=True)
-        
-        elif export_option == "Bild (PNG)":
-            # Create image report and download link
-            img = create_image_report(st.session_state.orders)
-            if img:
-                img_href = create_download_link_image(img)
-                st.sidebar.markdown(f'<a href="{img_href}" download="lunch_orders.png">Download PNG</a>', unsafe_allow_html=True)
-            else:
-                st.sidebar.error("Fehler beim Erstellen des Bildes.")
+@st.fragment
+def export_panel():
+    """Save button and export of the orders in the chosen format"""
+    order_manager = current_order_manager()
+    st.subheader("Bestellungen verwalten")
 
-# Import orders from JSON
-st.sidebar.markdown("---")
-st.sidebar.subheader("Bestellungen importieren")
-uploaded_file = st.sidebar.file_uploader("JSON Datei hochladen", type="json")
-if uploaded_file is not None:
-    try:
-        imported_orders = json.load(uploaded_file)
-        if isinstance(imported_orders, list):
-            st.session_state.orders = imported_orders
-            st.session_state.order_manager.orders = imported_orders
-            st.session_state.order_manager.save_orders()
-            st.sidebar.success(f"{len(imported_orders)} Bestellungen importiert.")
-            st.rerun()
+    if st.button("Speichern", use_container_width=True):
+        save_orders()
+
+    # Export options dropdown
+    export_option = st.selectbox(
+        "Export Format",
+        ["JSON", "CSV", "TXT", "Bild (PNG)"]
+    )
+
+    orders = order_manager.get_orders()
+    if len(orders) == 0:
+        st.caption("Keine Bestellungen zum Exportieren vorhanden.")
+        return
+    export_file_name, export_mime = EXPORT_FILES[export_option]
+    if export_option == "Bild (PNG)" and image_report_page_count(orders, order_manager.get_summary()) > 1:
+        # Large reports are split into pages and downloaded as ZIP
+        export_file_name, export_mime = "lunch_orders_png.zip", "application/zip"
+    st.download_button(
+        "Exportieren",
+        data=export_payload(order_manager, export_option),
+        file_name=export_file_name,
+        mime=export_mime,
+        on_click="ignore",
+        use_container_width=True
+    )
+
+with st.sidebar:
+    export_panel()
+
+# Import orders from JSON / JSONL
+# The file is parsed in a background thread; only the progress display
+# below reruns while the import is running
+def start_import(uploaded_file, replace):
+    """Start importing an uploaded file in the background"""
+    uploaded_file.seek(0)
+    st.session_state.import_report = None
+    st.session_state.import_job = ImportJob(
+        current_order_manager(),
+        uploaded_file,
+        uploaded_file.size,
+        replace=replace,
+    ).start()
+
+@st.fragment(run_every=0.5)
+def import_progress():
+    """
+    Show the progress of the running import; rerun the app when done
+    (the import changed the orders, so every part of the page is stale)
+    """
+    job = st.session_state.get("import_job")
+    if job is None:
+        return
+    if not job.done:
+        st.progress(job.progress, text=f"{job.rows} Einträge gelesen ...")
+        return
+    st.session_state.import_job = None
+    st.session_state.import_report = job
+    st.rerun()
+
+@st.fragment
+def import_panel():
+    """Upload and import of order files, with the progress of a running import"""
+    st.subheader("Bestellungen importieren")
+    uploaded_file = st.file_uploader("JSON/JSONL Datei hochladen", type=["json", "jsonl"])
+    import_mode = st.radio(
+        "Importmodus",
+        ["Zusammenführen", "Ersetzen"],
+        help="Zusammenführen überspringt bereits vorhandene Bestellungen."
+    )
+    import_running = st.session_state.get("import_job") is not None
+    if st.button("Importieren", disabled=uploaded_file is None or import_running,
+                 use_container_width=True):
+        start_import(uploaded_file, replace=import_mode == "Ersetzen")
+        import_running = True
+
+    if import_running:
+        import_progress()
+
+    import_report = st.session_state.get("import_report")
+    if import_report is not None:
+        if import_report.error:
+            st.error(f"Fehler beim Import: {import_report.error}")
         else:
-            st.sidebar.error("Ungültiges JSON-Format. Eine Liste von Bestellungen wird erwartet.")
-    except Exception as e:
-        st.sidebar.error(f"Fehler beim Import: {str(e)}")
+            st.success(
+                f"{import_report.imported} Bestellungen importiert "
+                f"({import_report.duplicates} doppelt, {import_report.invalid} ungültig)."
+            )
+        for message in import_report.errors:
+            st.caption(message)
+
+st.sidebar.markdown("---")
+with st.sidebar:
+    import_panel()
 
 # Reset orders button
 if st.sidebar.button("Alle Bestellungen löschen", use_container_width=True):
@@ -206,60 +340,10 @@ if st.sidebar.button("Alle Bestellungen löschen", use_container_width=True):
     if clear_confirm:
         clear_orders()
 
-# Main content based on current view
-if st.session_state.current_view == "main":
-    # Main selection view
-    st.title("Restaurantauswahl")
-    
-    # Create a row of 3 columns for restaurant options
-    col1, col2, col3 = st.columns(3)
-    
-    # YamYam option
-    with col1:
-        st.button(
-            f"{YAMYAM_OPTIONS['icon']} {YAMYAM_OPTIONS['name']}",
-            help=YAMYAM_OPTIONS['description'],
-            on_click=change_view,
-            args=["yamyam"],
-            use_container_width=True
-        )
-        st.caption(YAMYAM_OPTIONS['description'])
-    
-    # Döner option
-    with col2:
-        st.button(
-            f"{DONER_OPTIONS['icon']} {DONER_OPTIONS['name']}",
-            help=DONER_OPTIONS['description'],
-            on_click=change_view,
-            args=["doner"],
-            use_container_width=True
-        )
-        st.caption(DONER_OPTIONS['description'])
-    
-    # Edeka option
-    with col3:
-        st.button(
-            f"{EDEKA_OPTIONS['icon']} {EDEKA_OPTIONS['name']}",
-            help=EDEKA_OPTIONS['description'],
-            on_click=change_view,
-            args=["edeka"],
-            use_container_width=True
-        )
-        st.caption(EDEKA_OPTIONS['description'])
-    
-    # Display current orders below
-    st.markdown("---")
-    st.subheader("Aktuelle Bestellungen")
-    
-    if len(st.session_state.orders) > 0:
-        # Get formatted dataframe
-        orders_df = st.session_state.order_manager.get_orders_dataframe()
-        st.dataframe(orders_df, use_container_width=True)
-    else:
-        st.info("Noch keine Bestellungen vorhanden.")
-
-elif st.session_state.current_view == "yamyam":
-    # YamYam order form
+# Restaurant forms and order tables
+@st.fragment
+def yamyam_form():
+    """YamYam order form"""
     st.title(f"{YAMYAM_OPTIONS['icon']} {YAMYAM_OPTIONS['name']} Bestellung")
     
     # Add link to menu
@@ -285,8 +369,9 @@ elif st.session_state.current_view == "yamyam":
             else:
                 st.error(error_message)
 
-elif st.session_state.current_view == "doner":
-    # Döner order form
+@st.fragment
+def doner_form():
+    """Döner shop selection and order form"""
     st.title(f"{DONER_OPTIONS['icon']} {DONER_OPTIONS['name']} Bestellung")
     
     # Shop selection
@@ -377,8 +462,9 @@ elif st.session_state.current_view == "doner":
     else:
         st.info("Bitte wähle zuerst einen Laden aus.")
 
-elif st.session_state.current_view == "edeka":
-    # Edeka order form
+@st.fragment
+def edeka_form():
+    """Edeka order form"""
     st.title(f"{EDEKA_OPTIONS['icon']} {EDEKA_OPTIONS['name']} Bestellung")
     
     # Create form for order
@@ -440,31 +526,125 @@ elif st.session_state.current_view == "edeka":
             else:
                 st.error(error_message)
 
+# The order tables rerun on a timer, so orders added or removed by others
+# (other tabs, the API) show up without a click. A tick without changes
+# reuses the shared frame of the current revision; a tick after a few
+# changes only applies those to it (see OrderManager.get_orders_dataframe).
+@st.fragment(run_every=ORDER_TABLE_REFRESH_SECONDS)
+def order_table():
+    """Table of the current orders"""
+    order_manager = current_order_manager()
+    order_manager.refresh_orders()
+    # Revision first: if an order comes in meanwhile, the table is newer
+    # than the revision noted, never older
+    st.session_state.orders_revision = order_manager.revision
+    orders_df = order_manager.get_orders_dataframe()
+    if orders_df.empty:
+        st.info("Noch keine Bestellungen vorhanden.")
+    else:
+        st.dataframe(orders_df, use_container_width=True)
+
+def show_order_notice():
+    """Show the result of the last removal once (set by remove_order)"""
+    notice = st.session_state.pop("order_notice", None)
+    if notice:
+        st.success(notice)
+
+@st.fragment(run_every=ORDER_TABLE_REFRESH_SECONDS)
+def order_list_panel():
+    """Table of the current orders with removal of single orders"""
+    order_manager = current_order_manager()
+    order_manager.refresh_orders()
+    st.session_state.orders_revision = order_manager.revision
+    show_order_notice()
+
+    # Get the formatted dataframe
+    orders_df = order_manager.get_orders_dataframe()
+    if orders_df.empty:
+        st.info("Keine Bestellungen vorhanden.")
+        return
+    
+    # Display dataframe with orders
+    st.dataframe(orders_df, use_container_width=True)
+    
+    # Management options
+    st.subheader("Bestellungen verwalten")
+    
+    # Allow removing specific orders
+    with st.expander("Bestellung entfernen"):
+        # Create a selectbox with order descriptions; the options are
+        # order IDs, so a change by someone else can't shift the selection
+        order_options = dict(order_manager.get_order_choices())
+        selected_order_id = st.selectbox("Wähle eine Bestellung zum Entfernen:", 
+                                       options=list(order_options),
+                                       format_func=lambda order_id: order_options.get(order_id, order_id))
+        
+        # The removal runs as callback, before this fragment is redrawn
+        st.button("Ausgewählte Bestellung entfernen", on_click=remove_order, args=[selected_order_id])
+
+# Main content based on current view
+if st.session_state.current_view == "main":
+    # Main selection view
+    st.title("Restaurantauswahl")
+    
+    # Create a row of 3 columns for restaurant options
+    col1, col2, col3 = st.columns(3)
+    
+    # YamYam option
+    with col1:
+        st.button(
+            f"{YAMYAM_OPTIONS['icon']} {YAMYAM_OPTIONS['name']}",
+            help=YAMYAM_OPTIONS['description'],
+            on_click=change_view,
+            args=["yamyam"],
+            use_container_width=True
+        )
+        st.caption(YAMYAM_OPTIONS['description'])
+    
+    # Döner option
+    with col2:
+        st.button(
+            f"{DONER_OPTIONS['icon']} {DONER_OPTIONS['name']}",
+            help=DONER_OPTIONS['description'],
+            on_click=change_view,
+            args=["doner"],
+            use_container_width=True
+        )
+        st.caption(DONER_OPTIONS['description'])
+    
+    # Edeka option
+    with col3:
+        st.button(
+            f"{EDEKA_OPTIONS['icon']} {EDEKA_OPTIONS['name']}",
+            help=EDEKA_OPTIONS['description'],
+            on_click=change_view,
+            args=["edeka"],
+            use_container_width=True
+        )
+        st.caption(EDEKA_OPTIONS['description'])
+    
+    # Display current orders below
+    st.markdown("---")
+    st.subheader("Aktuelle Bestellungen")
+    
+    order_table()
+
+elif st.session_state.current_view == "yamyam":
+    yamyam_form()
+
+elif st.session_state.current_view == "doner":
+    doner_form()
+
+elif st.session_state.current_view == "edeka":
+    edeka_form()
+
 elif st.session_state.current_view == "order_list":
     # Order list view
     st.title("Bestellungen")
     
-    if len(st.session_state.orders) > 0:
-        # Get the formatted dataframe
-        orders_df = st.session_state.order_manager.get_orders_dataframe()
-        
-        # Display dataframe with orders
-        st.dataframe(orders_df, use_container_width=True)
-        
-        # Management options
-        st.subheader("Bestellungen verwalten")
-        
-        # Allow removing specific orders
-        with st.expander("Bestellung entfernen"):
-            # Create a selectbox with order descriptions
-            order_options = [f"{i+1}. {orders_df.iloc[i]['Name']} - {orders_df.iloc[i]['Restaurant']} - {orders_df.iloc[i]['Bestellung']}" 
-                           for i in range(len(orders_df))]
-            selected_order_idx = st.selectbox("Wähle eine Bestellung zum Entfernen:", 
-                                           options=range(len(order_options)),
-                                           format_func=lambda x: order_options[x])
-            
-            if st.button("Ausgewählte Bestellung entfernen"):
-                remove_order(selected_order_idx)
+    if len(current_order_manager().get_orders()) > 0:
+        # Table and removal of single orders (rerun on their own)
+        order_list_panel()
         
         # Action to clear all orders
         st.warning("⚠️ Achtung: Diese Aktion kann nicht rückgängig gemacht werden!")
@@ -484,18 +664,117 @@ elif st.session_state.current_view == "order_list":
         st.session_state.confirm_clear_all = confirmation
         
         # Button zum Löschen
-        if st.button("Alle Bestellungen löschen", key="clear_all_orders"):
-            if st.session_state.confirm_clear_all:
-                clear_orders()
-            else:
-                st.error("Bitte bestätige zuerst, dass du alle Bestellungen löschen möchtest.")
+        st.button("Alle Bestellungen löschen", key="clear_all_orders", on_click=clear_confirmed_orders)
     else:
+        # The removal of the last order is reported here
+        show_order_notice()
         st.info("Keine Bestellungen vorhanden.")
         
         # Add a button to go back to main view to add orders
         if st.button("Zurück zur Restaurantauswahl"):
             change_view("main")
 
+elif st.session_state.current_view == "summary":
+    # Kitchen summary view (counters are maintained by the order manager,
+    # so this view never scans the order list)
+    st.title("Zusammenfassung")
+    summary = current_order_manager().get_summary()
+
+    if summary.total > 0:
+        # Orders per restaurant
+        cols = st.columns(3)
+        for col, (order_type, options) in zip(cols, [("yamyam", YAMYAM_OPTIONS),
+                                                      ("doner", DONER_OPTIONS),
+                                                      ("edeka", EDEKA_OPTIONS)]):
+            with col:
+                st.metric(f"{options['icon']} {options['name']}", summary.restaurants.get(order_type, 0))
+
+        # Counts per shop, product, sauce, ... for phoning in the orders
+        lines = []
+        for level, text in summary.lines():
+            lines.append(f"\n**{text}**\n" if level == 0 else f"- {text}")
+        st.markdown("\n".join(lines))
+    else:
+        st.info("Keine Bestellungen vorhanden.")
+
+elif st.session_state.current_view == "history":
+    # History view: orders of past days, read from their day segment on demand
+    st.title("Verlauf")
+    history = current_order_manager().history
+    history_days = history.days()
+
+    if history_days:
+        selected_day = st.selectbox("Tag:", options=list(reversed(history_days)))
+        day_orders = history.load_day(selected_day)
+        st.caption(f"{len(day_orders)} Bestellungen")
+        st.dataframe(format_orders_dataframe(day_orders), use_container_width=True)
+
+        # Analytics over the Parquet archive (reads only the needed columns)
+        st.subheader("Auswertung")
+        today = datetime.now().date()
+        period = st.date_input("Zeitraum:", value=(today - timedelta(days=365), today))
+        if len(period) == 2:
+            history.sync_archive()
+            period_filter = {
+                "since": period[0].isoformat(),
+                "until": (period[1] + timedelta(days=1)).isoformat(),
+            }
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**Bestellungen pro Restaurant**")
+                st.bar_chart(counts_frame(history.archive.value_counts("type", **period_filter), RESTAURANT_LABELS))
+                st.markdown("**Beliebteste Döner-Läden**")
+                st.bar_chart(counts_frame(
+                    history.archive.value_counts("shop", order_type="doner", **period_filter), SHOP_LABELS))
+                st.markdown("**Beliebteste YamYam-Nummern**")
+                st.bar_chart(counts_frame(
+                    history.archive.value_counts("number", order_type="yamyam", **period_filter), limit=10))
+            with col2:
+                st.markdown("**Wer bestellt am meisten?**")
+                st.bar_chart(counts_frame(history.archive.value_counts("name", **period_filter), limit=10))
+                st.markdown("**Döner-Produkte**")
+                st.bar_chart(counts_frame(
+                    history.archive.value_counts("product", order_type="doner", **period_filter), PRODUCT_LABELS))
+                st.markdown("**Soßen**")
+                st.bar_chart(counts_frame(history.archive.value_counts("sauces", **period_filter), SAUCE_LABELS))
+    else:
+        st.info("Noch keine vergangenen Bestellungen vorhanden.")
+
+elif st.session_state.current_view == "admin":
+    # Performance metrics of this server process (see metrics.py)
+    st.title("Performance")
+    METRICS.enabled = st.toggle("Messung aktiv", value=METRICS.enabled,
+                                help="Gilt für den ganzen Server-Prozess, nicht nur diese Sitzung.")
+
+    rows = METRICS.snapshot()
+    if rows:
+        import pandas as pd
+        st.dataframe(pd.DataFrame({
+            "Vorgang": [row["name"] for row in rows],
+            "Aufrufe": [row["calls"] for row in rows],
+            "Fehler": [row["errors"] for row in rows],
+            "p50 [ms]": [row["p50"] * 1000 for row in rows],
+            "p95 [ms]": [row["p95"] * 1000 for row in rows],
+            "p99 [ms]": [row["p99"] * 1000 for row in rows],
+            "Gesamt [s]": [row["seconds"] for row in rows],
+            "Bytes": [row["bytes"] for row in rows],
+            "Bestellungen": [row["orders"] for row in rows],
+        }), use_container_width=True, hide_index=True)
+    else:
+        st.info("Noch keine Messwerte vorhanden.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Zurücksetzen", use_container_width=True):
+            METRICS.reset()
+            st.rerun()
+    with col2:
+        st.download_button("Prometheus-Export", data=METRICS.to_prometheus(), file_name="lunch_metrics.prom",
+                           mime="text/plain", use_container_width=True)
+    st.caption(f"Bei aktiver Messung wird alle {METRICS_FILE_INTERVAL} s nach {METRICS_FILE} geschrieben "
+               "(Prometheus-Textformat).")
+
 # Footer with version info
 st.markdown("---")
 st.caption(f"LunchSquad v1.0.0 - Team Lunch Organizer")
\ No newline at end of file
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Columnar order archive for the LunchSquad application.
+
+Sealed history days are additionally stored as Parquet, one file per month
+(YYYY-MM.parquet). Categorical fields are dictionary-encoded and sauces and
+extras are list columns, so analytics over months of orders read only the
+columns they need (memory-mapped, with filters pushed down to the row
+groups) instead of parsing JSON.
+"""
+
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+
+# pyarrow is imported by the functions that use it, so the app starts
+# without it and only pays for it when the archive is written or read
+
+
+@lru_cache(maxsize=None)
+def archive_schema():
+    """Columns of the archive; categorical fields are dictionary-encoded"""
+    import pyarrow as pa
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("timestamp", pa.timestamp("us")),
+        ("type", category),
+        ("name", pa.string()),
+        ("shop", category),
+        ("product", category),
+        ("boxType", category),
+        ("spiceLevel", category),
+        ("number", pa.string()),
+        ("sauces", pa.list_(pa.string())),
+        ("extras", pa.list_(pa.string())),
+        ("sauce", category),
+        ("salatType", category),
+        ("baeckerItem", pa.string()),
+        ("customOrder", pa.string()),
+    ])
+
+
+_MONTH_FILE = re.compile(r"^(\d{4}-\d{2})\.parquet$")
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _text_list(value):
+    return [str(item) for item in value] if isinstance(value, list) else None
+
+
+def orders_to_table(orders):
+    """Convert order dicts to an Arrow table with archive_schema()"""
+    import pyarrow as pa
+    schema = archive_schema()
+    columns = {}
+    for field in schema:
+        if field.name == "timestamp":
+            values = [_timestamp(order.get("timestamp")) for order in orders]
+            columns[field.name] = pa.array(values, type=field.type)
+        elif pa.types.is_list(field.type):
+            values = [_text_list(order.get(field.name)) for order in orders]
+            columns[field.name] = pa.array(values, type=field.type)
+        else:
+            values = pa.array([_text(order.get(field.name)) for order in orders], type=pa.string())
+            if pa.types.is_dictionary(field.type):
+                values = values.dictionary_encode()
+            columns[field.name] = values
+    return pa.table(columns, schema=schema)
+
+
+class OrderArchive:
+    """Monthly Parquet files of sealed history days"""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+
+    def month_path(self, month):
+        return os.path.join(self.archive_dir, f"{month}.parquet")
+
+    def months(self):
+        """List the archived months ("YYYY-MM", oldest first)"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(
+            match.group(1)
+            for match in map(_MONTH_FILE.match, os.listdir(self.archive_dir))
+            if match
+        )
+
+    def write_month(self, month, orders):
+        """Replace the Parquet file of a month with the given orders"""
+        import pyarrow.parquet as pq
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self.month_path(month)
+        tmp_path = f"{path}.tmp"
+        table = orders_to_table(orders).sort_by("timestamp")
+        pq.write_table(table, tmp_path, compression="zstd", row_group_size=10000)
+        os.replace(tmp_path, path)
+
+    def query(self, columns=None, since=None, until=None, order_type=None, shop=None):
+        """
+        Read archived orders as an Arrow table.
+
+        Only the requested columns are read, the files are memory-mapped
+        and the filters are pushed down to the Parquet row groups.
+
+        Args:
+            columns (list): Columns to read (None for all)
+            since, until (str): Day range "YYYY-MM-DD" (since <= day < until)
+            order_type, shop (str): Only orders of this restaurant / shop
+
+        Returns:
+            pyarrow.Table: The matching orders
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+        schema = archive_schema()
+        months = self.months()
+        if since is not None:
+            months = [month for month in months if month >= since[:7]]
+        if until is not None:
+            months = [month for month in months if month <= until[:7]]
+        if not months:
+            return schema.empty_table().select(columns or schema.names)
+
+        filters = []
+        if since is not None:
+            filters.append(ds.field("timestamp") >= pa.scalar(datetime.fromisoformat(since), pa.timestamp("us")))
+        if until is not None:
+            filters.append(ds.field("timestamp") < pa.scalar(datetime.fromisoformat(until), pa.timestamp("us")))
+        if order_type is not None:
+            filters.append(ds.field("type") == order_type)
+        if shop is not None:
+            filters.append(ds.field("shop") == shop)
+        condition = None
+        for expression in filters:
+            condition = expression if condition is None else condition & expression
+
+        dataset = ds.dataset(
+            [os.path.abspath(self.month_path(month)) for month in months],
+            schema=schema,
+            format="parquet",
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+        )
+        return dataset.to_table(columns=columns, filter=condition)
+
+    def value_counts(self, column, **filters):
+        """
+        Count the values of one column (lists are counted per item).
+
+        Returns:
+            list: (value, count) tuples, most frequent first
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        values = self.query(columns=[column], **filters).column(column)
+        if pa.types.is_list(values.type):
+            values = pc.list_flatten(values)
+        counts = pc.value_counts(pc.drop_null(values))
+        result = [(item["values"].as_py(), item["counts"].as_py()) for item in counts]
+        return sorted(result, key=lambda item: (-item[1], str(item[0])))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Throughput benchmark for the order API (api.py).
+
+Starts the API on a free port with an empty default team in a temporary
+directory, then posts generated orders from several clients at once
+(each over one keep-alive connection): one order per request, and in
+batches. Prints orders per second and the request latency.
+
+Usage:
+    python -m benchmarks.bench_api [orders] [clients] [batch size]
+"""
+
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from api import start_api_server
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from teams import TeamRegistry
+
+DEFAULT_ORDERS = 2000
+DEFAULT_CLIENTS = 4
+DEFAULT_BATCH = 100
+
+
+def post_all(port, bodies, latencies):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    for body in bodies:
+        start = time.perf_counter()
+        connection.request("POST", "/api/orders", body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 201:
+            raise RuntimeError(f"API answered {response.status}")
+    connection.close()
+
+
+def run(port, orders, clients, batch_size):
+    """Post orders from clients in parallel; returns (seconds, latencies)"""
+    if batch_size == 1:
+        bodies = [json.dumps(order) for order in orders]
+    else:
+        bodies = [json.dumps(orders[i:i + batch_size]) for i in range(0, len(orders), batch_size)]
+    latencies = []
+    threads = [
+        threading.Thread(target=post_all, args=(port, bodies[number::clients], latencies))
+        for number in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main(count, clients, batch_size):
+    orders = generate_orders(count)
+    print(f"{'mode':<12} {'orders':>7} {'requests':>9} {'time [s]':>9} {'orders/s':>9} "
+          f"{'p50 [ms]':>9} {'p95 [ms]':>9}")
+    for mode, size in (("single", 1), (f"batch {batch_size}", batch_size)):
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+            CloudStorage.delete_data('orders_data')
+            teams = TeamRegistry(tmp_dir, os.path.join(tmp_dir, "orders.json"), max_orders=None,
+                                 storage_mode="journal")
+            server = start_api_server(teams, port=0, workers=clients)
+            try:
+                seconds, latencies = run(server.server_address[1], orders, clients, size)
+            finally:
+                server.shutdown()
+                server.server_close()
+            assert len(teams.get().get_orders()) == count
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{mode:<12} {count:>7} {len(latencies):>9} {seconds:>9.2f} {count / seconds:>9.0f} "
+              f"{p50 * 1000:>9.2f} {p95 * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [DEFAULT_ORDERS, DEFAULT_CLIENTS, DEFAULT_BATCH]
+    main(*(args + defaults[len(args):]))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the change feed of the order manager (models.py).
+
+Adds and removes a few orders on order lists of different sizes, then
+lets a number of open tabs refresh their order table (get_orders_dataframe
+per tab, as the timed order table fragment does). Compares applying the
+changes from the change feed with rebuilding the table (feed cleared).
+
+Usage:
+    python -m benchmarks.bench_change_feed [sizes...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from models import OrderManager
+
+DEFAULT_SIZES = [10000, 100000]
+TABS = 50
+ROUNDS = 20
+CHANGES = 3  # Adds per round (and one removal)
+
+
+def run(manager, new_orders, use_feed):
+    """Returns (sorted refresh times of the first tab, seconds for all tabs per round)"""
+    first_tab = []
+    total = 0
+    for number in range(ROUNDS):
+        for order in new_orders[number * CHANGES:(number + 1) * CHANGES]:
+            manager.add_order(dict(order))
+        manager.remove_order(manager.get_orders()[0]["id"])
+        if not use_feed:
+            manager.changes.clear()
+        start = time.perf_counter()
+        manager.get_orders_dataframe()
+        first_tab.append(time.perf_counter() - start)
+        for _ in range(TABS - 1):
+            manager.get_orders_dataframe()
+        total += time.perf_counter() - start
+    return sorted(first_tab), total / ROUNDS
+
+
+def main(sizes):
+    new_orders = generate_orders(ROUNDS * CHANGES, seed=43, day=date.today())
+    print(f"{TABS} tabs, {CHANGES} adds and 1 removal between refreshes")
+    print(f"{'orders':>8} {'table':>8} {'p50 [ms]':>9} {'max [ms]':>9} {'all tabs [ms]':>14}")
+    for size in sizes:
+        orders = generate_orders(size, day=date.today())
+        for use_feed in (False, True):
+            with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+                CloudStorage.delete_data('orders_data')
+                manager = OrderManager(os.path.join(tmp_dir, "orders.json"), storage_mode="journal")
+                manager.replace_orders(list(orders))
+                manager.get_orders_dataframe()
+                times, per_round = run(manager, new_orders, use_feed)
+                manager.flush()
+            label = "deltas" if use_feed else "rebuild"
+            print(f"{size:>8} {label:>8} {times[len(times) // 2] * 1000:>9.2f} {times[-1] * 1000:>9.2f} "
+                  f"{per_round * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
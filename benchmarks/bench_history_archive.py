@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for history analytics.
+
+Builds a year of history (one segment per day) and compares counting the
+most popular Döner shops from the JSON segments with the same query on
+the Parquet archive.
+
+Usage:
+    python -m benchmarks.bench_history_archive [orders_per_day]
+"""
+
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from benchmarks.generator import generate_orders
+from history import OrderHistory
+
+DEFAULT_ORDERS_PER_DAY = 200
+DAYS = 365
+
+
+def build_history(history_dir, orders_per_day):
+    """Write DAYS days of generated orders into a history directory"""
+    history = OrderHistory(history_dir)
+    orders = generate_orders(DAYS * orders_per_day)
+    start = datetime.combine(date.today() - timedelta(days=DAYS), datetime.min.time())
+    for index, order in enumerate(orders):
+        day = start + timedelta(days=index // orders_per_day, minutes=index % orders_per_day)
+        order["timestamp"] = day.isoformat()
+    history.add(orders)
+    return history
+
+
+def count_shops_json(history):
+    """Count Döner shops by decompressing and parsing every day segment"""
+    counts = Counter()
+    for day in history.days():
+        for order in history.load_day(day):
+            if order.get("type") == "doner":
+                counts[order.get("shop")] += 1
+    return sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+def count_shops_parquet(history):
+    """Count Döner shops from the Parquet archive (one column, filter pushed down)"""
+    return history.archive.value_counts("shop", order_type="doner")
+
+
+def main(orders_per_day):
+    with tempfile.TemporaryDirectory() as history_dir:
+        start = time.perf_counter()
+        history = build_history(history_dir, orders_per_day)
+        print(f"{DAYS} days x {orders_per_day} orders written in {time.perf_counter() - start:.2f} s")
+
+        # Fresh instances, so no segment is cached yet
+        start = time.perf_counter()
+        json_counts = count_shops_json(OrderHistory(history_dir))
+        json_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parquet_counts = count_shops_parquet(OrderHistory(history_dir))
+        parquet_time = time.perf_counter() - start
+
+        print(f"{'source':>8} {'time [s]':>9}")
+        print(f"{'json':>8} {json_time:>9.3f}")
+        print(f"{'parquet':>8} {parquet_time:>9.3f}")
+        print(f"speedup {json_time / parquet_time:.1f}x, identical: {json_counts == parquet_counts}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDERS_PER_DAY)
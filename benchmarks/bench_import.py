@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the streaming order import.
+
+Writes generated orders as a JSONL file and as a JSON array, imports each
+into an empty order manager (merge mode) and reports time and the peak
+memory allocated during the import (measured in a second run, as
+tracemalloc slows the import down).
+
+Usage:
+    python -m benchmarks.bench_import [count]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from importer import ImportJob
+from models import OrderManager
+
+DEFAULT_COUNT = 100000
+
+
+def write_files(directory, orders):
+    """Write the orders as JSONL and as JSON array"""
+    jsonl_path = os.path.join(directory, "orders.jsonl")
+    with open(jsonl_path, 'w', encoding='utf-8') as f:
+        for order in orders:
+            f.write(json.dumps(order, ensure_ascii=False) + "\n")
+    array_path = os.path.join(directory, "orders.json")
+    with open(array_path, 'w', encoding='utf-8') as f:
+        json.dump(orders, f, ensure_ascii=False, indent=2)
+    return {"jsonl": jsonl_path, "array": array_path}
+
+
+def run(directory, path, run_name):
+    """Import one file into a fresh, empty order manager"""
+    # The process-wide cloud copy would otherwise be loaded as current orders
+    CloudStorage.delete_data('orders_data')
+    manager = OrderManager(os.path.join(directory, f"{run_name}_orders.json"), storage_mode="journal")
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        job = ImportJob(manager, f, os.path.getsize(path)).start()
+        job.join()
+    if job.error:
+        raise RuntimeError(job.error)
+    return time.perf_counter() - start, job.imported
+
+
+def peak_memory(directory, path, run_name):
+    """Peak memory allocated while importing one file"""
+    tracemalloc.start()
+    run(directory, path, run_name)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(count):
+    orders = generate_orders(count)
+    # Today's timestamps, so the orders stay current instead of going into the history
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    for index, order in enumerate(orders):
+        order["timestamp"] = (start + timedelta(milliseconds=index)).isoformat()
+    # Journal compaction may still be running in the background at the end
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+        files = write_files(directory, orders)
+        del orders
+        print(f"{'format':>6} {'size [MB]':>10} {'time [s]':>9} {'peak [MB]':>10} {'imported':>9}")
+        for mode, path in files.items():
+            elapsed, imported = run(directory, path, mode)
+            peak = peak_memory(directory, path, f"{mode}_traced")
+            size = os.path.getsize(path) / 1e6
+            print(f"{mode:>6} {size:>10.1f} {elapsed:>9.2f} {peak / 1e6:>10.1f} {imported:>9}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Interaction latency benchmark for the Streamlit app.
+
+Starts the app with a generated order file, connects to it like a browser
+(websocket, Streamlit protocol messages) and measures how long the server
+takes from a widget interaction until the rerun has finished, end to end
+and as script execution time (from the page profile Streamlit sends when
+usage stats are on; nothing leaves the machine, the client is ours). Every
+interaction is sent twice: as a rerun of the fragment that contains the
+widget, and as a full-script rerun (what every interaction cost before the
+page was split into fragments).
+
+Usage:
+    python -m benchmarks.bench_interaction [count] [repeats]
+"""
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+from websockets.sync.client import connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from benchmarks.generator import generate_orders
+
+DEFAULT_COUNT = 1000
+DEFAULT_REPEATS = 20
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(work_dir, port):
+    """Start the app in work_dir and wait until it is healthy"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+         "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.headless", "true", "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "true"],
+        cwd=work_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Streamlit server did not start")
+
+
+class Session:
+    """A browser session: sends reruns and collects the widgets of the page"""
+
+    def __init__(self, port):
+        self.socket = connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                              max_size=None, legacy=True)
+        # label -> (widget ID, fragment ID) of the widgets seen so far
+        self.widgets = {}
+
+    def close(self):
+        self.socket.close()
+
+    def rerun(self, widget_states=(), fragment_id=""):
+        """
+        Send a rerun and wait until the script has finished.
+
+        Returns:
+            tuple: Seconds until the script_finished message, seconds spent
+            executing the script (all runs, including ones st.rerun() stopped)
+        """
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        message.rerun_script.fragment_id = fragment_id
+        for state in widget_states:
+            message.rerun_script.widget_states.widgets.append(state)
+        start = time.perf_counter()
+        self.socket.send(message.SerializeToString())
+        exec_time = 0
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(self.socket.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self._collect(forward.delta)
+            elif kind == "page_profile":
+                exec_time += forward.page_profile.exec_time / 1e6
+            elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                # (a run stopped early by st.rerun() is followed by another one)
+                return time.perf_counter() - start, exec_time
+
+    def _collect(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        widget = getattr(element, element.WhichOneof("type"))
+        if hasattr(widget, "id") and hasattr(widget, "label") and widget.id:
+            self.widgets[widget.label] = (widget.id, delta.fragment_id)
+
+    def click(self, label, fragment=True, values=()):
+        """Click a button (or form submit button), with the given widget values"""
+        widget_id, fragment_id = self.widgets[label]
+        states = []
+        for value_label, value in values:
+            state = BackMsg().rerun_script.widget_states.widgets.add()
+            state.id = self.widgets[value_label][0]
+            state.string_value = value
+            states.append(state)
+        trigger = BackMsg().rerun_script.widget_states.widgets.add()
+        trigger.id = widget_id
+        trigger.trigger_value = True
+        states.append(trigger)
+        return self.rerun(states, fragment_id if fragment else "")
+
+
+def measure(repeats, prepare, interact):
+    """
+    Median milliseconds of an interaction as fragment and as full rerun.
+
+    Returns:
+        dict: fragment (bool) -> (end to end ms, script execution ms)
+    """
+    results = {}
+    for fragment in (True, False):
+        times = []
+        for _ in range(repeats):
+            prepare()
+            times.append(interact(fragment))
+        results[fragment] = tuple(statistics.median(values) * 1000 for values in zip(*times))
+    return results
+
+
+def main(count, repeats):
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as work_dir:
+        orders = generate_orders(count)
+        # Today's orders, so loading doesn't move them into the history
+        now = datetime.now().isoformat()
+        for order in orders:
+            order["timestamp"] = now
+        with open(os.path.join(work_dir, "lunch_orders.json"), "w", encoding="utf-8") as file:
+            json.dump(orders, file, ensure_ascii=False)
+
+        port = free_port()
+        server = start_server(work_dir, port)
+        session = Session(port)
+        try:
+            initial = session.rerun()[0] * 1000
+            session.rerun()
+            page = session.rerun()[0] * 1000
+
+            def view(label):
+                return lambda: session.click(label, fragment=False)
+
+            def restaurant(label):
+                return lambda: (session.click("Hauptmenü", fragment=False), session.click(label, fragment=False))
+
+            doner = next(label for label in session.widgets if "Döner" in label)
+            yamyam = next(label for label in session.widgets if "YamYam" in label)
+            interactions = [
+                ("Speichern", view("Hauptmenü"),
+                 lambda fragment: session.click("Speichern", fragment)),
+                ("Döner-Laden wählen", restaurant(doner),
+                 lambda fragment: session.click("Döner Bruder", fragment)),
+                ("YamYam-Bestellung abschicken", restaurant(yamyam),
+                 lambda fragment: session.click("Hinzufügen", fragment,
+                                                [("Name:", "Bench"), (session_label(session), "42")])),
+                ("Bestellung entfernen", view("Alle Bestellungen"),
+                 lambda fragment: session.click("Ausgewählte Bestellung entfernen", fragment)),
+            ]
+
+            print(f"{count} orders, median of {repeats} runs")
+            print(f"first page load: {initial:.1f} ms, rerun of the main page: {page:.1f} ms")
+            print(f"{'':<30} {'fragment [ms]':>21} {'full rerun [ms]':>21}")
+            print(f"{'interaction':<30} {'total':>10} {'script':>10} {'total':>10} {'script':>10}")
+            for name, prepare, interact in interactions:
+                results = measure(repeats, prepare, interact)
+                (fragment_total, fragment_script), (full_total, full_script) = results[True], results[False]
+                print(f"{name:<30} {fragment_total:>10.1f} {fragment_script:>10.1f} "
+                      f"{full_total:>10.1f} {full_script:>10.1f}")
+        finally:
+            session.close()
+            server.terminate()
+            server.wait()
+
+
+def session_label(session):
+    """Label of the YamYam number input ("Nummer (1-...):")"""
+    return next(label for label in session.widgets if label.startswith("Nummer"))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REPEATS,
+    )
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Overhead benchmark for the timing hooks (metrics.py).
+
+Times a no-op function without hook, with a disabled hook and with an
+enabled hook (decorator and context manager), then the hooked hot paths
+of the order manager with metrics disabled and enabled.
+
+Usage:
+    python -m benchmarks.bench_metrics [count]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from metrics import METRICS, timed
+from models import OrderManager
+
+DEFAULT_COUNT = 1000
+CALLS = 200000
+
+
+def noop():
+    return None
+
+
+@timed("bench_noop")
+def timed_noop():
+    return None
+
+
+def timer_noop():
+    with METRICS.timer("bench_noop"):
+        return None
+
+
+def per_call(function, calls=CALLS):
+    """Nanoseconds per call (best of 5)"""
+    return min(timeit.repeat(function, number=calls, repeat=5)) / calls * 1e9
+
+
+def manager_paths(count):
+    """Microseconds per add_order and per (cached) get_orders_dataframe"""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        CloudStorage.delete_data('orders_data')
+        manager = OrderManager(os.path.join(tmp_dir, "orders.json"), storage_mode="journal")
+        orders = generate_orders(count)
+        add = timeit.timeit(lambda: manager.add_order(dict(orders.pop())), number=count) / count
+        manager.get_orders_dataframe()
+        frame = min(timeit.repeat(manager.get_orders_dataframe, number=10000, repeat=3)) / 10000
+    return add * 1e6, frame * 1e6
+
+
+def main(count):
+    METRICS.enabled = False
+    plain = per_call(noop)
+    disabled = per_call(timed_noop), per_call(timer_noop)
+    disabled_paths = manager_paths(count)
+    METRICS.enabled = True
+    enabled = per_call(timed_noop), per_call(timer_noop)
+    enabled_paths = manager_paths(count)
+    METRICS.enabled = False
+
+    print(f"no-op call: {plain:.0f} ns")
+    print(f"{'hook':<20} {'disabled [ns]':>14} {'enabled [ns]':>13}")
+    print(f"{'@timed':<20} {disabled[0]:>14.0f} {enabled[0]:>13.0f}")
+    print(f"{'METRICS.timer':<20} {disabled[1]:>14.0f} {enabled[1]:>13.0f}")
+    print(f"{'path':<20} {'disabled [µs]':>14} {'enabled [µs]':>13}")
+    print(f"{'add_order':<20} {disabled_paths[0]:>14.1f} {enabled_paths[0]:>13.1f}")
+    print(f"{'get_orders_dataframe':<20} {disabled_paths[1]:>14.2f} {enabled_paths[1]:>13.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Memory benchmark for the compact order records.
+
+Parses generated orders from JSON (as loading the order file does) and
+compares the memory held by the order dicts with the memory held by the
+same orders as __slots__ records (see records.py), the form in which the
+order history caches the days it has read. Also checks that the records
+convert back to identical dicts, which the history does on every access
+of a cached day.
+
+Usage:
+    python -m benchmarks.bench_order_memory [count]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generator import generate_orders
+from order_list import new_order_id
+from records import to_orders, to_records
+
+DEFAULT_COUNT = 100000
+
+
+def main(count):
+    orders = generate_orders(count)
+    for order in orders:
+        order["id"] = new_order_id()
+    text = json.dumps(orders, ensure_ascii=False)
+    del orders
+
+    gc.collect()
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    dicts = json.loads(text)
+    dict_bytes = tracemalloc.get_traced_memory()[0] - start_memory
+
+    records = to_records(json.loads(text))
+    gc.collect()
+    record_bytes = tracemalloc.get_traced_memory()[0] - start_memory - dict_bytes
+    tracemalloc.stop()
+
+    # Conversion times without tracemalloc slowing them down
+    parsed = json.loads(text)
+    start = time.perf_counter()
+    to_records(parsed)
+    convert_time = time.perf_counter() - start
+    del parsed
+
+    start = time.perf_counter()
+    identical = to_orders(records) == dicts
+    back_time = time.perf_counter() - start
+
+    print(f"{count} orders")
+    print(f"{'representation':>15} {'total [MB]':>11} {'bytes/order':>12}")
+    print(f"{'dicts':>15} {dict_bytes / 1e6:>11.1f} {dict_bytes / count:>12.0f}")
+    print(f"{'records':>15} {record_bytes / 1e6:>11.1f} {record_bytes / count:>12.0f}")
+    print(f"saving {1 - record_bytes / dict_bytes:.0%}, "
+          f"to records {convert_time:.2f} s, back to dicts {back_time:.2f} s, identical: {identical}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
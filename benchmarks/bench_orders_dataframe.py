@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for OrderManager.get_orders_dataframe.
+
+Compares the vectorized formatter with the previous row-wise
+implementation (df.iterrows()) and checks that both produce the same
+output.
+
+Usage:
+    python -m benchmarks.bench_orders_dataframe [sizes...]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_orders
+from rendering import format_orders_dataframe
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def legacy_orders_dataframe(orders):
+    """Row-wise implementation of OrderManager.get_orders_dataframe before vectorization"""
+    if not orders:
+        return pd.DataFrame()
+    
+    # Create a DataFrame from the orders list
+    df = pd.DataFrame(orders)
+    
+    # Format the DataFrame for display
+    if not df.empty:
+        # Handle timestamp formatting
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['Zeitpunkt'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
+        
+        # Add formatted columns based on order type
+        formatted_rows = []
+        for _, row in df.iterrows():
+            formatted_row = {}
+            formatted_row['Zeitpunkt'] = row.get('Zeitpunkt', '-')
+            formatted_row['Name'] = row.get('name', '-')
+            
+            order_type = row.get('type', '')
+            if order_type == 'yamyam':
+                formatted_row['Restaurant'] = 'YamYam'
+                formatted_row['Bestellung'] = f"Nr. {row.get('number', '-')}"
+                formatted_row['Details'] = ''
+            
+            elif order_type == 'doner':
+                formatted_row['Restaurant'] = 'Döner'
+                
+                # Map product values to display names
+                product_map = {
+                    "doner": "Döner",
+                    "durum": "Dürüm",
+                    "falafel-doner": "Falafel-Döner",
+                    "falafel-durum": "Falafel-Dürüm",
+                    "box": "Dönerbox"
+                }
+                
+                # Map shop values to display names
+                shop_map = {
+                    "bruder": "Döner Bruder",
+                    "king": "King Kebabo's",
+                    "aldi": "Aldi Döner"
+                }
+                
+                product = product_map.get(row.get('product', ''), row.get('product', ''))
+                shop = shop_map.get(row.get('shop', ''), row.get('shop', ''))
+                
+                # Format sauces
+                sauces = row.get('sauces', [])
+                sauce_str = ", ".join(sauces) if sauces else "keine"
+                
+                # Format extras with custom extras
+                extras_list = []
+                for extra in row.get('extras', []):
+                    if isinstance(extra, str) and extra.startswith("custom:"):
+                        # Es ist ein Freitext-Extra
+                        custom_text = extra[7:]  # "custom:" entfernen
+                        extras_list.append(custom_text)
+                    else:
+                        # Standard-Extras wie "ohne-zwiebel" konvertieren
+                        extras_map = {
+                            "ohne-zwiebel": "Ohne Zwiebel",
+                            "ohne-tomate": "Ohne Tomate", 
+                            "ohne-blaukraut": "Ohne Blaukraut",
+                            "ohne-salat": "Ohne Salat",
+                            "ohne-sosse": "Ohne Soße",
+                            "ohne-grillgemuese": "Ohne Grillgemüse",
+                            "ohne-gurke": "Ohne Gurke"
+                        }
+                        extras_list.append(extras_map.get(extra, extra))
+                        
+                extras_str = ", ".join(extras_list) if extras_list else "keine"
+                
+                # Box type if applicable
+                box_type = ""
+                if row.get('product') == 'box' and 'boxType' in row:
+                    box_map = {"pommes": "mit Pommes", "salat": "mit Salat"}
+                    box_type = f" ({box_map.get(row['boxType'], row['boxType'])})"
+                
+                # Format spice level
+                spice_map = {"none": "nicht scharf", "normal": "normal scharf", "extra": "sehr scharf"}
+                spice = spice_map.get(row.get('spiceLevel', ''), row.get('spiceLevel', ''))
+                
+                formatted_row['Bestellung'] = f"{product}{box_type} ({shop})"
+                formatted_row['Details'] = f"Soßen: {sauce_str}, Extras: {extras_str}, Schärfe: {spice}"
+            
+            elif order_type == 'edeka':
+                formatted_row['Restaurant'] = 'Edeka'
+                product = row.get('product', '-')
+                
+                if product == 'Salat':
+                    salat_type = row.get('salatType', '-')
+                    formatted_row['Bestellung'] = f"{salat_type}"
+                    # Anmerkungen anzeigen, wenn vorhanden
+                    if 'customOrder' in row and row['customOrder']:
+                        formatted_row['Details'] = f"Anmerkung: {row['customOrder']}"
+                    else:
+                        formatted_row['Details'] = ''
+                elif product == 'Bäcker':
+                    baecker_item = row.get('baeckerItem', '-')
+                    formatted_row['Bestellung'] = f"Bäcker"
+                    formatted_row['Details'] = f"{baecker_item}"
+                else:
+                    sauce = row.get('sauce', 'keine')
+                    formatted_row['Bestellung'] = f"{product}"
+                    details = [f"Sauce: {sauce}"]
+                    # Anmerkungen anzeigen, wenn vorhanden
+                    if 'customOrder' in row and row['customOrder']:
+                        details.append(f"Anmerkung: {row['customOrder']}")
+                    formatted_row['Details'] = ", ".join(details)
+            
+            else:
+                formatted_row['Restaurant'] = order_type.capitalize()
+                formatted_row['Bestellung'] = '-'
+                formatted_row['Details'] = '-'
+            
+            formatted_rows.append(formatted_row)
+        
+        return pd.DataFrame(formatted_rows)
+    
+    return pd.DataFrame()
+
+
+def _time(func, *args, repeat=3):
+    """Best wall-clock time of several runs in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def reference_orders_dataframe(orders):
+    """
+    Row-wise output with every order formatted on its own.
+    Formatting orders one at a time avoids the "nan" artifacts the
+    row-wise version produced for fields missing in some orders only.
+    """
+    frames = [legacy_orders_dataframe([order]) for order in orders]
+    return pd.concat(frames, ignore_index=True)
+
+
+def main(sizes):
+    print(f"{'orders':>8} {'row-wise [s]':>13} {'vectorized [s]':>15} {'speedup':>8}  identical")
+    for size in sizes:
+        orders = generate_orders(size)
+        sample = orders[:1000]
+        expected = reference_orders_dataframe(sample).astype(str)
+        identical = expected.equals(format_orders_dataframe(sample).astype(str))
+        repeat = 1 if size >= 100000 else 3
+        legacy_time = _time(legacy_orders_dataframe, orders, repeat=repeat)
+        vectorized_time = _time(format_orders_dataframe, orders, repeat=repeat)
+        print(f"{size:>8} {legacy_time:>13.3f} {vectorized_time:>15.3f} "
+              f"{legacy_time / vectorized_time:>7.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Startup benchmark for the LunchSquad application.
+
+Imports the modules app.py imports in a fresh interpreter with
+python -X importtime and prints the slowest imports (cumulative time, as
+reported by the interpreter), the total import time and which of the
+heavy optional libraries got loaded. Then measures the time to the first
+OrderManager (loading the order file) for a generated order file.
+
+Usage:
+    python -m benchmarks.bench_startup [count]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+from benchmarks.generator import generate_orders
+
+DEFAULT_COUNT = 10000
+TOP = 15
+
+# The modules app.py imports before the first page is drawn
+APP_MODULES = ["streamlit", "models", "teams", "importer", "config", "utils", "rendering", "cloud_storage"]
+# Libraries that should only be loaded by the code paths that need them
+LAZY_MODULES = ["numpy", "pandas", "PIL", "pyarrow"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = f"""
+import sys
+import {", ".join(APP_MODULES)}
+print(",".join(name for name in {LAZY_MODULES!r} if name in sys.modules))
+"""
+
+MANAGER_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from models import OrderManager
+imported = time.perf_counter()
+manager = OrderManager(sys.argv[1], storage_mode="json")
+loaded = time.perf_counter()
+print(imported - start, loaded - imported, len(manager.orders))
+"""
+
+
+def run(script, *args, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", script, *args]
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+
+def parse_importtime(stderr):
+    """
+    Parse the -X importtime lines ("import time: self | cumulative | name").
+
+    Returns:
+        list: (module, self µs, cumulative µs, nesting level) tuples
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return imports
+
+
+def main(count):
+    stdout, stderr = run(IMPORT_SCRIPT, importtime=True)
+    imports = parse_importtime(stderr)
+    loaded = [name for name in stdout.strip().split(",") if name]
+    total = sum(cumulative for _, _, cumulative, level in imports if level == 0)
+
+    print(f"Import of the app modules: {total / 1e6:.3f} s")
+    print(f"{'module':<40} {'self [ms]':>10} {'cumulative [ms]':>16}")
+    for name, self_us, cumulative_us, _ in sorted(imports, key=lambda item: -item[2])[:TOP]:
+        print(f"{name:<40} {self_us / 1e3:>10.1f} {cumulative_us / 1e3:>16.1f}")
+    print(f"Heavy libraries loaded at startup: {', '.join(loaded) or 'none'}")
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        order_file = os.path.join(tmp_dir, "orders.json")
+        orders = generate_orders(count)
+        # Today's orders, so loading doesn't move them into the history
+        now = datetime.now().isoformat()
+        for order in orders:
+            order["timestamp"] = now
+        with open(order_file, "w", encoding="utf-8") as file:
+            json.dump(orders, file, ensure_ascii=False)
+        stdout, _ = run(MANAGER_SCRIPT, order_file)
+        import_time, load_time, loaded_orders = stdout.split()
+        print(f"First OrderManager ({loaded_orders} orders): "
+              f"import {float(import_time):.3f} s, load {float(load_time):.3f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
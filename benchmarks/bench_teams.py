@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the team order stores (teams.py).
+
+Write contention: several writer threads add orders with immediate
+durability, all to one team and then each to its own team, and prints
+orders per second and the add_order latency.
+
+Memory: loads a number of teams with generated orders and prints the
+memory they hold, then after their orders were dropped as idle, and the
+time to load a team again on the next access.
+
+Usage:
+    python -m benchmarks.bench_teams [teams] [orders per team] [writers]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date
+
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from teams import TeamRegistry
+
+DEFAULT_TEAMS = 24
+DEFAULT_ORDERS = 2000
+DEFAULT_WRITERS = 8
+ADDS = 200  # Orders per writer
+
+
+def registry(tmp_dir, **options):
+    for key in CloudStorage.list_keys():
+        CloudStorage.delete_data(key)
+    return TeamRegistry(os.path.join(tmp_dir, "teams"), os.path.join(tmp_dir, "orders.json"),
+                        max_teams=None, max_orders=None, idle_seconds=0, **options)
+
+
+def contention(writers, shared):
+    """Returns (orders per second, sorted add_order latencies)"""
+    new_orders = generate_orders(ADDS * writers, seed=43, day=date.today())
+    latencies = []
+
+    def write(manager, orders):
+        for order in orders:
+            start = time.perf_counter()
+            manager.add_order(dict(order))
+            latencies.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        teams = registry(tmp_dir, durability="immediate")
+        managers = [teams.get("team-0" if shared else f"team-{number}") for number in range(writers)]
+        threads = [
+            threading.Thread(target=write, args=(manager, new_orders[number::writers]))
+            for number, manager in enumerate(managers)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return len(new_orders) / elapsed, sorted(latencies)
+
+
+def memory(team_count, orders_per_team):
+    """Returns (MB held with all teams loaded, MB after unloading, seconds to reload one team)"""
+    orders = generate_orders(orders_per_team, day=date.today())
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        teams = registry(tmp_dir)
+        for number in range(team_count):
+            teams.get(f"team-{number}").replace_orders([dict(order) for order in orders])
+        # Build one table first, so the pandas import is not counted
+        teams.get("team-0").get_orders_dataframe()
+        teams.flush()
+        for _, manager in teams.teams():
+            manager.unload()
+
+        gc.collect()
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        for _, manager in teams.teams():
+            manager.get_orders_dataframe()
+        gc.collect()
+        loaded = tracemalloc.get_traced_memory()[0] - base
+        teams.unload_idle(now=time.monotonic() + 1)
+        gc.collect()
+        unloaded = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        len(teams.get("team-0").get_orders())
+        reload = time.perf_counter() - start
+    return loaded / 1e6, unloaded / 1e6, reload
+
+
+def main(team_count, orders_per_team, writers):
+    print(f"{writers} writers, {ADDS} orders each, immediate durability")
+    print(f"{'teams':<14} {'orders/s':>9} {'p50 [ms]':>9} {'p99 [ms]':>9}")
+    for shared in (True, False):
+        rate, latencies = contention(writers, shared)
+        label = "1 shared" if shared else f"{writers} separate"
+        print(f"{label:<14} {rate:>9.0f} {latencies[len(latencies) // 2] * 1000:>9.2f} "
+              f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:>9.2f}")
+
+    loaded, unloaded, reload = memory(team_count, orders_per_team)
+    print(f"\n{team_count} teams with {orders_per_team} orders each (orders and order tables)")
+    print(f"loaded: {loaded:.1f} MB, after unloading idle teams: {unloaded:.1f} MB, "
+          f"reloading one team: {reload * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [DEFAULT_TEAMS, DEFAULT_ORDERS, DEFAULT_WRITERS]
+    main(*(args + defaults[len(args):]))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the batch order validation.
+
+Validates generated orders as a list of dicts and as a DataFrame with
+validate_orders and, for comparison, one by one with the single-order
+validators.
+
+Usage:
+    python -m benchmarks.bench_validation [sizes...]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_orders
+from utils import validate_doner_order, validate_edeka_order, validate_yamyam_order
+from validation import validate_orders
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+SINGLE_VALIDATORS = {
+    "yamyam": validate_yamyam_order,
+    "doner": validate_doner_order,
+    "edeka": validate_edeka_order,
+}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def validate_one_by_one(orders):
+    return {
+        row: message
+        for row, order in enumerate(orders)
+        for valid, message in [SINGLE_VALIDATORS[order["type"]](order)]
+        if not valid
+    }
+
+
+def main(sizes):
+    print(f"{'orders':>8} {'list [s]':>9} {'frame [s]':>10} {'single [s]':>11} {'same':>5}")
+    for size in sizes:
+        orders = generate_orders(size)
+        frame = pd.DataFrame(orders)
+        list_time, list_errors = timed(validate_orders, orders)
+        frame_time, frame_errors = timed(validate_orders, frame)
+        single_time, single_errors = timed(validate_one_by_one, orders)
+        same = list_errors == frame_errors == single_errors
+        print(f"{size:>8} {list_time:>9.3f} {frame_time:>10.3f} {single_time:>11.3f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
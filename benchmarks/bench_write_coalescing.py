@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for coalesced writes (DURABILITY in config.py, writer.py).
+
+Adds orders one at a time to order files of different sizes, with
+immediate and with coalesced durability, and prints the add_order
+latency and the bytes written until everything is persisted.
+
+Usage:
+    python -m benchmarks.bench_write_coalescing [sizes...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from models import OrderManager
+
+DEFAULT_SIZES = [1000, 20000]
+MODES = ["json", "journal", "sqlite"]
+ADDS = 200
+DEBOUNCE = 0.05
+
+
+def run(storage_mode, durability, orders, new_orders):
+    """Returns (sorted add_order latencies, seconds until persisted, bytes written)"""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        CloudStorage.delete_data('orders_data')
+        manager = OrderManager(os.path.join(tmp_dir, "orders.json"), storage_mode=storage_mode,
+                               durability=durability, debounce=DEBOUNCE)
+        manager.replace_orders(list(orders))
+        written = manager.storage.bytes_written
+        latencies = []
+        start = time.perf_counter()
+        for order in new_orders:
+            begin = time.perf_counter()
+            manager.add_order(dict(order))
+            latencies.append(time.perf_counter() - begin)
+        manager.flush()
+        elapsed = time.perf_counter() - start
+        return sorted(latencies), elapsed, manager.storage.bytes_written - written
+
+
+def main(sizes):
+    new_orders = generate_orders(ADDS, seed=43, day=date.today())
+    print(f"{ADDS} adds, debounce {DEBOUNCE * 1000:.0f} ms")
+    print(f"{'mode':>8} {'orders':>8} {'durability':>10} {'p50 [ms]':>9} {'p99 [ms]':>9} "
+          f"{'total [s]':>10} {'written [MB]':>13}")
+    for size in sizes:
+        orders = generate_orders(size, day=date.today())
+        for storage_mode in MODES:
+            for durability in ("immediate", "coalesced"):
+                latencies, elapsed, written = run(storage_mode, durability, orders, new_orders)
+                p50 = latencies[len(latencies) // 2]
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                print(f"{storage_mode:>8} {size:>8} {durability:>10} {p50 * 1000:>9.3f} {p99 * 1000:>9.3f} "
+                      f"{elapsed:>10.2f} {written / 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
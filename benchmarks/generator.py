@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Seeded synthetic order generator for the benchmarks.
+
+Produces a realistic mix of orders as the forms in app.py create them:
+YamYam menu numbers (a few favourites), Döner orders for every shop,
+product and box type with up to two sauces, up to three extras and
+free-text "custom:" extras, and Edeka salads, sandwiches and wraps
+(with sauce and optional customOrder) and Bäcker orders. Names follow a
+skewed distribution (some colleagues order every day), timestamps fall
+into the late morning of the given day, in increasing order.
+
+The same count, seed and day always give the same orders.
+"""
+
+import random
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from config import DONER_OPTIONS, EDEKA_OPTIONS, YAMYAM_OPTIONS
+
+DEFAULT_DAY = date(2025, 4, 8)
+
+FIRST_NAMES = [
+    "Anna", "Ben", "Clara", "David", "Elif", "Finn", "Greta", "Hannes", "Ida", "Jonas",
+    "Kemal", "Lena", "Mats", "Nora", "Ole", "Paula", "Quentin", "Rosa", "Sven", "Tara",
+    "Umut", "Vera", "Wim", "Yara", "Zoe",
+]
+LAST_INITIALS = "ABCDEFGHKLMNPRSTW"
+
+
+class _Choice:
+    """Weighted choice from fixed values (cumulative weights computed once)"""
+
+    def __init__(self, values, weights):
+        self.values = list(values)
+        self.cum_weights = list(accumulate(weights))
+        self.total = self.cum_weights[-1]
+
+    def __call__(self, rng):
+        # Same as rng.choices(values, cum_weights=...)[0], without its overhead
+        return self.values[bisect(self.cum_weights, rng.random() * self.total, 0, len(self.values) - 1)]
+
+
+# Share of the orders per restaurant and of the options
+RESTAURANT = _Choice(["yamyam", "doner", "edeka"], [0.35, 0.45, 0.2])
+SHOP = _Choice(DONER_OPTIONS["shop_values"], [0.5, 0.3, 0.2])
+DONER_PRODUCT = _Choice(DONER_OPTIONS["product_values"], [0.35, 0.25, 0.1, 0.1, 0.2])
+SAUCE_COUNT = _Choice(range(3), [0.1, 0.5, 0.4])
+EXTRA_COUNT = _Choice(range(4), [0.55, 0.3, 0.1, 0.05])
+SPICE_LEVEL = _Choice(DONER_OPTIONS["spice_values"], [0.3, 0.5, 0.2])
+EDEKA_PRODUCT = _Choice(EDEKA_OPTIONS["products"], [0.3, 0.3, 0.25, 0.15])
+
+CUSTOM_EXTRAS = [
+    "extra Feta", "doppelt Fleisch", "mit Halloumi", "Soße extra", "gut durch",
+    "ohne Rotkohl, dafür mehr Salat", "Brot getoastet",
+]
+CUSTOM_ORDERS = [
+    "Ohne Gurken", "Extra Käse", "Ohne Oliven", "Extra Tomaten", "Dressing separat",
+    "Vegan bitte", "Mit Ei",
+]
+BAECKER_ITEMS = [
+    "2 Laugenbrötchen", "1 Nussschnecke", "Käsebrötchen", "3 Brezeln",
+    "1 Franzbrötchen, 1 Kaffee", "Vollkornbrötchen mit Butter",
+]
+
+
+def _names(rng, count=60):
+    """Names of the colleagues; the first ones order most often (weights 1/rank)"""
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_INITIALS)}.")
+    names = sorted(names)
+    rng.shuffle(names)
+    return _Choice(names, [1 / rank for rank in range(1, count + 1)])
+
+
+def _yamyam_order(rng, name, favourites):
+    if rng.random() < 0.6:
+        number = rng.choice(favourites)
+    else:
+        number = rng.randint(1, YAMYAM_OPTIONS["max_number"])
+    return {"type": "yamyam", "name": name, "number": str(number)}
+
+
+def _doner_order(rng, name):
+    product = DONER_PRODUCT(rng)
+    extras = rng.sample(DONER_OPTIONS["extra_values"], EXTRA_COUNT(rng))
+    if len(extras) < 3 and rng.random() < 0.15:
+        extras.append(f"custom:{rng.choice(CUSTOM_EXTRAS)}")
+    order = {
+        "type": "doner",
+        "shop": SHOP(rng),
+        "name": name,
+        "product": product,
+        "sauces": rng.sample(DONER_OPTIONS["sauce_values"], SAUCE_COUNT(rng)),
+        "extras": extras,
+        "spiceLevel": SPICE_LEVEL(rng),
+    }
+    if product == "box":
+        order["boxType"] = rng.choice(DONER_OPTIONS["box_values"])
+    return order
+
+
+def _edeka_order(rng, name):
+    product = EDEKA_PRODUCT(rng)
+    order = {"type": "edeka", "name": name, "product": product}
+    if product == "Bäcker":
+        order["baeckerItem"] = rng.choice(BAECKER_ITEMS)
+        return order
+    if product == "Salat":
+        order["salatType"] = rng.choice(EDEKA_OPTIONS["salads"])
+    else:
+        order["sauce"] = rng.choice(EDEKA_OPTIONS["sauces"])
+    if rng.random() < 0.3:
+        order["customOrder"] = rng.choice(CUSTOM_ORDERS)
+    return order
+
+
+def generate_orders(count, seed=42, day=DEFAULT_DAY):
+    """
+    Generate count orders placed on day.
+
+    Args:
+        count (int): Number of orders
+        seed (int): Random seed
+        day (date): Day of the timestamps (date.today() for current orders)
+
+    Returns:
+        list: Order dicts without ID (as before add_order / an import)
+    """
+    rng = random.Random(seed)
+    name_choice = _names(rng)
+    favourites = rng.sample(range(1, YAMYAM_OPTIONS["max_number"] + 1), 8)
+
+    # Orders come in between 10:30 and 12:00, in increasing order
+    start = datetime.combine(day, datetime.min.time()) + timedelta(hours=10, minutes=30)
+    window_us = 90 * 60 * 1000000
+    offsets = sorted(rng.randrange(window_us) for _ in range(count))
+
+    orders = []
+    for offset in offsets:
+        name = name_choice(rng)
+        kind = RESTAURANT(rng)
+        if kind == "yamyam":
+            order = _yamyam_order(rng, name, favourites)
+        elif kind == "doner":
+            order = _doner_order(rng, name)
+        else:
+            order = _edeka_order(rng, name)
+        order["timestamp"] = (start + timedelta(microseconds=offset)).isoformat()
+        orders.append(order)
+    return orders
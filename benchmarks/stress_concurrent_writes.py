@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stress test for concurrent writers on the storage backends.
+
+Starts several writer processes that share one order file. Each writer
+adds orders and removes every fifth of its own orders again, exactly like
+the OrderManager does (keeping its own, possibly stale, in-memory list),
+once with every change committed on its own and once coalesced (changes
+applied in memory and written BATCH at a time with commit_many).
+Afterwards the persisted orders are checked: every surviving order must be
+present exactly once and no removed order may reappear.
+
+Usage:
+    python -m benchmarks.stress_concurrent_writes [writers] [orders_per_writer] [modes...]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from order_list import OrderList, new_order_id
+from storage import apply_record, create_storage
+
+DEFAULT_WRITERS = 8
+DEFAULT_ORDERS = 200
+DEFAULT_MODES = ["journal", "json", "sqlite"]
+REMOVE_EVERY = 5
+# Changes per write of the coalesced writers
+BATCH = 7
+
+
+def _writer(mode, storage_file, writer_id, count, start_event, coalesced):
+    # Small compaction threshold so sealing and compaction happen under load
+    storage = create_storage(mode, storage_file, compact_threshold=16 * 1024)
+    orders = OrderList(storage.load())
+    pending = []
+
+    def commit(record):
+        if not coalesced:
+            storage.commit(record, orders)
+            return
+        apply_record(orders, record)
+        pending.append(record)
+        if len(pending) >= BATCH:
+            storage.commit_many(pending, orders)
+            pending.clear()
+
+    start_event.wait()
+    for number in range(count):
+        order = {"id": new_order_id(), "type": "yamyam", "name": f"writer-{writer_id}", "number": number}
+        commit({"op": "add", "order": order})
+        if number % REMOVE_EVERY == REMOVE_EVERY - 1:
+            commit({"op": "remove", "order": order})
+    if pending:
+        storage.commit_many(pending, orders)
+
+
+def expected_orders(writers, count):
+    """Set of (writer, number) pairs that must survive"""
+    return {
+        (f"writer-{writer_id}", number)
+        for writer_id in range(writers)
+        for number in range(count)
+        if number % REMOVE_EVERY != REMOVE_EVERY - 1
+    }
+
+
+def run(mode, writers, count, coalesced=False):
+    """
+    Run one stress round.
+
+    Returns:
+        tuple: (ok, writes, elapsed seconds, message)
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        storage_file = os.path.join(directory, "lunch_orders.json")
+        # Create the database/schema once before the writers start
+        create_storage(mode, storage_file).load()
+        start_event = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=_writer, args=(mode, storage_file, writer_id, count, start_event, coalesced)
+            )
+            for writer_id in range(writers)
+        ]
+        for process in processes:
+            process.start()
+        start = time.perf_counter()
+        start_event.set()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        if any(process.exitcode != 0 for process in processes):
+            return False, 0, elapsed, "writer process failed"
+
+        orders = create_storage(mode, storage_file).load()
+        found = [(order["name"], order["number"]) for order in orders]
+        expected = expected_orders(writers, count)
+        writes = writers * (count + count // REMOVE_EVERY)
+        if len(found) != len(set(found)):
+            return False, writes, elapsed, "duplicate orders"
+        if set(found) != expected:
+            missing = len(expected - set(found))
+            extra = len(set(found) - expected)
+            return False, writes, elapsed, f"{missing} orders lost, {extra} removed orders back"
+        return True, writes, elapsed, f"{len(found)} orders"
+
+
+def main(writers, count, modes):
+    print(f"{writers} writers x {count} orders")
+    print(f"{'mode':>8} {'durability':>10} {'changes':>8} {'time [s]':>9} {'changes/s':>10}  result")
+    failed = False
+    for mode in modes:
+        for coalesced in (False, True):
+            ok, writes, elapsed, message = run(mode, writers, count, coalesced)
+            failed = failed or not ok
+            print(f"{mode:>8} {'coalesced' if coalesced else 'immediate':>10} {writes:>8} {elapsed:>9.2f} "
+                  f"{writes / elapsed:>10.0f}  {'OK' if ok else 'FAILED'} ({message})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sys.exit(main(
+        int(args[0]) if len(args) > 0 else DEFAULT_WRITERS,
+        int(args[1]) if len(args) > 1 else DEFAULT_ORDERS,
+        args[2:] or DEFAULT_MODES,
+    ))
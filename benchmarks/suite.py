@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite for storage, formatting and exports.
+
+For every size, generated orders (benchmarks/generator.py) are loaded into
+an OrderManager and these operations are measured:
+
+    manager_load        OrderManager construction (reads the order file)
+    manager_save        save_orders
+    manager_add         add_order (OPS orders, one at a time, then flush)
+    manager_remove      remove_order (OPS orders, by ID, then flush)
+    orders_dataframe    get_orders_dataframe without cached rows
+    text_report         create_text_report
+    image_report        create_image_report (first page)
+    csv_export          create_export(write_csv_export, ...)
+    json_export         create_export(write_json_export, ...)
+
+Time is the best of several runs; peak memory is measured in a separate
+run with tracemalloc (memory allocated by the operation beyond what
+existed before it). The results are written as JSON, so runs can be
+compared with --compare.
+
+Usage:
+    python -m benchmarks.suite [--sizes 100 10000 1000000] [--storage journal]
+                               [--output results.json] [--compare old.json]
+                               [--no-memory]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+from benchmarks.generator import generate_orders
+from cloud_storage import CloudStorage
+from config import STORAGE_MODE
+from models import OrderManager
+from utils import create_export, create_image_report, create_text_report, write_csv_export, write_json_export
+
+DEFAULT_SIZES = [100, 10000, 1000000]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = "benchmark_results.json"
+SEED = 42
+# Orders added / removed one by one per run of manager_add / manager_remove
+OPS = 1000
+
+
+class Context:
+    """Order manager with count generated orders in a temporary directory"""
+
+    def __init__(self, count, storage_mode, tmp_dir):
+        self.count = count
+        self.storage_mode = storage_mode
+        self.storage_file = os.path.join(tmp_dir, "orders.json")
+        self.ops = min(OPS, count)
+        # Today's orders, so loading doesn't move them into the history
+        orders = generate_orders(count, seed=SEED, day=date.today())
+        self.new_orders = generate_orders(self.ops, seed=SEED + 1, day=date.today())
+        CloudStorage.delete_data('orders_data')
+        self.manager = OrderManager(self.storage_file, storage_mode=storage_mode)
+        self.manager.replace_orders(orders)
+        del orders
+
+    def load_manager(self):
+        # Without the process-wide copy, so the order file is read; the old
+        # manager is dropped first, so only one order list is held
+        self.manager = None
+        CloudStorage.delete_data('orders_data')
+        self.manager = OrderManager(self.storage_file, storage_mode=self.storage_mode)
+
+
+# Each case prepares its run (untimed) and returns the callable to measure
+def case_manager_load(ctx):
+    return ctx.load_manager
+
+
+def case_manager_save(ctx):
+    return ctx.manager.save_orders
+
+
+def case_manager_add(ctx):
+    orders = [dict(order) for order in ctx.new_orders]
+
+    def run():
+        for order in orders:
+            ctx.manager.add_order(order)
+        # Including the write of coalesced changes
+        ctx.manager.flush()
+    return run
+
+
+def case_manager_remove(ctx):
+    order_ids = [order["id"] for order in list(ctx.manager.get_orders())[-ctx.ops:]]
+
+    def run():
+        for order_id in order_ids:
+            ctx.manager.remove_order(order_id)
+        ctx.manager.flush()
+    return run
+
+
+def case_orders_dataframe(ctx):
+    # Reloading drops the cached display rows
+    ctx.manager.load_orders()
+    return ctx.manager.get_orders_dataframe
+
+
+def case_text_report(ctx):
+    orders, summary = list(ctx.manager.get_orders()), ctx.manager.get_summary()
+    return lambda: create_text_report(orders, summary)
+
+
+def case_image_report(ctx):
+    orders, summary = list(ctx.manager.get_orders()), ctx.manager.get_summary()
+    return lambda: create_image_report(orders, summary)
+
+
+def case_csv_export(ctx):
+    frame = ctx.manager.get_orders_dataframe()
+    return lambda: create_export(write_csv_export, frame)
+
+
+def case_json_export(ctx):
+    orders = list(ctx.manager.get_orders())
+    return lambda: create_export(write_json_export, orders)
+
+
+CASES = [
+    ("manager_load", case_manager_load, False),
+    ("manager_save", case_manager_save, False),
+    ("manager_add", case_manager_add, True),
+    ("manager_remove", case_manager_remove, True),
+    ("orders_dataframe", case_orders_dataframe, False),
+    ("text_report", case_text_report, False),
+    ("image_report", case_image_report, False),
+    ("csv_export", case_csv_export, False),
+    ("json_export", case_json_export, False),
+]
+
+
+def measure_time(ctx, case, repeat):
+    best = None
+    for _ in range(repeat):
+        run = case(ctx)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_memory(ctx, case):
+    run = case(ctx)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes, storage_mode, memory=True):
+    results = []
+    for size in sizes:
+        repeat = 3 if size <= 10000 else 1
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+            ctx = Context(size, storage_mode, tmp_dir)
+            for name, case, per_op in CASES:
+                seconds = measure_time(ctx, case, repeat)
+                peak = measure_memory(ctx, case) if memory else None
+                result = {
+                    "benchmark": name,
+                    "orders": size,
+                    "ops": ctx.ops if per_op else 1,
+                    "seconds": seconds,
+                    "seconds_per_op": seconds / (ctx.ops if per_op else 1),
+                    "peak_bytes": peak,
+                }
+                results.append(result)
+                print_result(result)
+            CloudStorage.delete_data('orders_data')
+            del ctx
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_header():
+    print(f"{'benchmark':<18} {'orders':>8} {'ops':>5} {'time [s]':>10} {'per op [ms]':>12} {'peak [MB]':>10}")
+
+
+def print_result(result, previous=None):
+    peak = "-" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 1e6:.1f}"
+    line = (f"{result['benchmark']:<18} {result['orders']:>8} {result['ops']:>5} "
+            f"{result['seconds']:>10.4f} {result['seconds_per_op'] * 1000:>12.3f} {peak:>10}")
+    if previous is not None:
+        line += f"   {result['seconds'] / previous['seconds']:.2f}x time"
+    print(line)
+
+
+def compare(results, path):
+    """Print the results next to the time ratio against an earlier run"""
+    with open(path, encoding="utf-8") as f:
+        earlier = json.load(f)
+    previous = {(result["benchmark"], result["orders"]): result for result in earlier["results"]}
+    print(f"\nCompared with {path} ({earlier['meta'].get('commit')}, {earlier['meta'].get('created')}):")
+    print_header()
+    for result in results:
+        print_result(result, previous.get((result["benchmark"], result["orders"])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LunchSquad benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite"], default=STORAGE_MODE)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file for the results")
+    parser.add_argument("--compare", help="Results of an earlier run to compare with")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory runs")
+    args = parser.parse_args()
+
+    print_header()
+    results = run_suite(args.sizes, args.storage, memory=not args.no_memory)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage_mode": args.storage,
+            "seed": SEED,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
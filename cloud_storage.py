@@ -9,16 +9,29 @@ Provides mechanisms to store and retrieve data in Streamlit Cloud environment.
 import json
 import streamlit as st
 
+
+@st.cache_resource
+def _shared_data():
+    """
+    Process-wide data store shared by all sessions.
+    Created once per process, so every session holds a reference to the
+    same objects instead of its own copy.
+    """
+    return {}
+
+
 class CloudStorage:
     """
-    Handles data persistence in Streamlit Cloud environment using session_state.
-    This class provides a reliable way to store data between app restarts in Streamlit Cloud.
+    Handles data persistence in Streamlit Cloud environment using a
+    process-wide store shared by all sessions.
+    This class provides a reliable way to store data between session restarts in Streamlit Cloud.
     """
     
     @staticmethod
     def save_data(key, data):
         """
-        Save data to Streamlit's session state with a persistent marker.
+        Save data to the process-wide store.
+        The data is stored by reference, not copied.
         
         Args:
             key (str): The key to store the data under
@@ -27,21 +40,13 @@ class CloudStorage:
         Returns:
             bool: True if successful
         """
-        # Create a persistent storage marker if it doesn't exist
-        if '_persistent_data_keys' not in st.session_state:
-            st.session_state._persistent_data_keys = set()
-        
-        # Add this key to the persistent keys set
-        st.session_state._persistent_data_keys.add(key)
-        
-        # Store the actual data
-        st.session_state[key] = data
+        _shared_data()[key] = data
         return True
     
     @staticmethod
     def load_data(key, default=None):
         """
-        Load data from Streamlit's session state.
+        Load data from the process-wide store.
         
         Args:
             key (str): The key to retrieve data from
@@ -50,14 +55,12 @@ class CloudStorage:
         Returns:
             any: The stored data or default value
         """
-        if key in st.session_state:
-            return st.session_state[key]
-        return default
+        return _shared_data().get(key, default)
     
     @staticmethod
     def delete_data(key):
         """
-        Delete data from Streamlit's session state.
+        Delete data from the process-wide store.
         
         Args:
             key (str): The key to delete
@@ -65,10 +68,9 @@ class CloudStorage:
         Returns:
             bool: True if deletion was successful
         """
-        if key in st.session_state:
-            del st.session_state[key]
-            if '_persistent_data_keys' in st.session_state and key in st.session_state._persistent_data_keys:
-                st.session_state._persistent_data_keys.remove(key)
+        data = _shared_data()
+        if key in data:
+            del data[key]
             return True
         return False
     
@@ -80,6 +82,4 @@ class CloudStorage:
         Returns:
             set: Set of key names
         """
-        if '_persistent_data_keys' in st.session_state:
-            return st.session_state._persistent_data_keys
-        return set()
\ No newline at end of file
+        return set(_shared_data().keys())
\ No newline at end of file
@@ -9,6 +9,55 @@ Configuration settings for the LunchSquad app
 APP_TITLE = "LunchSquad"
 DEFAULT_ORDER_FILE = "lunch_orders.json"
 
+# Storage settings
+# "journal": append-only journal with background compaction
+# "sqlite": SQLite database next to the order file (lunch_orders.db),
+#           migrated once from DEFAULT_ORDER_FILE on first use
+# "json": rewrite the whole order file on every change
+STORAGE_MODE = "journal"
+JOURNAL_COMPACT_BYTES = 1024 * 1024  # Compact once the journal exceeds 1 MiB
+# "immediate": every change is written before the request returns
+# "coalesced": changes are written by a background thread, all changes of
+#              the debounce window in one write (at exit and on "Speichern"
+#              right away); a crash loses at most the last window
+DURABILITY = "coalesced"
+WRITE_DEBOUNCE_SECONDS = 0.5
+# Recent changes kept in the change feed of the order manager
+CHANGE_FEED_SIZE = 1000
+
+# Teams: every team has its own orders, selected with ?team=<name> in the
+# app and API URLs (see teams.py). Orders of a team are stored in
+# TEAMS_DIR/<name>/ (without ?team= in DEFAULT_ORDER_FILE as before).
+TEAMS_DIR = "teams"
+TEAM_NAME_PATTERN = r"[a-z0-9][a-z0-9_-]{0,39}"  # Lowercase, also used as directory name
+TEAMS = None  # Allowed team names, e.g. ["marketing", "dev"] (None: any valid name)
+TEAM_MAX_COUNT = 50  # At most this many team directories; no new teams beyond
+TEAM_MAX_ORDERS = 20000  # Current orders per team (memory budget); None: no limit
+TEAM_IDLE_SECONDS = 15 * 60  # Orders of a team unused this long are dropped from memory
+
+# Order history: orders of past days are moved from the order file into
+# one read-only segment per day in lunch_orders_history/
+HISTORY_COMPRESSION = "gzip"  # "gzip" or "lzma"
+
+# Performance metrics (timing hooks, see metrics.py). The hidden admin view
+# (app URL with ?admin=metrics) shows them and can switch them on and off.
+METRICS_ENABLED = False
+METRICS_WINDOW = 1024  # Recent calls per operation used for p50/p95/p99
+METRICS_FILE = "lunch_metrics.prom"  # Prometheus text format
+METRICS_FILE_INTERVAL = 15  # Seconds between rewrites of METRICS_FILE
+
+# Seconds between refreshes of the order tables (changes by others show up)
+ORDER_TABLE_REFRESH_SECONDS = 5
+
+# HTTP/JSON order API (see api.py), started together with the app
+API_ENABLED = True
+API_HOST = "127.0.0.1"  # Only local clients; "0.0.0.0" for the whole network
+API_PORT = 8502
+API_WORKERS = 8  # Worker threads (one per open connection)
+API_IDLE_TIMEOUT = 30  # Seconds before an idle connection is closed
+API_TOKEN = None  # Bearer token required by the API (None: no token)
+API_MAX_BODY_BYTES = 10 * 1024 * 1024  # Largest accepted request body
+
 # YamYam options
 YAMYAM_OPTIONS = {
     "name": "YamYam",
@@ -42,6 +91,7 @@ DONER_OPTIONS = {
     # Spice levels
     "spice_levels": ["Nicht scharf", "Normal scharf", "Extra scharf"],
     "spice_values": ["none", "normal", "extra"],
+    "spice_report_labels": ["nicht scharf", "normal scharf", "sehr scharf"],  # Shown in order lists and reports
     
     # Extras (things to leave out)
     "extras": ["Ohne Zwiebel", "Ohne Tomate", "Ohne Blaukraut", "Ohne Salat", 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Order history for the LunchSquad application.
+
+Orders of past days are moved out of the active order store into one
+compressed segment file per day (YYYY-MM-DD.json.gz or .json.xz). Sealed
+segments are read-only and only read when a day of the history is shown,
+so startup only loads the orders of the current day. For analytics the
+segments are also kept as monthly Parquet files (see archive.py).
+"""
+
+import gzip
+import json
+import lzma
+import os
+import re
+import threading
+from collections import OrderedDict
+from archive import OrderArchive
+from records import to_orders, to_records
+from storage import file_lock, order_key
+
+# Compression formats: file suffix and opener for a binary file object
+SEGMENT_FORMATS = {
+    "gzip": (".json.gz", lambda f, mode: gzip.GzipFile(fileobj=f, mode=mode)),
+    "lzma": (".json.xz", lambda f, mode: lzma.LZMAFile(f, mode)),
+}
+
+_SEGMENT_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})(\.json\.gz|\.json\.xz)$")
+
+
+def order_day(order):
+    """Day of an order as "YYYY-MM-DD" (None if it has no timestamp)"""
+    timestamp = order.get("timestamp")
+    if isinstance(timestamp, str) and len(timestamp) >= 10:
+        return timestamp[:10]
+    return None
+
+
+class OrderHistory:
+    """
+    Per-day segments of past orders.
+
+    Segments are written once when a day is rolled over (merged if the
+    day already has a segment) and cached after reading, so browsing the
+    history only decompresses each day once. The cache holds the days as
+    compact records (see records.py), about a third of the memory of the
+    order dicts.
+    """
+
+    def __init__(self, history_dir, compression="gzip", cache_days=31):
+        if compression not in SEGMENT_FORMATS:
+            raise ValueError(f"Unknown history compression: {compression}")
+        self.history_dir = history_dir
+        self.compression = compression
+        self.cache_days = cache_days
+        self.archive = OrderArchive(os.path.join(history_dir, "archive"))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def days(self):
+        """
+        List the days with a history segment (oldest first).
+        Only the directory is listed, no segment is read.
+        """
+        if not os.path.isdir(self.history_dir):
+            return []
+        days = set()
+        for file_name in os.listdir(self.history_dir):
+            match = _SEGMENT_NAME.match(file_name)
+            if match:
+                days.add(match.group(1))
+        return sorted(days)
+
+    def load_day(self, day):
+        """
+        Load the orders of one day.
+
+        Returns:
+            list: The orders of the day (empty if there is no segment)
+        """
+        path = self._find_segment(day)
+        if path is None:
+            return []
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                self._cache.move_to_end(path)
+                return to_orders(cached[1])
+        orders = self._read_segment(path)
+        with self._lock:
+            self._cache[path] = (mtime, to_records(orders))
+            while len(self._cache) > self.cache_days:
+                self._cache.popitem(last=False)
+        return orders
+
+    def load_range(self, since=None, until=None):
+        """Load the orders of all days with since <= day < until"""
+        orders = []
+        for day in self.days():
+            if since is not None and day < since:
+                continue
+            if until is not None and day >= until:
+                continue
+            orders.extend(self.load_day(day))
+        return orders
+
+    def load_month(self, month):
+        """Load the orders of all days of a month ("YYYY-MM")"""
+        orders = []
+        for day in self.days():
+            if day.startswith(month):
+                orders.extend(self.load_day(day))
+        return orders
+
+    def add(self, orders):
+        """
+        Write orders into the segments of their days and update the
+        Parquet archive of the affected months.
+        Orders already contained in a segment are not added twice, so an
+        interrupted rollover can simply be repeated.
+        """
+        by_day = {}
+        for order in orders:
+            by_day.setdefault(order_day(order), []).append(order)
+        by_day.pop(None, None)
+        if not by_day:
+            return
+        os.makedirs(self.history_dir, exist_ok=True)
+        with file_lock(os.path.join(self.history_dir, ".lock")):
+            for day, day_orders in sorted(by_day.items()):
+                path = self._find_segment(day)
+                existing = self._read_segment(path) if path else []
+                known = {order_key(order) for order in existing}
+                merged = existing + [order for order in day_orders if order_key(order) not in known]
+                if path and len(merged) == len(existing):
+                    continue
+                self._write_segment(day, merged, path)
+            for month in sorted({day[:7] for day in by_day}):
+                self.archive.write_month(month, self.load_month(month))
+
+    def sync_archive(self):
+        """
+        Write the Parquet files of months that are missing or older than
+        their segments (e.g. history written before the archive existed).
+        Only file times are compared, no segment is read for current months.
+        """
+        latest = {}
+        for day in self.days():
+            mtime = os.stat(self._find_segment(day)).st_mtime_ns
+            latest[day[:7]] = max(latest.get(day[:7], 0), mtime)
+        with file_lock(os.path.join(self.history_dir, ".lock")):
+            for month, mtime in sorted(latest.items()):
+                path = self.archive.month_path(month)
+                if not os.path.exists(path) or os.stat(path).st_mtime_ns < mtime:
+                    self.archive.write_month(month, self.load_month(month))
+
+    def _find_segment(self, day):
+        for suffix, _ in SEGMENT_FORMATS.values():
+            path = os.path.join(self.history_dir, f"{day}{suffix}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _read_segment(self, path):
+        for suffix, opener in SEGMENT_FORMATS.values():
+            if path.endswith(suffix):
+                with open(path, 'rb') as raw, opener(raw, 'rb') as f:
+                    return json.loads(f.read().decode('utf-8'))
+        raise ValueError(f"Unknown history segment: {path}")
+
+    def _write_segment(self, day, orders, old_path=None):
+        """Write a sealed (read-only) segment, replacing old_path atomically"""
+        suffix, opener = SEGMENT_FORMATS[self.compression]
+        path = os.path.join(self.history_dir, f"{day}{suffix}")
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with open(tmp_path, 'wb') as raw:
+            with opener(raw, 'wb') as f:
+                f.write(json.dumps(orders, ensure_ascii=False).encode('utf-8'))
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, path)
+        if old_path and old_path != path:
+            # The day was sealed with another compression before
+            os.remove(old_path)
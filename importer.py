@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Streaming order import for the LunchSquad application.
+
+Reads JSONL files line by line and JSON arrays element by element, so a
+large file is never parsed in one go. Orders are validated in batches and
+either merged into the current orders (skipping orders that are already
+there) or replace them; the result is persisted in a single write.
+Imports run in a background thread and report their progress.
+"""
+
+import codecs
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime
+from itertools import chain, islice
+from storage import order_key
+from validation import validate_orders
+
+IMPORT_BATCH_SIZE = 1000
+# Number of error messages kept for the import report
+MAX_REPORTED_ERRORS = 20
+# Largest accepted single record (characters); protects against broken files
+MAX_RECORD_CHARS = 1024 * 1024
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def _iter_text(stream, chunk_size):
+    """Read a binary stream as text chunks (UTF-8, BOM tolerated)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+
+def iter_json_records(stream, chunk_size=64 * 1024):
+    """
+    Iterate over the records of a JSONL file or a JSON array.
+
+    Only a small window of the file is held in memory. Unparsable JSONL
+    lines are yielded as ValueError instances, so the import can report
+    them and continue; a broken JSON array raises ValueError.
+
+    Yields:
+        tuple: (row number, record or ValueError)
+    """
+    chunks = _iter_text(stream, chunk_size)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+    if buffer.lstrip().startswith("["):
+        yield from _iter_json_array(buffer, chunks)
+    else:
+        yield from _iter_json_lines(_iter_lines(buffer, chunks))
+
+
+def _iter_lines(buffer, chunks):
+    """Split text chunks into lines"""
+    pending = ""
+    for chunk in chain([buffer], chunks):
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        if len(pending) > MAX_RECORD_CHARS:
+            raise ValueError("Zeile zu lang - ist das eine JSONL-Datei?")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _iter_json_lines(lines):
+    for row, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield row, json.loads(line)
+        except ValueError as e:
+            yield row, ValueError(f"ungültiges JSON ({e})")
+
+
+def _iter_json_array(buffer, chunks):
+    decoder = json.JSONDecoder()
+    pos = buffer.index("[") + 1
+    exhausted = False
+    row = 0
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            if pos >= len(buffer):
+                raise ValueError("Unerwartetes Dateiende")
+            record, end = decoder.raw_decode(buffer, pos)
+            if end >= len(buffer) and not exhausted:
+                # The record might continue in the next chunk
+                raise ValueError("Unerwartetes Dateiende")
+        except ValueError as e:
+            if exhausted or len(buffer) - pos > MAX_RECORD_CHARS:
+                raise ValueError(f"Eintrag {row + 1}: ungültiges JSON ({e})")
+            # Keep the unparsed rest and read more
+            chunk = next(chunks, None)
+            exhausted = chunk is None
+            buffer = buffer[pos:] + (chunk or "")
+            pos = 0
+            continue
+        row += 1
+        yield row, record
+        pos = end
+
+
+def content_hash(order):
+    """
+    Hash of the order content (including its timestamp) for deduplication.
+    The order ID is left out, so orders exported before they had an ID
+    are still recognized.
+    """
+    if "id" in order:
+        order = {key: value for key, value in order.items() if key != "id"}
+    return hashlib.blake2b(order_key(order).encode("utf-8"), digest_size=16).digest()
+
+
+def _normalize_timestamp(value):
+    """
+    Timestamp in the form the app writes it (ISO, local time without
+    UTC offset), so imported orders sort, roll over and deduplicate like
+    the others.
+
+    Raises:
+        ValueError: If the value is missing or not an ISO timestamp
+    """
+    if value is None:
+        # Without a timestamp an order would never roll over into the history
+        raise ValueError("Zeitpunkt fehlt.")
+    if not isinstance(value, str):
+        raise ValueError(f"Ungültiger Zeitpunkt: {value!r}")
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Ungültiger Zeitpunkt: {value!r}") from None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat()
+
+
+class _CountingReader:
+    """Binary stream wrapper that counts the bytes read (for progress)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.position = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.position += len(data)
+        return data
+
+
+class ImportJob:
+    """
+    Import of one file, running in a background thread.
+
+    The attributes can be read at any time to show the progress; once
+    done is True, imported/duplicates/invalid/errors hold the report and
+    error is set if the file could not be imported at all.
+    """
+
+    def __init__(self, order_manager, stream, total_bytes, replace=False, batch_size=IMPORT_BATCH_SIZE):
+        self.order_manager = order_manager
+        self.total_bytes = total_bytes
+        self.replace = replace
+        self.batch_size = batch_size
+        self.rows = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+        self.error = None
+        self.done = False
+        self._reader = _CountingReader(stream)
+        self._thread = None
+
+    @property
+    def progress(self):
+        """Fraction of the file that has been read (0.0 - 1.0)"""
+        if self.done:
+            return 1.0
+        if not self.total_bytes:
+            return 0.0
+        return min(1.0, self._reader.position / self.total_bytes)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        """Parse, validate and deduplicate all records, then write once"""
+        try:
+            seen = set()
+            if not self.replace:
+                seen.update(content_hash(order) for order in list(self.order_manager.get_orders()))
+            accepted = []
+            records = iter_json_records(self._reader)
+            while True:
+                batch = list(islice(records, self.batch_size))
+                if not batch:
+                    break
+                self._check_batch(batch, accepted, seen)
+                self.rows += len(batch)
+            self.order_manager.import_orders(accepted, replace=self.replace)
+            self.imported = len(accepted)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.done = True
+
+    def _check_batch(self, batch, accepted, seen):
+        errors = validate_orders([record for _, record in batch])
+        for position, (row, record) in enumerate(batch):
+            if isinstance(record, ValueError):
+                message = str(record)
+            else:
+                message = errors.get(position)
+            if message is None:
+                try:
+                    record["timestamp"] = _normalize_timestamp(record.get("timestamp"))
+                except ValueError as e:
+                    message = str(e)
+            if message is not None:
+                self.invalid += 1
+                if len(self.errors) < MAX_REPORTED_ERRORS:
+                    self.errors.append(f"Eintrag {row}: {message}")
+                continue
+            key = content_hash(record)
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            accepted.append(record)
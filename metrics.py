@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Timing and counting hooks for the LunchSquad application.
+
+Hot paths (loading and saving orders, building the order table, reports,
+exports and download links) are wrapped in METRICS.timer(...) or
+decorated with timed(...). While metrics are enabled every call records
+its duration, the bytes it wrote and the number of orders it handled;
+the durations of the most recent calls are kept per operation for the
+p50/p95/p99 quantiles. While metrics are disabled a hook costs one
+attribute check.
+
+The numbers are shown in the hidden admin view of app.py and written in
+the Prometheus text format (to_prometheus / write_prometheus).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from config import METRICS_ENABLED, METRICS_WINDOW
+
+QUANTILES = (0.5, 0.95, 0.99)
+PROMETHEUS_PREFIX = "lunchsquad"
+
+
+class OperationStats:
+    """Counters of one operation and the durations of its recent calls"""
+
+    def __init__(self, window):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.orders = 0
+        self.durations = deque(maxlen=window)
+
+    def record(self, seconds, nbytes, orders, error):
+        self.calls += 1
+        self.errors += error
+        self.seconds += seconds
+        self.bytes += nbytes
+        self.orders += orders
+        self.durations.append(seconds)
+
+    def quantiles(self):
+        """Quantiles (nearest rank) of the recent durations in seconds"""
+        durations = sorted(self.durations)
+        if not durations:
+            return {quantile: 0.0 for quantile in QUANTILES}
+        return {
+            quantile: durations[min(len(durations) - 1, int(quantile * len(durations)))]
+            for quantile in QUANTILES
+        }
+
+
+class _Timer:
+    """Context manager that records one call; set bytes / orders inside"""
+
+    __slots__ = ("metrics", "name", "bytes", "orders", "_start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.bytes = 0
+        self.orders = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.metrics.record(self.name, time.perf_counter() - self._start,
+                            self.bytes, self.orders, error=exc_type is not None)
+        return False
+
+
+class _NullTimer:
+    """Shared timer used while metrics are disabled (records nothing)"""
+
+    __slots__ = ("bytes", "orders")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Process-wide registry of operation stats"""
+
+    def __init__(self, enabled=False, window=1024):
+        self.enabled = enabled
+        self.window = window
+        self._operations = {}
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def timer(self, name):
+        """
+        Time the enclosed block as one call of the operation name.
+
+        Usage:
+            with METRICS.timer("save_orders") as timer:
+                ...
+                timer.orders = len(orders)
+        """
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def record(self, name, seconds, nbytes=0, orders=0, error=False):
+        """Record one call of an operation"""
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = OperationStats(self.window)
+            stats.record(seconds, nbytes, orders, error)
+
+    def reset(self):
+        with self._lock:
+            self._operations = {}
+
+    def snapshot(self):
+        """
+        Current stats of all operations.
+
+        Returns:
+            list: One dict per operation (name, calls, errors, seconds,
+                  bytes, orders, p50, p95, p99), sorted by name
+        """
+        with self._lock:
+            operations = sorted(self._operations.items())
+            rows = []
+            for name, stats in operations:
+                quantiles = stats.quantiles()
+                rows.append({
+                    "name": name,
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "seconds": stats.seconds,
+                    "bytes": stats.bytes,
+                    "orders": stats.orders,
+                    "p50": quantiles[0.5],
+                    "p95": quantiles[0.95],
+                    "p99": quantiles[0.99],
+                })
+            return rows
+
+    def to_prometheus(self):
+        """All stats in the Prometheus text exposition format"""
+        rows = self.snapshot()
+        lines = []
+
+        def metric(name, kind, text, samples):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{{{labels}}} {value!r}")
+
+        metric("operation_duration_seconds", "summary",
+               "Duration of instrumented operations (quantiles over the recent calls)",
+               [(f'operation="{row["name"]}",quantile="{quantile}"', row[key])
+                for row in rows for quantile, key in zip(QUANTILES, ("p50", "p95", "p99"))])
+        lines.extend(f'{PROMETHEUS_PREFIX}_operation_duration_seconds_sum{{operation="{row["name"]}"}} {row["seconds"]!r}'
+                     for row in rows)
+        lines.extend(f'{PROMETHEUS_PREFIX}_operation_duration_seconds_count{{operation="{row["name"]}"}} {row["calls"]}'
+                     for row in rows)
+        metric("operation_errors_total", "counter", "Calls that raised an exception",
+               [(f'operation="{row["name"]}"', row["errors"]) for row in rows])
+        metric("operation_bytes_total", "counter", "Bytes written by instrumented operations",
+               [(f'operation="{row["name"]}"', row["bytes"]) for row in rows])
+        metric("operation_orders_total", "counter", "Orders handled by instrumented operations",
+               [(f'operation="{row["name"]}"', row["orders"]) for row in rows])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text to a file (atomically, for a textfile collector)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_file_export(self, path, interval):
+        """Rewrite the Prometheus file every interval seconds while metrics are enabled"""
+        if self._writer is not None:
+            return
+        self._writer = threading.Thread(target=self._export_loop, args=(path, interval), daemon=True)
+        self._writer.start()
+
+    def _export_loop(self, path, interval):
+        while True:
+            time.sleep(interval)
+            if not self.enabled:
+                continue
+            try:
+                self.write_prometheus(path)
+            except OSError as e:
+                print(f"Error writing metrics file: {e}")
+
+
+METRICS = Metrics(enabled=METRICS_ENABLED, window=METRICS_WINDOW)
+
+
+def timed(name, measure=None):
+    """
+    Decorator that records every call of the function as operation name.
+
+    Args:
+        name (str): Operation name
+        measure (callable): Optional measure(result, *args, **kwargs)
+            returning (bytes, orders) of the call; only called while
+            metrics are enabled
+    """
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                METRICS.record(name, time.perf_counter() - start, error=True)
+                raise
+            seconds = time.perf_counter() - start
+            nbytes, orders = measure(result, *args, **kwargs) if measure else (0, 0)
+            METRICS.record(name, seconds, nbytes, orders)
+            return result
+        return wrapper
+    return decorate
@@ -5,242 +5,673 @@
 Data models for the LunchSquad application
 """
 
-import json
 import os
-from datetime import datetime
-import pandas as pd
-import streamlit as st
-from config import DEFAULT_ORDER_FILE
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from itertools import islice
+from config import (DEFAULT_ORDER_FILE, STORAGE_MODE, JOURNAL_COMPACT_BYTES, HISTORY_COMPRESSION,
+                    DURABILITY, WRITE_DEBOUNCE_SECONDS, CHANGE_FEED_SIZE)
 from cloud_storage import CloudStorage
+from rendering import TABLE_COLUMNS, render_order, render_table_columns, render_table_row
+from history import OrderHistory, order_day
+from metrics import METRICS
+from order_list import OrderList, new_order_id
+from storage import apply_record, create_storage, filter_orders
+from summary import OrderSummary
+from writer import DebouncedWriter
 
 class OrderManager:
-    """Manages the orders and their persistence"""
+    """
+    Manages the orders and their persistence.
 
-    def __init__(self, storage_file=DEFAULT_ORDER_FILE):
+    One instance per team is shared by all sessions of the process (see
+    teams.py). Every mutation bumps the revision counter, so
+    sessions only need to remember the revision they last rendered. The
+    change feed (changes_since) holds the most recent changes by revision.
+
+    With durability "immediate" every change is persisted before the call
+    returns. With "coalesced" a change is applied in memory and persisted
+    by a background writer together with the other changes of the
+    debounce window (see writer.py); flush() writes them right away.
+
+    unload() drops the orders and cached rows from memory (e.g. of an idle
+    team); they are loaded again on the next access.
+    """
+
+    def __init__(self, storage_file=DEFAULT_ORDER_FILE, storage_mode=STORAGE_MODE,
+                 durability=DURABILITY, debounce=WRITE_DEBOUNCE_SECONDS,
+                 cloud_key="orders_data", max_orders=None, load=True):
         self.storage_file = storage_file
-        self.orders = []
+        self.storage_mode = storage_mode
+        # Key of the orders in the process-wide Cloud Storage
+        self.cloud_key = cloud_key
+        # Most current orders held (None: no limit), see has_room
+        self.max_orders = max_orders
+        # Current orders, indexed by their stable order ID (None: unloaded)
+        self._orders = None
+        self.last_used = time.monotonic()
+        self.orders = OrderList()
+        self.revision = 0
+        # Change feed: (revision, "add" | "remove" | "reset", orders) per revision
+        self.changes = deque(maxlen=CHANGE_FEED_SIZE)
+        self._lock = threading.RLock()
+        # A flush writes outside the lock; storage calls wait for it
+        self._writing = False
+        self._write_done = threading.Condition(self._lock)
+        # Formatted display rows keyed by order identity: id(order) -> (order, row)
+        self._display_rows = {}
+        self._display_frame = None
+        self._display_frame_ids = None
+        self._display_frame_revision = None
+        # Kitchen summary, kept up to date with every change
+        self.summary = OrderSummary()
         self.cloud_storage = CloudStorage()
-        self.load_orders()
+        # Pluggable storage backend ("json", "journal" or "sqlite")
+        self.storage = create_storage(
+            storage_mode,
+            storage_file,
+            compact_threshold=JOURNAL_COMPACT_BYTES,
+        )
+        # Orders of past days, one read-only segment per day (read on demand)
+        self.history = OrderHistory(
+            f"{os.path.splitext(storage_file)[0]}_history",
+            compression=HISTORY_COMPRESSION,
+        )
+        self._current_day = None
+        # Change records applied in memory but not persisted yet (coalesced)
+        self._pending = []
+        # True after a write failed that only a full save makes up for
+        # (immediate durability, or a failed full save)
+        self._save_failed = False
+        if durability == "coalesced":
+            self._writer = DebouncedWriter(self.flush, debounce)
+        elif durability == "immediate":
+            self._writer = None
+        else:
+            raise ValueError(f"Unknown durability: {durability}")
+        if load:
+            self.load_orders()
+        else:
+            # Loaded on the first access (see orders)
+            self._orders = None
+
+    @property
+    def orders(self):
+        """Current orders (loaded again on first access after unload)"""
+        self.last_used = time.monotonic()
+        orders = self._orders
+        if orders is None:
+            with self._lock:
+                if self._orders is None:
+                    # Loading reads self.orders itself
+                    self._orders = OrderList()
+                    self.load_orders()
+                orders = self._orders
+        return orders
+
+    @orders.setter
+    def orders(self, orders):
+        self._orders = orders
+
+    @property
+    def loaded(self):
+        """True if the orders are in memory"""
+        return self._orders is not None
+
+    def unload(self):
+        """
+        Write pending changes and drop the orders, the cached display rows
+        and the change feed from memory. The summary is kept; the orders
+        are loaded again on the next access.
+
+        Returns:
+            bool: False if the orders are kept because changes could not
+                  be written (dropping them would lose those changes)
+        """
+        with self._lock:
+            if self._orders is None:
+                return True
+            if not self.flush() or self._pending:
+                return False
+            if self._save_failed and not self.save_orders():
+                return False
+            self._orders = None
+            self.changes.clear()
+            self._display_rows.clear()
+            self._display_frame = None
+            self._display_frame_ids = None
+            self._display_frame_revision = None
+            self.cloud_storage.delete_data(self.cloud_key)
+            return True
+
+    def has_room(self, count=1):
+        """True if count more orders fit into the order limit (max_orders)"""
+        return self.max_orders is None or len(self.orders) + count <= self.max_orders
 
     def add_order(self, order):
-        """Add a new order to the list"""
-        # Add timestamp to the order
+        """
+        Add a new order to the list
+
+        Returns:
+            bool: False if the order limit (max_orders) is reached
+        """
+        # Add a stable ID and timestamp to the order
+        order["id"] = new_order_id()
         order["timestamp"] = datetime.now().isoformat()
-        self.orders.append(order)
-        # Save immediately for persistence
-        self.save_orders()
+        with self._lock:
+            if not self.has_room():
+                return False
+            self._display_rows[id(order)] = (order, render_table_row(render_order(order)))
+            # Save immediately for persistence
+            self._commit({"op": "add", "order": order})
         return True
 
-    def remove_order(self, index):
-        """Remove an order by its index"""
-        if 0 <= index < len(self.orders):
-            del self.orders[index]
-            # Save immediately for persistence
-            self.save_orders()
-            return True
+    def add_orders(self, orders):
+        """
+        Add several new orders in a single persisted write (e.g. a batch
+        posted to the API)
+
+        Returns:
+            bool: False (and nothing added) if the orders don't fit into
+                  the order limit (max_orders)
+        """
+        timestamp = datetime.now().isoformat()
+        for order in orders:
+            order["id"] = new_order_id()
+            order["timestamp"] = timestamp
+        with self._lock:
+            if not self.has_room(len(orders)):
+                return False
+            for order in orders:
+                self._display_rows[id(order)] = (order, render_table_row(render_order(order)))
+            self._commit({"op": "extend", "orders": list(orders)})
+        return True
+
+    def remove_order(self, order_id):
+        """Remove an order by its ID"""
+        with self._lock:
+            removed = self.orders.get(order_id)
+            if removed is not None:
+                self._display_rows.pop(id(removed), None)
+                # Save immediately for persistence
+                self._commit({"op": "remove", "order": removed})
+                return True
         return False
 
-    def clear_orders(self):
-        """Clear all orders"""
-        self.orders = []
-        # Speichere die leere Liste, um Persistenz zu gewährleisten
-        self.save_orders()
+    def clear_orders(self, seen_revision=None):
+        """
+        Clear all orders.
+
+        Args:
+            seen_revision: Revision of the orders the user saw when asking
+                to clear them. If orders were added (or reloaded) since, the
+                orders are kept, so nobody's new order is lost unseen.
+
+        Returns:
+            bool: True if the orders were cleared
+        """
+        with self._lock:
+            if seen_revision is not None:
+                changes = self.changes_since(seen_revision)
+                if changes is None or any(op != "remove" for _, op, _ in changes):
+                    return False
+            self._display_rows.clear()
+            # Speichere die leere Liste, um Persistenz zu gewährleisten
+            self._commit({"op": "clear"})
+        return True
+
+    def replace_orders(self, orders):
+        """Replace all orders (e.g. after an import)"""
+        with self._lock:
+            self.orders = OrderList(orders)
+            self._bump()
+            self._display_rows.clear()
+            self.summary.rebuild(self.orders)
+            self.save_orders()
+        return True
+
+    def import_orders(self, orders, replace=False):
+        """
+        Add imported orders in a single persisted write (or replace all
+        orders with them). Imported orders of past days go straight into
+        the history. Raises ValueError if the orders don't fit into the
+        order limit (max_orders).
+        """
+        with self._lock:
+            if not self.has_room(len(orders) - (len(self.orders) if replace else 0)):
+                raise ValueError(f"Zu viele Bestellungen: höchstens {self.max_orders} pro Team")
+            if replace:
+                self.replace_orders(orders)
+            elif orders:
+                self._commit({"op": "extend", "orders": list(orders)})
+            self._current_day = None
+            self.rollover()
         return True
 
     def get_orders(self):
         """Get all orders"""
         return self.orders
 
+    def get_summary(self):
+        """Get a copy of the kitchen summary (no rescan of the orders)"""
+        with self._lock:
+            return self.summary.copy()
+
+    def get_orders_and_summary(self):
+        """
+        Get a copy of the orders and of the kitchen summary taken together,
+        so a report never shows a summary that doesn't match its orders.
+
+        Returns:
+            tuple: (list of orders, summary)
+        """
+        with self._lock:
+            return list(self.orders), self.summary.copy()
+
+    def query_orders(self, order_type=None, shop=None, name=None, since=None, until=None):
+        """
+        Get only the orders matching the given filters.
+        Backends with native queries (SQLite) answer this without
+        touching the in-memory list.
+        """
+        if self.storage.supports_query:
+            # The database doesn't know the unwritten changes yet
+            self.flush()
+            try:
+                return self.storage.query(order_type, shop, name, since, until)
+            except Exception as e:
+                print(f"Error querying orders: {e}")
+        with self._lock:
+            return filter_orders(self.orders, order_type, shop, name, since, until)
+
     def load_orders(self):
         """
         Load orders with a hierarchical approach:
-        1. First try Cloud Storage (for Streamlit Cloud)
-        2. Then try session state (for compatibility with existing code)
-        3. Finally try file-based storage (for local development)
+        1. First try Cloud Storage (process-wide, shared by all sessions)
+        2. Then try the storage backend (file or database)
+        Orders of past days are then moved into the history.
         """
-        # Step 1: Try Cloud Storage first (most reliable in Streamlit Cloud)
-        cloud_orders = self.cloud_storage.load_data('orders_data')
+        with self._lock, METRICS.timer("load_orders") as timer:
+            # Unwritten changes would be lost by reloading
+            self.flush()
+            loaded = self._load_current_orders()
+            self._current_day = None
+            self.rollover()
+            timer.orders = len(self.orders)
+            return loaded
+
+    def _load_current_orders(self):
+        """Load the current orders from Cloud Storage or the storage backend"""
+        self._bump()
+        self._display_rows.clear()
+        
+        # Step 1: Try Cloud Storage first (already loaded by this process)
+        cloud_orders = self.cloud_storage.load_data(self.cloud_key)
         if cloud_orders is not None:
-            self.orders = cloud_orders
-            # Ensure session state is also updated
-            if hasattr(st, 'session_state'):
-                st.session_state.orders_data = self.orders
-            return True
-            
-        # Step 2: Try session state (for compatibility with existing code)
-        if hasattr(st, 'session_state') and 'orders_data' in st.session_state:
-            self.orders = st.session_state.orders_data
-            # Save to cloud storage for future use
-            self.cloud_storage.save_data('orders_data', self.orders)
+            self.orders = cloud_orders if isinstance(cloud_orders, OrderList) else OrderList(cloud_orders)
+            self.summary.rebuild(self.orders)
             return True
         
-        # Step 3: Try file-based storage (works for local development)
+        # Step 2: Try the storage backend (works for local development)
         try:
-            if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    self.orders = json.load(f)
+            if self.storage.exists():
+                loaded = self.storage.load()
+                # The journal backend returns an OrderList that already
+                # gave IDs to the orders saved before IDs existed
+                self.orders = loaded if isinstance(loaded, OrderList) else OrderList(loaded)
+                self.summary.rebuild(self.orders)
+                if self.orders.assigned_ids:
+                    # Persist the IDs given to orders saved before IDs existed
+                    self.storage.save(self.orders)
                 
-                # Save to cloud storage and session state for future use
-                self.cloud_storage.save_data('orders_data', self.orders)
-                if hasattr(st, 'session_state'):
-                    st.session_state.orders_data = self.orders
+                # Save to cloud storage for future use
+                self.cloud_storage.save_data(self.cloud_key, self.orders)
                 return True
         except Exception as e:
             print(f"Error loading orders from file: {e}")
         
         # If no orders found, initialize with empty list
-        self.orders = []
-        self.cloud_storage.save_data('orders_data', self.orders)
-        if hasattr(st, 'session_state'):
-            st.session_state.orders_data = self.orders
+        self.orders = OrderList()
+        self.summary.clear()
+        self.cloud_storage.save_data(self.cloud_key, self.orders)
         return False
 
     def save_orders(self):
         """
         Save orders with a hierarchical approach:
         1. Always save to Cloud Storage (for Streamlit Cloud persistence)
-        2. Always update session state (for current session)
-        3. Try to save to file (works locally, may not work on Streamlit Cloud)
+        2. Try to save to file (works locally, may not work on Streamlit Cloud)
+
+        Returns:
+            bool: True if the file (or database) was written
         """
-        # Step 1: Always save to Cloud Storage (critical for Streamlit Cloud)
-        self.cloud_storage.save_data('orders_data', self.orders)
-        
-        # Step 2: Always update session state (for current session)
-        if hasattr(st, 'session_state'):
-            st.session_state.orders_data = self.orders
+        with self._lock, METRICS.timer("save_orders") as timer:
+            self._wait_for_write()
+            # The full save includes all unwritten changes
+            self._pending = []
+            written = self.storage.bytes_written
+            # Step 1: Always save to Cloud Storage (critical for Streamlit Cloud)
+            self.cloud_storage.save_data(self.cloud_key, self.orders)
+            
+            # Step 2: Try to save to file (works locally, may not work on Streamlit Cloud)
+            try:
+                self.storage.save(self.orders)
+                self._save_failed = False
+            except Exception as e:
+                print(f"Warning: Could not save to file (expected in cloud environments): {e}")
+                # This is expected to fail in some cloud environments, but we already
+                # saved to Cloud Storage, so the app keeps working
+                self._save_failed = True
+            timer.bytes = self.storage.bytes_written - written
+            timer.orders = len(self.orders)
         
-        # Step 3: Try to save to file (works locally, may not work on Streamlit Cloud)
+        return not self._save_failed
+
+    def refresh_orders(self):
+        """
+        Pick up orders written by other processes (cheap if nothing changed)
+        and roll over to a new day if the date changed.
+
+        Returns:
+            bool: True if the order list changed
+        """
+        with self._lock:
+            self._wait_for_write()
+            if self._pending:
+                # A reload would drop the unwritten changes; the background
+                # writer picks up other processes' changes when it writes
+                changed = False
+            else:
+                try:
+                    changed = self.storage.refresh(self.orders)
+                except Exception as e:
+                    print(f"Error refreshing orders: {e}")
+                    changed = False
+            if changed:
+                self._after_rebase()
+            return self.rollover() or changed
+
+    def rollover(self):
+        """
+        Move orders of past days from the current orders into the history.
+        Runs once per day; the history segments are written before the
+        orders are removed, so an interrupted rollover is simply repeated.
+
+        Returns:
+            bool: True if orders were moved
+        """
+        today = date.today().isoformat()
+        with self._lock:
+            if self._current_day == today:
+                return False
+            past = []
+            for order in self.orders:
+                day = order_day(order)
+                if day is not None and day < today:
+                    past.append(order)
+            if past:
+                try:
+                    self.history.add(past)
+                except Exception as e:
+                    print(f"Error archiving orders: {e}")
+                    return False
+                for order in past:
+                    self._display_rows.pop(id(order), None)
+                self._commit({"op": "archive", "orders": past})
+            self._current_day = today
+            return bool(past)
+
+    def _commit(self, record):
+        """
+        Apply a change record and persist it through the storage backend.
+        The backend first rebases the in-memory list onto changes other
+        processes have written, so no order is overwritten.
+        With coalesced durability the record is only applied in memory
+        and written later by the background writer.
+        """
+        # Count the change first: if the summary can't take the record,
+        # the order list and the change feed are still untouched
         try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(self.orders, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save to file (expected in cloud environments): {e}")
-            # This is expected to fail in some cloud environments, but we already
-            # saved to Cloud Storage, so we still return True
+            self.summary.apply(record)
+        except Exception:
+            self.summary.rebuild(self.orders)
+            raise
+        op = record["op"]
+        if op in ("add", "remove"):
+            self._bump(op, (record["order"],))
+        elif op == "extend":
+            self._bump("add", record["orders"])
+        else:
+            # clear, replace and archive (once a day) are not worth a delta
+            self._bump()
+        if self._writer is not None:
+            apply_record(self.orders, record)
+            self._pending.append(record)
+            self.cloud_storage.save_data(self.cloud_key, self.orders)
+            self._writer.mark_dirty()
+            return True
+        with METRICS.timer("commit") as timer:
+            written = self.storage.bytes_written
+            try:
+                rebased = self.storage.commit(record, self.orders)
+            except Exception as e:
+                print(f"Warning: Could not persist order change (expected in cloud environments): {e}")
+                self._save_failed = True
+                rebased = False
+                # The backend can fail before it applied the record (while
+                # checking for changes of other processes); a later full
+                # save needs the change in memory
+                if not self._is_applied(record):
+                    apply_record(self.orders, record)
+            timer.bytes = self.storage.bytes_written - written
+            timer.orders = len(record["orders"]) if "orders" in record else int("order" in record)
+        if rebased:
+            self._after_rebase()
         
+        # Keep Cloud Storage in sync with the in-memory list
+        self.cloud_storage.save_data(self.cloud_key, self.orders)
         return True
 
+    def _is_applied(self, record):
+        """Whether a change record is reflected in the orders already"""
+        op = record["op"]
+        if op == "add":
+            return record["order"] in self.orders
+        if op == "extend":
+            return not record["orders"] or record["orders"][-1] in self.orders
+        if op in ("remove", "archive"):
+            removed = [record["order"]] if op == "remove" else record["orders"]
+            return not removed or removed[0] not in self.orders
+        # clear and replace can simply be applied again
+        return False
+
+    def flush(self):
+        """
+        Persist the changes not written yet (coalesced durability) in a
+        single write. The storage backend rebases onto changes other
+        processes wrote in the meantime.
+
+        The write runs on a snapshot of the order list outside the lock,
+        so adds and removes don't wait for it (a JSON rewrite takes time in
+        proportion to the file). If the write fails, the changes are kept
+        and written again by the background writer.
+
+        Returns:
+            bool: True if no changes are left unwritten
+        """
+        with self._lock:
+            self._wait_for_write()
+            if not self._pending:
+                return True
+            records, self._pending = self._pending, []
+            # (_orders: a write is no use of the team, see TeamRegistry)
+            orders = list(self._orders)
+            self._writing = True
+        try:
+            with METRICS.timer("flush") as timer:
+                written = self.storage.bytes_written
+                rebased = self.storage.commit_many(records, orders)
+                timer.bytes = self.storage.bytes_written - written
+                timer.orders = len(records)
+        except Exception as e:
+            print(f"Warning: Could not persist order changes (expected in cloud environments): {e}")
+            rebased = None
+        with self._lock:
+            self._writing = False
+            self._write_done.notify_all()
+            if rebased is None:
+                # Keep the changes (before the ones made meanwhile) for the next try
+                self._pending[:0] = records
+                if self._writer is not None:
+                    self._writer.mark_dirty()
+                return False
+            if rebased:
+                # orders now holds the persisted state plus records; changes
+                # made during the write are still pending and go on top
+                self.orders = OrderList(orders)
+                for record in self._pending:
+                    apply_record(self.orders, record)
+                self._after_rebase()
+                self.cloud_storage.save_data(self.cloud_key, self.orders)
+            return not self._pending
+
+    def _wait_for_write(self):
+        """Wait (with the lock held) until a running flush has written its snapshot"""
+        while self._writing:
+            self._write_done.wait()
+
+    def _bump(self, op="reset", orders=()):
+        """Advance the revision and record the change in the change feed"""
+        self.revision += 1
+        self.changes.append((self.revision, op, orders))
+
+    def changes_since(self, revision):
+        """
+        Changes after revision, oldest first.
+
+        Returns:
+            list: (revision, op, orders) tuples - op "add" and "remove" list
+                  the added / removed orders, "reset" means the whole list
+                  may have changed; None if the change feed no longer
+                  reaches back to revision
+        """
+        with self._lock:
+            if revision == self.revision:
+                return []
+            if revision is None or revision > self.revision or not self.changes:
+                return None
+            first = self.changes[0][0]
+            if first > revision + 1:
+                return None
+            return list(islice(self.changes, revision + 1 - first, None))
+
+    def _after_rebase(self):
+        """
+        Recount the summary and drop cached display rows of orders that
+        are gone after a rebase
+        """
+        self._bump()
+        self.summary.rebuild(self.orders)
+        current = {id(order) for order in self.orders}
+        self._display_rows = {
+            key: entry for key, entry in self._display_rows.items() if key in current
+        }
+
     def get_orders_dataframe(self):
-        """Convert orders to a pandas DataFrame for display"""
-        if not self.orders:
-            return pd.DataFrame()
-        
-        # Create a DataFrame from the orders list
-        df = pd.DataFrame(self.orders)
-        
-        # Format the DataFrame for display
-        if not df.empty:
-            # Handle timestamp formatting
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df['Zeitpunkt'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
+        """
+        Convert orders to a pandas DataFrame for display.
+        The DataFrame is built from cached display rows and reused until
+        the next change, so a rerun without changes costs nothing. After
+        adds and removes only those are applied to the previous DataFrame
+        (from the change feed); it is rebuilt after loading or a rebase.
+        """
+        # pandas is only needed for the table, so it is imported here
+        import pandas as pd
+        with self._lock, METRICS.timer("get_orders_dataframe") as timer:
+            timer.orders = len(self.orders)
+            if self._display_frame_revision == self.revision:
+                return self._display_frame
+            changes = None
+            if self._display_frame is not None and not self._display_frame.empty:
+                changes = self.changes_since(self._display_frame_revision)
+            if changes is not None and all(op != "reset" for _, op, _ in changes):
+                self._apply_display_changes(changes)
+                self._display_frame_revision = self.revision
+                return self._display_frame
             
-            # Add formatted columns based on order type
-            formatted_rows = []
-            for _, row in df.iterrows():
-                formatted_row = {}
-                formatted_row['Zeitpunkt'] = row.get('Zeitpunkt', '-')
-                formatted_row['Name'] = row.get('name', '-')
-                
-                order_type = row.get('type', '')
-                if order_type == 'yamyam':
-                    formatted_row['Restaurant'] = 'YamYam'
-                    formatted_row['Bestellung'] = f"Nr. {row.get('number', '-')}"
-                    formatted_row['Details'] = ''
-                
-                elif order_type == 'doner':
-                    formatted_row['Restaurant'] = 'Döner'
-                    
-                    # Map product values to display names
-                    product_map = {
-                        "doner": "Döner",
-                        "durum": "Dürüm",
-                        "falafel-doner": "Falafel-Döner",
-                        "falafel-durum": "Falafel-Dürüm",
-                        "box": "Dönerbox"
-                    }
-                    
-                    # Map shop values to display names
-                    shop_map = {
-                        "bruder": "Döner Bruder",
-                        "king": "King Kebabo's",
-                        "aldi": "Aldi Döner"
-                    }
-                    
-                    product = product_map.get(row.get('product', ''), row.get('product', ''))
-                    shop = shop_map.get(row.get('shop', ''), row.get('shop', ''))
-                    
-                    # Format sauces
-                    sauces = row.get('sauces', [])
-                    sauce_str = ", ".join(sauces) if sauces else "keine"
-                    
-                    # Format extras with custom extras
-                    extras_list = []
-                    for extra in row.get('extras', []):
-                        if isinstance(extra, str) and extra.startswith("custom:"):
-                            # Es ist ein Freitext-Extra
-                            custom_text = extra[7:]  # "custom:" entfernen
-                            extras_list.append(custom_text)
-                        else:
-                            # Standard-Extras wie "ohne-zwiebel" konvertieren
-                            extras_map = {
-                                "ohne-zwiebel": "Ohne Zwiebel",
-                                "ohne-tomate": "Ohne Tomate", 
-                                "ohne-blaukraut": "Ohne Blaukraut",
-                                "ohne-salat": "Ohne Salat",
-                                "ohne-sosse": "Ohne Soße",
-                                "ohne-grillgemuese": "Ohne Grillgemüse",
-                                "ohne-gurke": "Ohne Gurke"
-                            }
-                            extras_list.append(extras_map.get(extra, extra))
-                            
-                    extras_str = ", ".join(extras_list) if extras_list else "keine"
-                    
-                    # Box type if applicable
-                    box_type = ""
-                    if row.get('product') == 'box' and 'boxType' in row:
-                        box_map = {"pommes": "mit Pommes", "salat": "mit Salat"}
-                        box_type = f" ({box_map.get(row['boxType'], row['boxType'])})"
-                    
-                    # Format spice level
-                    spice_map = {"none": "nicht scharf", "normal": "normal scharf", "extra": "sehr scharf"}
-                    spice = spice_map.get(row.get('spiceLevel', ''), row.get('spiceLevel', ''))
-                    
-                    formatted_row['Bestellung'] = f"{product}{box_type} ({shop})"
-                    formatted_row['Details'] = f"Soßen: {sauce_str}, Extras: {extras_str}, Schärfe: {spice}"
-                
-                elif order_type == 'edeka':
-                    formatted_row['Restaurant'] = 'Edeka'
-                    product = row.get('product', '-')
-                    
-                    if product == 'Salat':
-                        salat_type = row.get('salatType', '-')
-                        formatted_row['Bestellung'] = f"{salat_type}"
-                        # Anmerkungen anzeigen, wenn vorhanden
-                        if 'customOrder' in row and row['customOrder']:
-                            formatted_row['Details'] = f"Anmerkung: {row['customOrder']}"
-                        else:
-                            formatted_row['Details'] = ''
-                    elif product == 'Bäcker':
-                        baecker_item = row.get('baeckerItem', '-')
-                        formatted_row['Bestellung'] = f"Bäcker"
-                        formatted_row['Details'] = f"{baecker_item}"
-                    else:
-                        sauce = row.get('sauce', 'keine')
-                        formatted_row['Bestellung'] = f"{product}"
-                        details = [f"Sauce: {sauce}"]
-                        # Anmerkungen anzeigen, wenn vorhanden
-                        if 'customOrder' in row and row['customOrder']:
-                            details.append(f"Anmerkung: {row['customOrder']}")
-                        formatted_row['Details'] = ", ".join(details)
-                
-                else:
-                    formatted_row['Restaurant'] = order_type.capitalize()
-                    formatted_row['Bestellung'] = '-'
-                    formatted_row['Details'] = '-'
-                
-                formatted_rows.append(formatted_row)
+            # Format orders that have no cached row yet (e.g. after loading)
+            missing = [order for order in self.orders if not self._has_display_row(order)]
+            self._cache_display_rows(missing)
             
-            return pd.DataFrame(formatted_rows)
-        
-        return pd.DataFrame()
\ No newline at end of file
+            if self.orders:
+                rows = [self._display_rows[id(order)][1] for order in self.orders]
+                frame = pd.DataFrame.from_records(rows, columns=TABLE_COLUMNS)
+            else:
+                frame = pd.DataFrame()
+            self._display_frame = frame
+            self._display_frame_ids = pd.Index([order.get("id") for order in self.orders])
+            self._display_frame_revision = self.revision
+            return frame
+
+    def _apply_display_changes(self, changes):
+        """Apply added and removed orders of the change feed to the display DataFrame"""
+        import pandas as pd
+        # Orders added since the frame was built, by ID (in order), and IDs
+        # of rows the frame has that were removed since
+        added = {}
+        removed = set()
+        for _, op, orders in changes:
+            for order in orders:
+                order_id = order.get("id")
+                if op == "add":
+                    added[order_id] = order
+                elif added.pop(order_id, None) is None:
+                    removed.add(order_id)
+        frame, ids = self._display_frame, self._display_frame_ids
+        if removed:
+            kept = ~ids.isin(list(removed))
+            frame, ids = frame[kept], ids[kept]
+        added = list(added.values())
+        if added:
+            self._cache_display_rows([order for order in added if not self._has_display_row(order)])
+            rows = [self._display_rows[id(order)][1] for order in added]
+            frame = pd.concat([frame, pd.DataFrame.from_records(rows, columns=TABLE_COLUMNS)])
+            ids = ids.append(pd.Index([order.get("id") for order in added]))
+        self._display_frame = frame.reset_index(drop=True)
+        self._display_frame_ids = ids
+
+    def get_order_choices(self):
+        """
+        Order IDs with a short description for every order (e.g. for a
+        selectbox), taken from one consistent state of the order list.
+
+        Returns:
+            list: (order ID, "1. Name - Restaurant - Bestellung") tuples
+        """
+        with self._lock:
+            frame = self.get_orders_dataframe()
+            if frame.empty:
+                return []
+            labels = frame["Name"] + " - " + frame["Restaurant"] + " - " + frame["Bestellung"]
+            # IDs of the frame's own rows, so a label can't be paired with
+            # another order's ID if the frame and the list ever disagree
+            return [
+                (order_id, f"{position}. {label}")
+                for position, (order_id, label) in enumerate(zip(self._display_frame_ids, labels), start=1)
+            ]
+
+    def _has_display_row(self, order):
+        """Check whether a display row is cached for exactly this order object"""
+        entry = self._display_rows.get(id(order))
+        return entry is not None and entry[0] is order
+
+    def _cache_display_rows(self, orders):
+        """Format orders column-wise and cache their display rows"""
+        if not orders:
+            return
+        rows = zip(*(column.tolist() for column in render_table_columns(orders)))
+        for order, row in zip(orders, rows):
+            self._display_rows[id(order)] = (order, row)
+
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Order list with stable order IDs for the LunchSquad application.
+
+Every order carries an "id" field. OrderList keeps the current orders in
+slots together with an ID -> slot index, so an order is found and removed
+by its ID in O(1): removing leaves a tombstone in the slot, and the
+tombstones are compacted away once they make up half of the slots.
+"""
+
+import hashlib
+import json
+import uuid
+
+# Compact once at least this many slots (and half of all slots) are tombstones
+COMPACT_MIN_TOMBSTONES = 64
+
+_TOMBSTONE = None
+
+
+def new_order_id():
+    """Random ID for a newly created order"""
+    return uuid.uuid4().hex
+
+
+def content_order_id(order):
+    """
+    ID derived from the order content, for orders created before IDs
+    existed. Every process assigns the same ID to the same legacy order.
+    """
+    key = json.dumps(order, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class OrderList:
+    """
+    The current orders, in insertion order, indexed by order ID.
+
+    Supports the list operations the storage backends use (iteration,
+    len, append, extend, remove, positional access and replacing all
+    orders with orders[:] = ...), so it can be passed to apply_record.
+    """
+
+    def __init__(self, orders=()):
+        self._slots = []
+        self._index = {}
+        self._tombstones = 0
+        # Number of IDs this list gave to orders (derived or suffixed),
+        # i.e. IDs the storage doesn't have yet right after loading
+        self.assigned_ids = 0
+        self.extend(orders)
+
+    def __len__(self):
+        return len(self._slots) - self._tombstones
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        # Also skips slots that become tombstones while iterating
+        return (order for order in self._slots if order is not _TOMBSTONE)
+
+    def __repr__(self):
+        return f"OrderList({list(self)!r})"
+
+    def __contains__(self, order):
+        return isinstance(order, dict) and self._find(order) is not None
+
+    def __getitem__(self, position):
+        self._compact()
+        return self._slots[position]
+
+    def __setitem__(self, position, orders):
+        if position != slice(None):
+            raise TypeError("OrderList only supports replacing all orders (orders[:] = ...)")
+        orders = list(orders)
+        self.clear()
+        self.extend(orders)
+
+    def __delitem__(self, position):
+        self._compact()
+        order = self._slots[position]
+        self._remove_slot(self._index[order["id"]])
+
+    def get(self, order_id):
+        """Get an order by its ID (None if there is no such order)"""
+        slot = self._index.get(order_id)
+        return None if slot is None else self._slots[slot]
+
+    def append(self, order):
+        """
+        Add an order. Orders without ID get one derived from their content,
+        orders with an ID that is already taken get a numbered suffix.
+        """
+        order_id = order.get("id")
+        if order_id is None or order_id in self._index:
+            base = order_id or content_order_id(order)
+            order_id, suffix = base, 1
+            while order_id in self._index:
+                suffix += 1
+                order_id = f"{base}-{suffix}"
+            order["id"] = order_id
+            self.assigned_ids += 1
+        self._index[order_id] = len(self._slots)
+        self._slots.append(order)
+
+    def extend(self, orders):
+        for order in orders:
+            self.append(order)
+
+    def remove(self, order):
+        """Remove an order (found by its ID, see _find)"""
+        slot = self._find(order)
+        if slot is None:
+            raise ValueError("Order not in OrderList")
+        self._remove_slot(slot)
+
+    def remove_id(self, order_id):
+        """
+        Remove an order by its ID in O(1).
+
+        Returns:
+            dict: The removed order (None if there is no such order)
+        """
+        slot = self._index.get(order_id)
+        if slot is None:
+            return None
+        order = self._slots[slot]
+        self._remove_slot(slot)
+        return order
+
+    def clear(self):
+        self._slots = []
+        self._index = {}
+        self._tombstones = 0
+
+    def _find(self, order):
+        """Slot of an order; orders without ID are found by their content ID"""
+        order_id = order.get("id")
+        if order_id is None:
+            order_id = content_order_id(order)
+        return self._index.get(order_id)
+
+    def _remove_slot(self, slot):
+        order = self._slots[slot]
+        del self._index[order["id"]]
+        self._slots[slot] = _TOMBSTONE
+        self._tombstones += 1
+        if self._tombstones >= COMPACT_MIN_TOMBSTONES and self._tombstones * 2 >= len(self._slots):
+            self._compact()
+
+    def _compact(self):
+        """Drop the tombstones and renumber the slots"""
+        if not self._tombstones:
+            return
+        self._slots = [order for order in self._slots if order is not _TOMBSTONE]
+        self._index = {order["id"]: slot for slot, order in enumerate(self._slots)}
+        self._tombstones = 0
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact typed order records for the LunchSquad application.
+
+Order dicts repeat their keys and option strings ("falafel-durum") in every
+order and keep the timestamp as ISO text. The record classes here store the
+same orders with __slots__, small-integer codes for the option values of
+config.py (shop, product, box type, sauces, spice level, extras, Edeka
+products) and the timestamp as microseconds since the epoch. They convert
+to and from the JSON order shape without loss: values that don't fit a
+field (unknown options are kept as text, anything else goes into extra).
+
+The order history caches the days it has read as records. The current
+orders stay dicts: they are changed in place (IDs, timestamps), written
+to the journal and the change feed as they are and keyed by identity in
+the display row cache, so records there would be converted back on every
+change and every rerun.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from config import DONER_OPTIONS, EDEKA_OPTIONS
+
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class OptionCodes:
+    """Small-integer codes for the values of one option list"""
+
+    def __init__(self, values):
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value):
+        """Code of a known value; unknown values are kept as (interned) text"""
+        code = self._codes.get(value)
+        return sys.intern(value) if code is None else code
+
+    def decode(self, value):
+        return self.values[value] if type(value) is int else value
+
+
+SHOPS = OptionCodes(DONER_OPTIONS["shop_values"])
+DONER_PRODUCTS = OptionCodes(DONER_OPTIONS["product_values"])
+BOX_TYPES = OptionCodes(DONER_OPTIONS["box_values"])
+SAUCES = OptionCodes(DONER_OPTIONS["sauce_values"])
+SPICE_LEVELS = OptionCodes(DONER_OPTIONS["spice_values"])
+EXTRAS = OptionCodes(DONER_OPTIONS["extra_values"])
+EDEKA_PRODUCTS = OptionCodes(EDEKA_OPTIONS["products"])
+SALADS = OptionCodes(EDEKA_OPTIONS["salads"])
+EDEKA_SAUCES = OptionCodes(EDEKA_OPTIONS["sauces"])
+
+
+def encode_timestamp(value):
+    """ISO timestamp as microseconds since the epoch (None if not exactly representable)"""
+    try:
+        moment = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is not None or moment.isoformat() != value:
+        return None
+    return (moment - EPOCH) // _MICROSECOND
+
+
+def decode_timestamp(value):
+    return (EPOCH + value * _MICROSECOND).isoformat()
+
+
+# Field kinds: how a JSON value is stored in a slot
+_TEXT = "text"            # str
+_NAME = "name"            # str, interned (the same names recur in many orders)
+_NUMBER = "number"        # menu number as text ("42" -> 42)
+_TIMESTAMP = "timestamp"  # ISO text -> epoch microseconds
+
+
+def _encode(kind, value):
+    """Slot value for a JSON value (None if it has to go into extra)"""
+    if kind is _TIMESTAMP:
+        return encode_timestamp(value)
+    if isinstance(kind, tuple):
+        # Coded list (sauces, extras)
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            return None
+        return tuple(kind[0].encode(item) for item in value)
+    if not isinstance(value, str):
+        return None
+    if kind is _NUMBER:
+        return int(value) if value.isdigit() and str(int(value)) == value else value
+    if kind is _NAME:
+        return sys.intern(value)
+    if kind is _TEXT:
+        return value
+    return kind.encode(value)
+
+
+def _decode(kind, value):
+    if kind is _TIMESTAMP:
+        return decode_timestamp(value)
+    if isinstance(kind, tuple):
+        return [kind[0].decode(item) for item in value]
+    if kind is _NUMBER:
+        return str(value)
+    if kind is _TEXT or kind is _NAME:
+        return value
+    return kind.decode(value)
+
+
+class OrderRecord:
+    """
+    Base record: order ID, name and timestamp. Values that don't fit
+    the typed fields are kept in extra (a dict, None if empty).
+    """
+
+    __slots__ = ("id", "name", "timestamp", "extra")
+
+    order_type = None
+    # (JSON key, slot, kind) of the typed fields
+    FIELDS = (
+        ("id", "id", _TEXT),
+        ("name", "name", _NAME),
+        ("timestamp", "timestamp", _TIMESTAMP),
+    )
+
+    def __init__(self, **values):
+        for slot in self._all_slots():
+            setattr(self, slot, values.get(slot))
+
+    @classmethod
+    def _all_slots(cls):
+        return [slot for _, slot, _ in cls.FIELDS] + ["extra"]
+
+    @classmethod
+    def from_order(cls, order):
+        """Create a record from an order dict"""
+        record = cls.__new__(cls)
+        extra = {}
+        for key, slot, kind in cls.FIELDS:
+            value = None
+            if key in order:
+                value = _encode(kind, order[key])
+                if value is None:
+                    extra[key] = order[key]
+            setattr(record, slot, value)
+        for key, value in order.items():
+            if key not in cls._keys and not (key == "type" and value == cls.order_type):
+                extra[key] = value
+        record.extra = extra or None
+        return record
+
+    def to_order(self):
+        """Convert the record back to an order dict (the JSON shape)"""
+        order = {} if self.order_type is None else {"type": self.order_type}
+        for key, slot, kind in self.FIELDS:
+            value = getattr(self, slot)
+            if value is not None:
+                order[key] = _decode(kind, value)
+        if self.extra:
+            order.update(self.extra)
+        return order
+
+    @property
+    def datetime(self):
+        """Timestamp as datetime (None if the order has no timestamp)"""
+        if self.timestamp is None:
+            return None
+        return EPOCH + self.timestamp * _MICROSECOND
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self._all_slots()
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_order()!r})"
+
+
+class YamYamOrder(OrderRecord):
+    __slots__ = ("number",)
+
+    order_type = "yamyam"
+    FIELDS = OrderRecord.FIELDS + (
+        ("number", "number", _NUMBER),
+    )
+
+
+class DonerOrder(OrderRecord):
+    __slots__ = ("shop", "product", "box_type", "sauces", "extras", "spice_level")
+
+    order_type = "doner"
+    FIELDS = OrderRecord.FIELDS + (
+        ("shop", "shop", SHOPS),
+        ("product", "product", DONER_PRODUCTS),
+        ("boxType", "box_type", BOX_TYPES),
+        ("sauces", "sauces", (SAUCES,)),
+        ("extras", "extras", (EXTRAS,)),
+        ("spiceLevel", "spice_level", SPICE_LEVELS),
+    )
+
+
+class EdekaOrder(OrderRecord):
+    __slots__ = ("product", "salat_type", "sauce", "baecker_item", "custom_order")
+
+    order_type = "edeka"
+    FIELDS = OrderRecord.FIELDS + (
+        ("product", "product", EDEKA_PRODUCTS),
+        ("salatType", "salat_type", SALADS),
+        ("sauce", "sauce", EDEKA_SAUCES),
+        ("baeckerItem", "baecker_item", _TEXT),
+        ("customOrder", "custom_order", _TEXT),
+    )
+
+
+RECORD_TYPES = {cls.order_type: cls for cls in (YamYamOrder, DonerOrder, EdekaOrder)}
+
+# JSON keys of the typed fields per class (everything else goes into extra)
+for record_class in (OrderRecord,) + tuple(RECORD_TYPES.values()):
+    record_class._keys = frozenset(key for key, _, _ in record_class.FIELDS)
+
+
+def to_record(order):
+    """Convert an order dict to the record class of its type"""
+    return RECORD_TYPES.get(order.get("type"), OrderRecord).from_order(order)
+
+
+def to_records(orders):
+    """Convert order dicts to records"""
+    return [to_record(order) for order in orders]
+
+
+def to_orders(records):
+    """Convert records back to order dicts"""
+    return [record.to_order() for record in records]
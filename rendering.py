@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Order rendering engine for the LunchSquad application.
+
+Lookup tables for display names are compiled once at import time from
+the restaurant options in config.py. render_order() turns an order into
+a RenderedOrder record that the table, text, image and list formatters
+all consume; render_table_columns() does the same for the order table
+column-wise for many orders at once.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from itertools import chain
+from config import DONER_OPTIONS
+
+# numpy and pandas are imported by the table functions that use them, so
+# the lookup tables (used by the summary and reports) load without them
+
+# Lookup tables for display names, compiled once at import time
+RESTAURANT_LABELS = {"yamyam": "YamYam", "doner": "Döner", "edeka": "Edeka"}
+PRODUCT_LABELS = dict(zip(DONER_OPTIONS["product_values"], DONER_OPTIONS["products"]))
+SHOP_LABELS = dict(zip(DONER_OPTIONS["shop_values"], DONER_OPTIONS["shops"]))
+BOX_LABELS = dict(zip(DONER_OPTIONS["box_values"], DONER_OPTIONS["box_types"]))
+SAUCE_LABELS = dict(zip(DONER_OPTIONS["sauce_values"], DONER_OPTIONS["sauces"]))
+EXTRA_LABELS = dict(zip(DONER_OPTIONS["extra_values"], DONER_OPTIONS["extras"]))
+SPICE_LABELS = dict(zip(DONER_OPTIONS["spice_values"], DONER_OPTIONS["spice_report_labels"]))
+
+# Prefix of free-text extras ("custom:extra Feta")
+CUSTOM_EXTRA_PREFIX = "custom:"
+
+TABLE_COLUMNS = ["Zeitpunkt", "Name", "Restaurant", "Bestellung", "Details"]
+
+# Structured render record consumed by all output formats
+# - restaurant: display name of the restaurant ("Döner")
+# - name: name of the person (None if missing)
+# - time: formatted timestamp ("" if missing)
+# - title: order title as shown in the order table ("Nr. 42")
+# - summary: order line as shown in reports ("#42")
+# - headline: order line as shown in order lists ("YamYam #42")
+# - details: list of detail strings ("Soßen: keine")
+RenderedOrder = namedtuple(
+    "RenderedOrder",
+    ["type", "restaurant", "name", "time", "title", "summary", "headline", "details"],
+)
+
+
+def format_time(timestamp):
+    """Format an ISO timestamp as "YYYY-MM-DD HH:MM" ("" if missing or invalid)"""
+    if not timestamp:
+        return ""
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M")
+    except (ValueError, TypeError):
+        return ""
+
+
+def extra_label(extra):
+    """Display name of an extra; free-text extras are shown without prefix"""
+    if isinstance(extra, str) and extra.startswith(CUSTOM_EXTRA_PREFIX):
+        return extra[len(CUSTOM_EXTRA_PREFIX):]
+    return EXTRA_LABELS.get(extra, extra)
+
+
+def render_order(order):
+    """
+    Render a single order.
+
+    Returns:
+        RenderedOrder: The structured render record
+    """
+    order_type = order.get("type", "")
+    name = order.get("name")
+    time = format_time(order.get("timestamp", ""))
+    
+    if order_type == "yamyam":
+        number = order.get("number", "-")
+        return RenderedOrder(order_type, "YamYam", name, time,
+                             f"Nr. {number}", f"#{number}", f"YamYam #{number}", [])
+    
+    if order_type == "doner":
+        product_value = order.get("product", "")
+        product = PRODUCT_LABELS.get(product_value, product_value)
+        shop = SHOP_LABELS.get(order.get("shop", ""), order.get("shop", ""))
+        box_type = ""
+        if product_value == "box" and order.get("boxType") is not None:
+            box_type = f" ({BOX_LABELS.get(order['boxType'], order['boxType'])})"
+        title = f"{product}{box_type} ({shop})"
+        
+        sauces = ", ".join(order.get("sauces") or []) or "keine"
+        extras = ", ".join(extra_label(extra) for extra in order.get("extras") or []) or "keine"
+        spice = SPICE_LABELS.get(order.get("spiceLevel", ""), order.get("spiceLevel", ""))
+        details = [f"Soßen: {sauces}", f"Extras: {extras}", f"Schärfe: {spice}"]
+        return RenderedOrder(order_type, "Döner", name, time, title, title, title, details)
+    
+    if order_type == "edeka":
+        product = order.get("product", "-")
+        note = order.get("customOrder")
+        if product == "Salat":
+            salat_type = order.get("salatType", "-")
+            details = [f"Anmerkung: {note}"] if note else []
+            return RenderedOrder(order_type, "Edeka", name, time, f"{salat_type}",
+                                 f"Salatbar - {salat_type}", f"Edeka Salatbar - {salat_type}", details)
+        if product == "Bäcker":
+            baecker_item = order.get("baeckerItem", "-")
+            return RenderedOrder(order_type, "Edeka", name, time, "Bäcker",
+                                 f"Bäcker - {baecker_item}", f"Edeka Bäcker - {baecker_item}", [f"{baecker_item}"])
+        sauce = order.get("sauce", "keine")
+        details = [f"Sauce: {sauce}"]
+        if note:
+            details.append(f"Anmerkung: {note}")
+        return RenderedOrder(order_type, "Edeka", name, time, f"{product}",
+                             f"{product} - Sauce: {sauce}", f"Edeka {product} - Sauce: {sauce}", details)
+    
+    return RenderedOrder(order_type, str(order_type).capitalize(), name, time, "-", "-",
+                         f"Unknown order type: {order_type}", ["-"])
+
+
+def render_table_row(rendered):
+    """Turn a render record into a row of the order table (see TABLE_COLUMNS)"""
+    name = rendered.name if rendered.name is not None else "-"
+    return (rendered.time or "-", name, rendered.restaurant, rendered.title, ", ".join(rendered.details))
+
+
+def _field(orders, key, default):
+    """Extract one field of all orders as an object array (missing -> default)"""
+    import numpy as np
+    values = np.empty(len(orders), dtype=object)
+    values[:] = [order.get(key, default) for order in orders]
+    return values
+
+
+def _text(values):
+    """Convert an object array to strings (like an f-string would)"""
+    return values.astype(str).astype(object)
+
+
+def _map_labels(values, labels):
+    """Map values to display names, keeping unknown values as they are"""
+    import pandas as pd
+    mapped = pd.Series(values, dtype=object).map(labels).to_numpy(dtype=object)
+    missing = pd.isna(mapped)
+    mapped[missing] = values[missing]
+    return mapped
+
+
+def _join_lists(lists, labels=None):
+    """
+    Join list fields with ", " ("keine" for empty or missing lists).
+    Optionally map the items through labels; "custom:" items are shown as
+    free text without the prefix.
+    """
+    import numpy as np
+    import pandas as pd
+    lists = [items if isinstance(items, list) else [] for items in lists]
+    lengths = np.fromiter((len(items) for items in lists), dtype=np.int64, count=len(lists))
+    joined = np.full(len(lists), "keine", dtype=object)
+    if not lengths.any():
+        return joined
+    
+    # Map all items in one go
+    items = np.empty(int(lengths.sum()), dtype=object)
+    items[:] = list(chain.from_iterable(lists))
+    items = _text(items)
+    if labels is not None:
+        custom = pd.Series(items, dtype=object).str.startswith(CUSTOM_EXTRA_PREFIX).to_numpy(dtype=bool)
+        mapped = _map_labels(items, labels)
+        mapped[custom] = pd.Series(items[custom], dtype=object).str[len(CUSTOM_EXTRA_PREFIX):].to_numpy(dtype=object)
+        items = mapped
+    
+    # Concatenate position by position: first items, then ", " + second items, ...
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    rows = np.flatnonzero(lengths > 0)
+    joined[rows] = items[starts[rows]]
+    for position in range(1, int(lengths.max())):
+        rows = np.flatnonzero(lengths > position)
+        joined[rows] = joined[rows] + ", " + items[starts[rows] + position]
+    return joined
+
+
+def _format_timestamps(values):
+    """Format ISO timestamps as "YYYY-MM-DD HH:MM" ("-" if missing or invalid, like render_table_row)"""
+    import numpy as np
+    import pandas as pd
+    try:
+        minutes = pd.to_datetime(pd.Series(values, dtype=object), format="ISO8601", errors="coerce").dt.floor("min")
+    except ValueError:
+        # Mixed UTC offsets: show each timestamp in its own offset, as format_time does
+        labels = {}
+        return np.array([
+            labels.setdefault(value, format_time(value) or "-") if isinstance(value, str) else "-"
+            for value in values
+        ], dtype=object)
+    # Many orders share the same minute, so only format each minute once
+    codes, uniques = pd.factorize(minutes)
+    labels = pd.Index(uniques).strftime("%Y-%m-%d %H:%M").to_numpy(dtype=object)
+    return np.where(codes >= 0, labels.take(codes, mode="clip") if len(labels) else "-", "-")
+
+
+def _with_note(details, notes, separator):
+    """Append "Anmerkung: ..." to details where a note is present"""
+    import numpy as np
+    has_note = np.fromiter((bool(note) for note in notes), dtype=bool, count=len(notes))
+    details = details.copy()
+    details[has_note] = details[has_note] + separator + "Anmerkung: " + _text(notes[has_note])
+    return details
+
+
+def format_orders_dataframe(orders):
+    """
+    Format orders for display as a DataFrame with the columns
+    Zeitpunkt, Name, Restaurant, Bestellung and Details.
+    """
+    import pandas as pd
+    if not orders:
+        return pd.DataFrame()
+    return pd.DataFrame(dict(zip(TABLE_COLUMNS, render_table_columns(orders))), columns=TABLE_COLUMNS)
+
+
+def render_table_columns(orders):
+    """
+    Format orders column-wise: per-type masks select the rows of each
+    restaurant and display names are mapped through prebuilt lookup tables.
+
+    Returns:
+        list: One object array per display column
+    """
+    import numpy as np
+    import pandas as pd
+    count = len(orders)
+    order_type = _text(_field(orders, "type", ""))
+    
+    # Handle timestamp formatting
+    if any("timestamp" in order for order in orders):
+        zeitpunkt = _format_timestamps(_field(orders, "timestamp", None))
+    else:
+        zeitpunkt = np.full(count, "-", dtype=object)
+    
+    restaurant = _map_labels(order_type, RESTAURANT_LABELS)
+    other = ~np.isin(order_type, list(RESTAURANT_LABELS))
+    restaurant[other] = pd.Series(order_type[other], dtype=object).str.capitalize().to_numpy(dtype=object)
+    bestellung = np.full(count, "-", dtype=object)
+    details = np.full(count, "-", dtype=object)
+    
+    # YamYam orders
+    yamyam = np.flatnonzero(order_type == "yamyam")
+    if len(yamyam):
+        rows = [orders[i] for i in yamyam]
+        bestellung[yamyam] = "Nr. " + _text(_field(rows, "number", "-"))
+        details[yamyam] = ""
+    
+    # Döner orders
+    doner = np.flatnonzero(order_type == "doner")
+    if len(doner):
+        rows = [orders[i] for i in doner]
+        product_value = _text(_field(rows, "product", ""))
+        product = _map_labels(product_value, PRODUCT_LABELS)
+        shop_value = _text(_field(rows, "shop", ""))
+        shop = _map_labels(shop_value, SHOP_LABELS)
+        
+        # Box type if applicable
+        box_value = _field(rows, "boxType", None)
+        is_box = (product_value == "box") & ~pd.isna(box_value)
+        box_type = np.full(len(rows), "", dtype=object)
+        box_type[is_box] = " (" + _text(_map_labels(box_value[is_box], BOX_LABELS)) + ")"
+        
+        sauces = _join_lists(_field(rows, "sauces", None))
+        extras = _join_lists(_field(rows, "extras", None), EXTRA_LABELS)
+        spice = _text(_map_labels(_field(rows, "spiceLevel", ""), SPICE_LABELS))
+        
+        bestellung[doner] = product + box_type + " (" + shop + ")"
+        details[doner] = "Soßen: " + sauces + ", Extras: " + extras + ", Schärfe: " + spice
+    
+    # Edeka orders
+    edeka = np.flatnonzero(order_type == "edeka")
+    if len(edeka):
+        rows = [orders[i] for i in edeka]
+        product = _text(_field(rows, "product", "-"))
+        notes = _field(rows, "customOrder", "")
+        
+        edeka_bestellung = product.copy()
+        edeka_details = _with_note("Sauce: " + _text(_field(rows, "sauce", "keine")), notes, ", ")
+        
+        salat = product == "Salat"
+        edeka_bestellung[salat] = _text(_field(rows, "salatType", "-"))[salat]
+        edeka_details[salat] = _with_note(np.full(salat.sum(), "", dtype=object), notes[salat], "")
+        
+        baecker = product == "Bäcker"
+        edeka_bestellung[baecker] = "Bäcker"
+        edeka_details[baecker] = _text(_field(rows, "baeckerItem", "-"))[baecker]
+        
+        bestellung[edeka] = edeka_bestellung
+        details[edeka] = edeka_details
+    
+    return [zeitpunkt, _field(orders, "name", "-"), restaurant, bestellung, details]
@@ -0,0 +1,760 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Storage backends for the LunchSquad app.
+Provides a common backend interface with JSON file, append-only journal
+and SQLite implementations.
+
+All backends are safe to use from several processes at once: writes are
+serialized by an advisory file lock (or SQLite's own locking) and carry a
+revision number. A writer whose view is older than the persisted revision
+first catches up with the persisted state and then applies its change on
+top of it, so concurrent writers never overwrite each other's orders.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from order_list import OrderList
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None
+
+
+_REVISION_HEADER = re.compile(rb'\{\s*"revision":\s*(\d+)')
+
+
+def _journal_path(storage_file):
+    """Derive the journal file name from the snapshot file name"""
+    base, _ = os.path.splitext(storage_file)
+    return f"{base}.journal.jsonl"
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive advisory lock on path for the duration of the block.
+    If the lock file cannot be created (e.g. read-only file system) the
+    block runs unlocked; the following write will fail anyway.
+    """
+    try:
+        lock_file = open(path, 'a')
+    except OSError:
+        yield
+        return
+    with lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_snapshot(storage_file):
+    """
+    Read a snapshot file.
+
+    Accepts both the legacy format (a plain list of orders) and the
+    snapshot format ({"revision": ..., "orders": [...]}).
+
+    Returns:
+        tuple: (orders, revision) - revision is 0 for legacy snapshots
+    """
+    if not os.path.exists(storage_file):
+        return [], 0
+    with open(storage_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return data.get("orders", []), data.get("revision", data.get("seq", 0))
+    return data, 0
+
+
+def read_revision(storage_file):
+    """
+    Read only the revision of a snapshot file.
+    Snapshots start with the revision, so this usually reads a few bytes.
+    """
+    if not os.path.exists(storage_file):
+        return 0
+    with open(storage_file, 'rb') as f:
+        head = f.read(64)
+    match = _REVISION_HEADER.match(head)
+    if match:
+        return int(match.group(1))
+    return read_snapshot(storage_file)[1]
+
+
+def write_atomic(path, data):
+    """
+    Write JSON data to a temporary file and rename it over the target.
+
+    Returns:
+        int: Number of bytes written
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+def order_key(order):
+    """Content key of an order, used to find the same order in other lists"""
+    return json.dumps(order, ensure_ascii=False, sort_keys=True)
+
+
+def apply_record(orders, record):
+    """Apply a single journal record to a list of orders (in place)"""
+    op = record.get("op")
+    if op == "add":
+        orders.append(record["order"])
+    elif op == "extend":
+        # Several orders added at once (e.g. an import)
+        orders.extend(record["orders"])
+    elif op == "remove":
+        index = record.get("index")
+        order = record.get("order")
+        if order is None:
+            # Legacy record: remove by position only
+            if index is not None and 0 <= index < len(orders):
+                del orders[index]
+        elif order.get("id") is not None:
+            # Orders with an ID are found by it (O(1) for an OrderList)
+            if order in orders:
+                orders.remove(order)
+        elif index is not None and 0 <= index < len(orders) and orders[index] == order:
+            del orders[index]
+        elif order in orders:
+            # The list changed since the removal was requested
+            orders.remove(order)
+    elif op == "clear":
+        orders.clear()
+    elif op == "replace":
+        orders[:] = record["orders"]
+    elif op == "archive":
+        # Orders moved into the history (see history.py)
+        archived = Counter(order_key(order) for order in record["orders"])
+        kept = []
+        for order in orders:
+            key = order_key(order)
+            if archived[key] > 0:
+                archived[key] -= 1
+            else:
+                kept.append(order)
+        orders[:] = kept
+
+
+def filter_orders(orders, order_type=None, shop=None, name=None, since=None, until=None):
+    """Filter a list of orders in memory (fallback for backends without queries)"""
+    result = []
+    for order in orders:
+        if order_type is not None and order.get("type") != order_type:
+            continue
+        if shop is not None and order.get("shop") != shop:
+            continue
+        if name is not None and order.get("name") != name:
+            continue
+        timestamp = order.get("timestamp", "")
+        if since is not None and timestamp < since:
+            continue
+        if until is not None and timestamp >= until:
+            continue
+        result.append(order)
+    return result
+
+
+class OrderStorage:
+    """
+    Base class for order storage backends.
+
+    Changes are passed as records ({"op": "add" | "extend" | "remove" | "clear" | "archive", ...},
+    see apply_record) together with the caller's in-memory order list.
+    The backend brings that list up to date with the persisted state,
+    applies the record to it and persists the change. The record is
+    applied to the list even if persisting fails afterwards.
+    """
+
+    # Whether query() is answered by the backend itself
+    supports_query = False
+
+    # Revision of the persisted state this backend instance has seen last
+    revision = 0
+
+    # Bytes this backend instance has written (for the metrics)
+    bytes_written = 0
+
+    def exists(self):
+        """Check whether any persisted data exists"""
+        return True
+
+    def load(self):
+        """Load all orders"""
+        raise NotImplementedError
+
+    def save(self, orders):
+        """Replace all persisted orders"""
+        raise NotImplementedError
+
+    def commit(self, record, orders):
+        """
+        Apply a change record to orders and persist it.
+
+        Returns:
+            bool: True if orders first had to be rebased onto changes
+                  written by another process
+        """
+        apply_record(orders, record)
+        self.save(orders)
+        return False
+
+    def commit_many(self, records, orders):
+        """
+        Persist change records that were already applied to orders (the
+        coalesced writes of OrderManager). If another process wrote in
+        the meantime, orders is reloaded from the persisted state and the
+        records are applied again on top of it.
+
+        Returns:
+            bool: True if orders was rebased
+        """
+        self.save(orders)
+        return False
+
+    def refresh(self, orders):
+        """
+        Bring orders up to date with changes written by other processes.
+
+        Returns:
+            bool: True if orders was changed
+        """
+        return False
+
+    def query(self, order_type=None, shop=None, name=None, since=None, until=None):
+        """Query orders matching the given filters"""
+        return filter_orders(self.load(), order_type, shop, name, since, until)
+
+
+class JsonFileStorage(OrderStorage):
+    """
+    Stores all orders as one JSON file, rewritten on every change.
+
+    The file holds {"revision": ..., "orders": [...]} and is replaced
+    atomically under a file lock.
+    """
+
+    def __init__(self, storage_file):
+        self.storage_file = storage_file
+        self.lock_file = f"{storage_file}.lock"
+        self.revision = 0
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.storage_file)
+
+    def load(self):
+        with self._lock, file_lock(self.lock_file):
+            orders, self.revision = read_snapshot(self.storage_file)
+        return orders
+
+    def save(self, orders):
+        with self._lock, file_lock(self.lock_file):
+            self.revision = read_revision(self.storage_file)
+            self._write(orders)
+
+    def commit(self, record, orders):
+        with self._lock, file_lock(self.lock_file):
+            rebased = self._sync(orders)
+            apply_record(orders, record)
+            self._write(orders)
+        return rebased
+
+    def commit_many(self, records, orders):
+        with self._lock, file_lock(self.lock_file):
+            rebased = self._sync(orders)
+            if rebased:
+                for record in records:
+                    apply_record(orders, record)
+            self._write(orders)
+        return rebased
+
+    def refresh(self, orders):
+        with self._lock, file_lock(self.lock_file):
+            return self._sync(orders)
+
+    def _sync(self, orders):
+        """Replace orders with the file contents if another process wrote it"""
+        if read_revision(self.storage_file) == self.revision:
+            return False
+        orders[:], self.revision = read_snapshot(self.storage_file)
+        return True
+
+    def _write(self, orders):
+        self.revision += 1
+        self.bytes_written += write_atomic(self.storage_file, {"revision": self.revision, "orders": list(orders)})
+
+
+class JournalStorage(OrderStorage):
+    """
+    Append-only journal of order mutations on top of a JSON snapshot.
+
+    Every mutation is appended as one JSON line, so a write costs the same
+    regardless of how many orders exist. Once the journal grows beyond
+    compact_threshold bytes it is sealed and folded into the snapshot by a
+    background thread. A torn write only loses the last (incomplete) record.
+
+    The sequence number of the last record is the revision. A writer that
+    finds newer records from another process replays only those records
+    (or reloads everything if the journal was sealed in the meantime).
+    """
+
+    def __init__(self, storage_file, compact_threshold=1024 * 1024):
+        self.storage_file = storage_file
+        self.journal_file = _journal_path(storage_file)
+        self.sealed_file = f"{self.journal_file}.sealed"
+        self.lock_file = f"{self.journal_file}.lock"
+        self.compact_threshold = compact_threshold
+        self.revision = 0
+        # Position in the active journal up to which records are known
+        self._journal_inode = None
+        self._journal_offset = 0
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    def load(self):
+        """
+        Load the snapshot and replay the sealed and active journals on top.
+
+        Returns:
+            list: The current list of orders
+        """
+        with self._lock, file_lock(self.lock_file):
+            orders = self._load_locked()
+        # Finish a compaction that was interrupted by a restart
+        if os.path.exists(self.sealed_file):
+            self._start_compaction()
+        return orders
+
+    def exists(self):
+        return os.path.exists(self.storage_file) or os.path.exists(self.journal_file)
+
+    def save(self, orders):
+        self.write_snapshot(orders)
+
+    def commit(self, record, orders):
+        with self._lock, file_lock(self.lock_file):
+            rebased = self._sync(orders)
+            apply_record(orders, record)
+            self._append([record])
+        return rebased
+
+    def commit_many(self, records, orders):
+        with self._lock, file_lock(self.lock_file):
+            rebased = self._latest_revision() != self.revision
+            if rebased:
+                # orders also holds the unsaved records, so replaying only
+                # the new records of other processes is not possible here
+                orders[:] = self._load_locked()
+                for record in records:
+                    apply_record(orders, record)
+            self._append(records)
+        return rebased
+
+    def refresh(self, orders):
+        with self._lock, file_lock(self.lock_file):
+            return self._sync(orders)
+
+    def write_snapshot(self, orders):
+        """Replace the whole state with a fresh snapshot and an empty journal"""
+        with self._lock:
+            self._wait_for_compaction()
+            with file_lock(self.lock_file):
+                self.revision = max(self.revision, self._latest_revision()) + 1
+                self.bytes_written += write_atomic(
+                    self.storage_file, {"revision": self.revision, "orders": list(orders)})
+                for path in (self.sealed_file, self.journal_file):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._journal_inode = None
+                self._journal_offset = 0
+
+    def compact(self):
+        """Fold the sealed journal into the snapshot (runs in the background)"""
+        # The sealed journal no longer changes, so the merge runs unlocked
+        orders, snapshot_revision = read_snapshot(self.storage_file)
+        orders = OrderList(orders)
+        revision = snapshot_revision
+        for record in self._read_records(self.sealed_file):
+            if record["seq"] > revision:
+                apply_record(orders, record)
+                revision = record["seq"]
+        with file_lock(self.lock_file):
+            if not os.path.exists(self.sealed_file) or read_revision(self.storage_file) != snapshot_revision:
+                # Another process compacted or replaced the snapshot meanwhile
+                return
+            write_atomic(self.storage_file, {"revision": revision, "orders": list(orders)})
+            os.remove(self.sealed_file)
+
+    def _load_locked(self):
+        orders, self.revision = read_snapshot(self.storage_file)
+        orders = OrderList(orders)
+        for path in (self.sealed_file, self.journal_file):
+            for record in self._read_records(path):
+                if record["seq"] <= self.revision:
+                    # Already contained in the snapshot
+                    continue
+                apply_record(orders, record)
+                self.revision = record["seq"]
+        self._remember_journal()
+        return orders
+
+    def _sync(self, orders):
+        """Catch up with records written by other processes"""
+        if self._latest_revision() == self.revision:
+            return False
+        try:
+            st = os.stat(self.journal_file)
+        except FileNotFoundError:
+            st = None
+        if st is not None and st.st_ino == self._journal_inode and st.st_size >= self._journal_offset:
+            # Same journal file: only replay the records appended since
+            records = self._read_records(self.journal_file, self._journal_offset)
+            if records and records[0]["seq"] == self.revision + 1:
+                for record in records:
+                    apply_record(orders, record)
+                self.revision = records[-1]["seq"]
+                self._remember_journal()
+                return True
+        orders[:] = self._load_locked()
+        return True
+
+    def _append(self, records):
+        """Append records to the journal in a single write"""
+        lines = []
+        for record in records:
+            self.revision += 1
+            lines.append(json.dumps({"seq": self.revision, **record}, ensure_ascii=False) + "\n")
+        data = "".join(lines)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            self.bytes_written += len(data.encode('utf-8'))
+        self._remember_journal()
+        if self._journal_offset >= self.compact_threshold and not os.path.exists(self.sealed_file):
+            # Seal the journal; new records go to a fresh file
+            os.replace(self.journal_file, self.sealed_file)
+            self._journal_inode = None
+            self._journal_offset = 0
+            self._start_compaction()
+
+    def _remember_journal(self):
+        try:
+            st = os.stat(self.journal_file)
+        except FileNotFoundError:
+            self._journal_inode = None
+            self._journal_offset = 0
+            return
+        self._journal_inode = st.st_ino
+        self._journal_offset = st.st_size
+
+    def _latest_revision(self):
+        """Revision of the persisted state (last journal record or snapshot)"""
+        for path in (self.journal_file, self.sealed_file):
+            seq = self._last_seq(path)
+            if seq is not None:
+                return seq
+        return read_revision(self.storage_file)
+
+    def _last_seq(self, path):
+        """Sequence number of the last complete record, read from the file end"""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            chunk_size = 4096
+            while True:
+                start = max(0, size - chunk_size)
+                f.seek(start)
+                tail = f.read(size - start)
+                if not tail.endswith(b"\n"):
+                    # Torn record at the end: the full read truncates it
+                    records = self._read_records(path)
+                    return records[-1]["seq"] if records else None
+                lines = tail[:-1].rsplit(b"\n", 1)
+                if len(lines) == 2 or start == 0:
+                    return json.loads(lines[-1].decode('utf-8'))["seq"]
+                chunk_size *= 4
+
+    def _start_compaction(self):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._run_compaction, daemon=True)
+        self._compactor.start()
+
+    def _run_compaction(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"Error compacting order journal: {e}")
+
+    def _wait_for_compaction(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _read_records(self, path, offset=0):
+        """
+        Read all complete records of a journal file, starting at offset.
+        A trailing torn record is skipped and truncated away so that
+        subsequent appends start on a clean line.
+        """
+        records = []
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return records
+        good_offset = offset
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(offset)
+            for raw_line in f:
+                try:
+                    if not raw_line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    records.append(json.loads(raw_line.decode('utf-8')))
+                except ValueError:
+                    print(f"Warning: Skipping torn journal record in {path}")
+                    break
+                good_offset += len(raw_line)
+        if good_offset < size:
+            with open(path, 'r+b') as f:
+                f.truncate(good_offset)
+        return records
+
+
+class SQLiteStorage(OrderStorage):
+    """
+    Stores orders in a SQLite database (WAL mode).
+
+    The searchable fields are kept in indexed columns next to the full
+    order as JSON, so views can query only the rows they need. On first
+    use an existing JSON order file is migrated once. The revision lives
+    in the meta table and is bumped in the same transaction as the change.
+    """
+
+    supports_query = True
+
+    SCHEMA_VERSION = 3
+
+    def __init__(self, db_file, migrate_from=None):
+        self.db_file = db_file
+        self.revision = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema(migrate_from)
+
+    def _create_schema(self, migrate_from):
+        with self._lock, self._transaction(immediate=True):
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+            if version < 1:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS orders ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "timestamp TEXT, type TEXT, shop TEXT, name TEXT, "
+                    "data TEXT NOT NULL)"
+                )
+                for column in ("timestamp", "type", "shop", "name"):
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_orders_{column} ON orders ({column})"
+                    )
+            if version < 2:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+                self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', 0)")
+            if version < 3:
+                # Stable order IDs, so removals don't scan the JSON data
+                self._conn.execute("ALTER TABLE orders ADD COLUMN order_id TEXT")
+                self._conn.execute("UPDATE orders SET order_id = json_extract(data, '$.id')")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_order_id ON orders (order_id)")
+            if version < 1 and migrate_from:
+                # One-shot migration from the JSON order file (including its journal)
+                orders = JournalStorage(migrate_from).load()
+                self._insert(orders)
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    @contextmanager
+    def _transaction(self, immediate=False):
+        """
+        Run the block in one transaction. BEGIN IMMEDIATE takes the write
+        lock up front, so the revision check and the write cannot interleave
+        with another process.
+        """
+        self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    @staticmethod
+    def _row(order):
+        return (
+            order.get("timestamp"),
+            order.get("type"),
+            order.get("shop"),
+            order.get("name"),
+            order.get("id"),
+            json.dumps(order, ensure_ascii=False),
+        )
+
+    def _insert(self, orders):
+        rows = [self._row(order) for order in orders]
+        self._conn.executemany(
+            "INSERT INTO orders (timestamp, type, shop, name, order_id, data) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        # Approximated by the size of the order data
+        self.bytes_written += sum(len(row[-1]) for row in rows)
+
+    def _load_rows(self):
+        rows = self._conn.execute("SELECT data FROM orders ORDER BY id").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def _read_revision(self):
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()[0]
+
+    def _bump_revision(self):
+        self.revision = self._read_revision() + 1
+        self._conn.execute("UPDATE meta SET value = ? WHERE key = 'revision'", (self.revision,))
+
+    def load(self):
+        with self._lock, self._transaction():
+            self.revision = self._read_revision()
+            return self._load_rows()
+
+    def save(self, orders):
+        with self._lock, self._transaction(immediate=True):
+            self._conn.execute("DELETE FROM orders")
+            self._insert(orders)
+            self._bump_revision()
+
+    def commit(self, record, orders):
+        with self._lock, self._transaction(immediate=True):
+            rebased = self._sync(orders)
+            apply_record(orders, record)
+            self._apply(record)
+            self._bump_revision()
+        return rebased
+
+    def commit_many(self, records, orders):
+        with self._lock, self._transaction(immediate=True):
+            rebased = self._sync(orders)
+            if rebased:
+                for record in records:
+                    apply_record(orders, record)
+            for record in records:
+                self._apply(record)
+            self._bump_revision()
+        return rebased
+
+    def refresh(self, orders):
+        with self._lock, self._transaction():
+            return self._sync(orders)
+
+    def _sync(self, orders):
+        """Reload orders if another process committed since the last read"""
+        revision = self._read_revision()
+        if revision == self.revision:
+            return False
+        orders[:] = self._load_rows()
+        self.revision = revision
+        return True
+
+    def _apply(self, record):
+        op = record.get("op")
+        if op == "add":
+            self._insert([record["order"]])
+        elif op == "extend":
+            self._insert(record["orders"])
+        elif op in ("remove", "archive"):
+            removed = [record["order"]] if op == "remove" else record["orders"]
+            self._conn.executemany(
+                "DELETE FROM orders WHERE order_id = ?",
+                ((order["id"],) for order in removed if order.get("id") is not None),
+            )
+            self._conn.executemany(
+                "DELETE FROM orders WHERE id = "
+                "(SELECT id FROM orders WHERE data = ? ORDER BY id LIMIT 1)",
+                ((json.dumps(order, ensure_ascii=False),) for order in removed if order.get("id") is None),
+            )
+        elif op == "clear":
+            self._conn.execute("DELETE FROM orders")
+        elif op == "replace":
+            self._conn.execute("DELETE FROM orders")
+            self._insert(record["orders"])
+
+    def query(self, order_type=None, shop=None, name=None, since=None, until=None):
+        clauses = []
+        params = []
+        for column, value in (("type", order_type), ("shop", shop), ("name", name)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        sql = "SELECT data FROM orders"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_storage(mode, storage_file, **options):
+    """
+    Create a storage backend.
+
+    Args:
+        mode (str): "json", "journal" or "sqlite"
+        storage_file (str): Path of the JSON order file
+        options: Backend specific options (compact_threshold, db_file)
+
+    Returns:
+        OrderStorage: The storage backend
+    """
+    if mode == "journal":
+        return JournalStorage(storage_file, compact_threshold=options.get("compact_threshold", 1024 * 1024))
+    if mode == "sqlite":
+        db_file = options.get("db_file") or f"{os.path.splitext(storage_file)[0]}.db"
+        return SQLiteStorage(db_file, migrate_from=storage_file)
+    if mode == "json":
+        return JsonFileStorage(storage_file)
+    raise ValueError(f"Unknown storage mode: {mode}")
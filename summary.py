@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kitchen summary for the LunchSquad application.
+
+OrderSummary keeps order counts per restaurant, shop, product, box type,
+sauce, spice level and YamYam number. The counters are updated with every
+added or removed order, so showing the summary never rescans the orders.
+"""
+
+from collections import Counter
+from config import YAMYAM_OPTIONS
+from rendering import BOX_LABELS, PRODUCT_LABELS, RESTAURANT_LABELS, SAUCE_LABELS, SHOP_LABELS, SPICE_LABELS
+
+# YamYam numbers per line in the summary lines
+NUMBERS_PER_LINE = 10
+
+
+def _most_common(counter):
+    """Counter items, most frequent first (ties in a stable order)"""
+    return sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+def _counts(counter, labels=None, group=None):
+    """Format counters as "Label ×n", most frequent first"""
+    parts = []
+    for key, count in _most_common(counter):
+        if group is not None:
+            if key[0] != group:
+                continue
+            key = key[1]
+        label = labels.get(key, key) if labels else key
+        parts.append(f"{label} ×{count}")
+    return ", ".join(parts)
+
+
+class OrderSummary:
+    """
+    Aggregated order counts, updated in O(1) per order.
+
+    Counters for products and sauces are keyed by (group, value), where the
+    group is the shop for Döner orders and "edeka" for Edeka orders; box
+    types and spice levels are keyed by (shop, value).
+    """
+
+    def __init__(self, max_number=YAMYAM_OPTIONS["max_number"]):
+        self.max_number = max_number
+        self.total = 0
+        self.restaurants = Counter()
+        self.shops = Counter()
+        self.products = Counter()
+        self.box_types = Counter()
+        self.sauces = Counter()
+        self.spice_levels = Counter()
+        # Count per YamYam number (index = menu number)
+        self.yamyam_numbers = [0] * (max_number + 1)
+        # Numbers outside 1..max_number (e.g. from imported files)
+        self.other_numbers = Counter()
+
+    @classmethod
+    def from_orders(cls, orders):
+        """Build a summary from a list of orders"""
+        summary = cls()
+        for order in orders:
+            summary.add(order)
+        return summary
+
+    def add(self, order):
+        """Count an added order"""
+        self._update(order, 1)
+
+    def remove(self, order):
+        """Uncount a removed order"""
+        self._update(order, -1)
+
+    def clear(self):
+        """Reset all counters"""
+        self.__init__(self.max_number)
+
+    def rebuild(self, orders):
+        """Recount all orders (after loading or replacing the order list)"""
+        self.clear()
+        for order in orders:
+            self.add(order)
+
+    def apply(self, record):
+        """Update the counters for a change record (see storage.apply_record)"""
+        op = record.get("op")
+        if op == "add":
+            self.add(record["order"])
+        elif op == "extend":
+            for order in record["orders"]:
+                self.add(order)
+        elif op == "remove" and record.get("order") is not None:
+            self.remove(record["order"])
+        elif op == "clear":
+            self.clear()
+        elif op == "replace":
+            self.rebuild(record["orders"])
+        elif op == "archive":
+            for order in record["orders"]:
+                self.remove(order)
+
+    def copy(self):
+        """Independent copy (e.g. for an export running in the background)"""
+        summary = OrderSummary(self.max_number)
+        summary.total = self.total
+        for name in ("restaurants", "shops", "products", "box_types", "sauces",
+                     "spice_levels", "other_numbers"):
+            setattr(summary, name, getattr(self, name).copy())
+        summary.yamyam_numbers = list(self.yamyam_numbers)
+        return summary
+
+    def as_dict(self):
+        """
+        Summary as plain JSON data (e.g. for the API).
+
+        Returns:
+            dict: Counts by restaurant, shop, product, box type, sauce,
+                  spice level (grouped by shop / "edeka") and YamYam
+                  number, plus the summary lines as text
+        """
+        def grouped(counter):
+            groups = {}
+            for (group, value), count in _most_common(counter):
+                groups.setdefault(group, {})[value] = count
+            return groups
+
+        return {
+            "total": self.total,
+            "restaurants": dict(_most_common(self.restaurants)),
+            "shops": dict(_most_common(self.shops)),
+            "products": grouped(self.products),
+            "box_types": grouped(self.box_types),
+            "sauces": grouped(self.sauces),
+            "spice_levels": grouped(self.spice_levels),
+            "yamyam_numbers": {str(number): count for number, count in self.yamyam_counts()},
+            "lines": [text for level, text in self.lines()],
+        }
+
+    def _update(self, order, delta):
+        order_type = order.get("type", "")
+        self.total += delta
+        self._count(self.restaurants, order_type, delta)
+
+        if order_type == "yamyam":
+            # Numbers are entered as text ("42")
+            number = order.get("number")
+            try:
+                index = int(number)
+            except (TypeError, ValueError):
+                index = None
+            if index is not None and 1 <= index <= self.max_number:
+                self.yamyam_numbers[index] += delta
+            else:
+                self._count(self.other_numbers, str(number), delta)
+
+        elif order_type == "doner":
+            shop = order.get("shop", "")
+            product = order.get("product", "")
+            self._count(self.shops, shop, delta)
+            self._count(self.products, (shop, product), delta)
+            if product == "box" and order.get("boxType") is not None:
+                self._count(self.box_types, (shop, order["boxType"]), delta)
+            for sauce in order.get("sauces") or []:
+                self._count(self.sauces, (shop, sauce), delta)
+            self._count(self.spice_levels, (shop, order.get("spiceLevel", "")), delta)
+
+        elif order_type == "edeka":
+            self._count(self.products, ("edeka", order.get("product", "-")), delta)
+            if order.get("sauce"):
+                self._count(self.sauces, ("edeka", order["sauce"]), delta)
+
+    @staticmethod
+    def _count(counter, key, delta):
+        count = counter[key] + delta
+        if count > 0:
+            counter[key] = count
+        else:
+            del counter[key]
+
+    def yamyam_counts(self):
+        """List of (number, count) for all ordered YamYam numbers, by number"""
+        counts = [(number, count) for number, count in enumerate(self.yamyam_numbers) if count]
+        counts.extend(sorted(self.other_numbers.items()))
+        return counts
+
+    def lines(self):
+        """
+        Summary as text lines for views and reports.
+
+        Returns:
+            list: (level, text) tuples - level 0 are headings, level 1 details
+        """
+        lines = []
+        if self.restaurants.get("yamyam"):
+            lines.append((0, f"YamYam: {self.restaurants['yamyam']}"))
+            numbers = [f"#{number} ×{count}" for number, count in self.yamyam_counts()]
+            for start in range(0, len(numbers), NUMBERS_PER_LINE):
+                lines.append((1, ", ".join(numbers[start:start + NUMBERS_PER_LINE])))
+
+        for shop, count in _most_common(self.shops):
+            lines.append((0, f"Döner - {SHOP_LABELS.get(shop, shop)}: {count}"))
+            lines.append((1, _counts(self.products, PRODUCT_LABELS, shop)))
+            boxes = _counts(self.box_types, BOX_LABELS, shop)
+            if boxes:
+                lines.append((1, f"Boxen: {boxes}"))
+            sauces = _counts(self.sauces, SAUCE_LABELS, shop)
+            lines.append((1, f"Soßen: {sauces or 'keine'}"))
+            lines.append((1, f"Schärfe: {_counts(self.spice_levels, SPICE_LABELS, shop)}"))
+
+        if self.restaurants.get("edeka"):
+            lines.append((0, f"Edeka: {self.restaurants['edeka']}"))
+            lines.append((1, _counts(self.products, group="edeka")))
+            sauces = _counts(self.sauces, group="edeka")
+            if sauces:
+                lines.append((1, f"Saucen: {sauces}"))
+
+        # Orders of unknown restaurant types
+        for order_type, count in self.restaurants.items():
+            if order_type not in RESTAURANT_LABELS:
+                lines.append((0, f"{str(order_type).capitalize()}: {count}"))
+        return lines
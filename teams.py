@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Team order stores for the LunchSquad application.
+
+Several lunch groups can share one app instance: the team is chosen with
+?team=<name> in the app and API URLs. Every team has its own OrderManager,
+and with it its own order file (TEAMS_DIR/<name>/), lock, summary, change
+feed, background writer and order limit (TEAM_MAX_ORDERS), so teams never
+see or wait for each other's orders. Without ?team= the app uses the
+default team and DEFAULT_ORDER_FILE, as before teams existed.
+
+Only the teams in TEAMS (if set) can be used, and at most TEAM_MAX_COUNT
+team directories are created, so visitors can't grow disk and memory by
+making up team names.
+
+Order managers are created on first use; their orders are loaded on the
+first access. A team that was not used for TEAM_IDLE_SECONDS is written,
+dropped from memory and removed from the registry; the next request for
+it loads it again. Sessions and API requests therefore ask the registry
+for the manager every time instead of holding on to it.
+"""
+
+import os
+import re
+import threading
+import time
+
+import streamlit as st
+from config import (DEFAULT_ORDER_FILE, TEAMS, TEAMS_DIR, TEAM_NAME_PATTERN, TEAM_MAX_COUNT,
+                    TEAM_MAX_ORDERS, TEAM_IDLE_SECONDS)
+from models import OrderManager
+
+DEFAULT_TEAM = ""
+
+
+def normalize_team(team):
+    """
+    Team name from a URL parameter (None or "" is the default team).
+
+    Returns:
+        str: The lowercased team name
+
+    Raises:
+        ValueError: If the name is not a valid team name
+    """
+    team = (team or DEFAULT_TEAM).strip().lower()
+    if team != DEFAULT_TEAM and not re.fullmatch(TEAM_NAME_PATTERN, team):
+        raise ValueError(f"Ungültiger Teamname: {team!r}")
+    return team
+
+
+class TeamRegistry:
+    """The order managers of all teams of the process"""
+
+    def __init__(self, teams_dir=TEAMS_DIR, default_file=DEFAULT_ORDER_FILE, allowed=TEAMS,
+                 max_teams=TEAM_MAX_COUNT, max_orders=TEAM_MAX_ORDERS, idle_seconds=TEAM_IDLE_SECONDS,
+                 **manager_options):
+        self.teams_dir = teams_dir
+        self.default_file = default_file
+        self.allowed = None if allowed is None else {normalize_team(team) for team in allowed}
+        self.max_teams = max_teams
+        self.max_orders = max_orders
+        self.idle_seconds = idle_seconds
+        # Further OrderManager arguments (storage_mode, durability, ...)
+        self.manager_options = manager_options
+        self._managers = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def get(self, team=DEFAULT_TEAM):
+        """
+        Order manager of a team, created on first use (cheap: the orders
+        are loaded on their first access).
+
+        Raises:
+            ValueError: If the name is not a valid team name, not an allowed
+                team or a new team beyond max_teams
+        """
+        team = normalize_team(team)
+        with self._lock:
+            manager = self._managers.get(team)
+            if manager is None:
+                manager = self._managers[team] = self._create(team)
+                self._start_sweeper()
+            # A team in use is not idle, even before its orders are read
+            manager.last_used = time.monotonic()
+        return manager
+
+    def _create(self, team):
+        if team == DEFAULT_TEAM:
+            storage_file = self.default_file
+            cloud_key = "orders_data"
+        else:
+            if self.allowed is not None and team not in self.allowed:
+                raise ValueError(f"Unbekanntes Team: {team!r}")
+            team_dir = os.path.join(self.teams_dir, team)
+            if not os.path.isdir(team_dir):
+                if self.max_teams is not None and len(self._team_dirs()) >= self.max_teams:
+                    raise ValueError(f"Keine weiteren Teams möglich (höchstens {self.max_teams}).")
+                os.makedirs(team_dir, exist_ok=True)
+            storage_file = os.path.join(team_dir, os.path.basename(self.default_file))
+            cloud_key = f"orders_data:{team}"
+        return OrderManager(storage_file, cloud_key=cloud_key, max_orders=self.max_orders, load=False,
+                            **self.manager_options)
+
+    def _team_dirs(self):
+        """Names of the team directories in teams_dir"""
+        try:
+            return [name for name in os.listdir(self.teams_dir)
+                    if os.path.isdir(os.path.join(self.teams_dir, name))]
+        except FileNotFoundError:
+            return []
+
+    def teams(self):
+        """Names of the teams used so far, with their order managers"""
+        return sorted(self._managers.items())
+
+    def unload_idle(self, now=None):
+        """
+        Drop the orders of teams not used for idle_seconds from memory and
+        remove their order managers. Teams whose changes can't be written
+        are kept.
+
+        Returns:
+            list: Names of the teams that were removed
+        """
+        now = time.monotonic() if now is None else now
+        removed = []
+        for team, manager in list(self._managers.items()):
+            last_used = manager.last_used
+            if now - last_used < self.idle_seconds:
+                continue
+            try:
+                if not manager.unload():
+                    continue
+            except Exception as e:
+                print(f"Error unloading the orders of team {team!r}: {e}")
+                continue
+            with self._lock:
+                # Not if the team was used (or loaded again) meanwhile
+                if (self._managers.get(team) is manager and not manager.loaded
+                        and manager.last_used == last_used):
+                    del self._managers[team]
+                    removed.append(team)
+        return removed
+
+    def flush(self):
+        """Write the pending changes of all teams"""
+        for _, manager in self.teams():
+            manager.flush()
+
+    def _start_sweeper(self):
+        if self._sweeper is not None or not self.idle_seconds:
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="team-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self):
+        # Check a few times per idle period, so orders are dropped at most
+        # a quarter period late
+        while True:
+            time.sleep(self.idle_seconds / 4)
+            self.unload_idle()
+
+
+@st.cache_resource
+def get_team_registry():
+    """
+    Get the process-wide team registry.
+    All sessions and the order API share it, so every team has exactly
+    one order manager per process.
+    """
+    return TeamRegistry()
+
+
+def get_order_manager(team=DEFAULT_TEAM):
+    """Get the process-wide OrderManager of a team"""
+    return get_team_registry().get(team)
@@ -5,322 +5,331 @@
 Utility functions for the LunchSquad application
 """
 
-import base64
+import json
 import streamlit as st
-import pandas as pd
 import io
-from PIL import Image, ImageDraw, ImageFont
+import zipfile
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime
+from rendering import render_order
+from summary import OrderSummary
+from validation import validate_order
+from metrics import METRICS, timed
+
+# Bytes and orders of a call, recorded by the timing hooks (see metrics.py)
+def _report_size(report, orders, *args, **kwargs):
+    return len(report.encode("utf-8")), len(orders)
+
+def _image_orders(image, orders, *args, **kwargs):
+    # The image is only encoded by write_image_export, which records the bytes
+    return 0, len(orders)
+
+def _display_name(rendered):
+    """Name of the person who placed a rendered order"""
+    return rendered.name if rendered.name is not None else ""
+
+def _has_orders(orders, order_type):
+    """Check whether there is at least one order of a restaurant type"""
+    return any(order.get("type") == order_type for order in orders)
+
+def _iter_rendered(orders, order_type):
+    """Render the orders of one restaurant type one at a time"""
+    for order in orders:
+        if order.get("type") == order_type:
+            yield render_order(order)
 
 def format_order_item(order):
     """Format an order as a readable string"""
-    name = order.get("name", "")
-    order_type = order.get("type", "")
-    timestamp = order.get("timestamp", "")
-    
-    formatted_time = ""
-    if timestamp:
-        try:
-            dt = datetime.fromisoformat(timestamp)
-            formatted_time = dt.strftime("%Y-%m-%d %H:%M")
-        except (ValueError, TypeError):
-            pass
-    
-    if order_type == "yamyam":
-        return f"{formatted_time} - {name}: YamYam #{order.get('number', '')}"
-    
-    elif order_type == "doner":
-        product_map = {
-            "doner": "Döner",
-            "durum": "Dürüm",
-            "falafel-doner": "Falafel-Döner",
-            "falafel-durum": "Falafel-Dürüm",
-            "box": "Dönerbox"
-        }
-        
-        shop_map = {
-            "bruder": "Döner Bruder",
-            "king": "King Kebabo's",
-            "aldi": "Aldi Döner"
-        }
-        
-        product = product_map.get(order.get("product", ""), order.get("product", ""))
-        shop = shop_map.get(order.get("shop", ""), order.get("shop", ""))
-        
-        box_type = ""
-        if order.get("product") == "box" and "boxType" in order:
-            box_map = {"pommes": "mit Pommes", "salat": "mit Salat"}
-            box_type = f" ({box_map.get(order['boxType'], order['boxType'])})"
-        
-        return f"{formatted_time} - {name}: {product}{box_type} ({shop})"
-    
-    elif order_type == "edeka":
-        product = order.get("product", "")
-        if product == "Salat":
-            return f"{formatted_time} - {name}: Edeka Salatbar - {order.get('salatType', '')}"
-        elif product == "Bäcker":
-            return f"{formatted_time} - {name}: Edeka Bäcker - {order.get('baeckerItem', '')}"
-        else:
-            return f"{formatted_time} - {name}: Edeka {product} - Sauce: {order.get('sauce', 'keine')}"
-    
-    else:
-        return f"{formatted_time} - {name}: Unknown order type: {order_type}"
+    rendered = render_order(order)
+    return f"{rendered.time} - {_display_name(rendered)}: {rendered.headline}"
 
-def create_download_link(df, filename="orders.csv", text="Download CSV"):
-    """
-    Create a download link for a DataFrame as CSV
-    """
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'data:file/csv;base64,{b64}'
-    return href
+def _summary_lines(orders, summary):
+    """Lines of the kitchen summary (counted from orders if no summary is given)"""
+    if summary is None:
+        summary = OrderSummary.from_orders(orders)
+    return summary.lines()
 
-def create_download_link_json(data, filename="orders.json", text="Download JSON"):
-    """
-    Create a download link for data as JSON
+def iter_text_report(orders, summary=None):
     """
-    import json
-    json_str = json.dumps(data, ensure_ascii=False, indent=2)
-    b64 = base64.b64encode(json_str.encode()).decode()
-    href = f'data:file/json;base64,{b64}'
-    return href
-
-def create_text_report(orders):
-    """
-    Create a text report of orders for downloading
+    Generate a text report of orders chunk by chunk,
+    starting with the kitchen summary
     """
     if not orders:
-        return "No orders available."
+        yield "No orders available."
+        return
     
-    text = "LunchSquad - Team Lunch Orders\n"
-    text += "=" * 40 + "\n\n"
-    text += f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    yield "LunchSquad - Team Lunch Orders\n"
+    yield "=" * 40 + "\n\n"
+    yield f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
     
-    # Group by restaurant type
-    yamyam_orders = [o for o in orders if o.get("type") == "yamyam"]
-    doner_orders = [o for o in orders if o.get("type") == "doner"]
-    edeka_orders = [o for o in orders if o.get("type") == "edeka"]
+    # Kitchen summary
+    yield "Kitchen Summary:\n"
+    yield "-" * 20 + "\n"
+    for level, text in _summary_lines(orders, summary):
+        yield "  " * level + f"{text}\n"
+    yield "\n"
     
     # YamYam orders
-    if yamyam_orders:
-        text += "YamYam Orders:\n"
-        text += "-" * 20 + "\n"
-        for order in yamyam_orders:
-            text += f"- {order.get('name', '')}: #{order.get('number', '')}\n"
-        text += "\n"
+    if _has_orders(orders, "yamyam"):
+        yield "YamYam Orders:\n"
+        yield "-" * 20 + "\n"
+        for rendered in _iter_rendered(orders, "yamyam"):
+            yield f"- {_display_name(rendered)}: {rendered.summary}\n"
+        yield "\n"
     
     # Döner orders
-    if doner_orders:
-        text += "Döner Orders:\n"
-        text += "-" * 20 + "\n"
-        for order in doner_orders:
-            product_map = {
-                "doner": "Döner",
-                "durum": "Dürüm",
-                "falafel-doner": "Falafel-Döner",
-                "falafel-durum": "Falafel-Dürüm",
-                "box": "Dönerbox"
-            }
-            shop_map = {
-                "bruder": "Döner Bruder",
-                "king": "King Kebabo's",
-                "aldi": "Aldi Döner"
-            }
-            product = product_map.get(order.get("product", ""), order.get("product", ""))
-            shop = shop_map.get(order.get("shop", ""), order.get("shop", ""))
-            sauces = ", ".join(order.get("sauces", [])) or "keine"
-            spice_map = {"none": "nicht scharf", "normal": "normal scharf", "extra": "sehr scharf"}
-            spice = spice_map.get(order.get("spiceLevel", ""), order.get("spiceLevel", ""))
-            
-            extras = []
-            for extra in order.get("extras", []):
-                if isinstance(extra, str) and extra.startswith("custom:"):
-                    extras.append(extra[7:])  # Remove "custom:" prefix
-                else:
-                    extras.append(extra)
-            extras_str = ", ".join(extras) or "keine"
-            
-            box_type = ""
-            if order.get("product") == "box" and "boxType" in order:
-                box_map = {"pommes": "mit Pommes", "salat": "mit Salat"}
-                box_type = f" ({box_map.get(order['boxType'], order['boxType'])})"
-            
-            text += f"- {order.get('name', '')}: {product}{box_type} ({shop})\n"
-            text += f"  Soßen: {sauces}\n"
-            text += f"  Extras: {extras_str}\n"
-            text += f"  Schärfe: {spice}\n\n"
+    if _has_orders(orders, "doner"):
+        yield "Döner Orders:\n"
+        yield "-" * 20 + "\n"
+        for rendered in _iter_rendered(orders, "doner"):
+            yield f"- {_display_name(rendered)}: {rendered.summary}\n"
+            for detail in rendered.details:
+                yield f"  {detail}\n"
+            yield "\n"
     
     # Edeka orders
-    if edeka_orders:
-        text += "Edeka Orders:\n"
-        text += "-" * 20 + "\n"
-        for order in edeka_orders:
-            product = order.get("product", "")
-            if product == "Salat":
-                text += f"- {order.get('name', '')}: Salatbar - {order.get('salatType', '')}\n"
-            elif product == "Bäcker":
-                text += f"- {order.get('name', '')}: Bäcker - {order.get('baeckerItem', '')}\n"
-            else:
-                text += f"- {order.get('name', '')}: {product} - Sauce: {order.get('sauce', 'keine')}\n"
-        text += "\n"
+    if _has_orders(orders, "edeka"):
+        yield "Edeka Orders:\n"
+        yield "-" * 20 + "\n"
+        for rendered in _iter_rendered(orders, "edeka"):
+            yield f"- {_display_name(rendered)}: {rendered.summary}\n"
+        yield "\n"
     
-    text += "=" * 40 + "\n"
-    text += "Enjoy your meal! | LunchSquad - Team Lunch Organizer"
-    
-    return text
+    yield "=" * 40 + "\n"
+    yield "Enjoy your meal! | LunchSquad - Team Lunch Organizer"
 
-def create_download_link_text(text_content, filename="orders.txt", link_text="Download TXT"):
+@timed("create_text_report", _report_size)
+def create_text_report(orders, summary=None):
     """
-    Create a download link for text content
+    Create a text report of orders for downloading
     """
-    b64 = base64.b64encode(text_content.encode()).decode()
-    href = f'data:file/txt;base64,{b64}'
-    return href
+    return "".join(iter_text_report(orders, summary))
+
+def _write_chunks(chunks, buffer, batch_size=1000):
+    """Write text chunks UTF-8 encoded to a binary buffer in batches"""
+    batch = []
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            buffer.write("".join(batch).encode("utf-8"))
+            batch.clear()
+    if batch:
+        buffer.write("".join(batch).encode("utf-8"))
+
+def write_text_export(orders, buffer, summary=None):
+    """Write the text report to a binary buffer"""
+    _write_chunks(iter_text_report(orders, summary), buffer)
+
+def write_json_export(orders, buffer):
+    """Write orders as JSON to a binary buffer, encoded chunk by chunk"""
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    _write_chunks(encoder.iterencode(orders), buffer, batch_size=10000)
+
+def write_csv_export(df, buffer, chunk_rows=10000):
+    """Write a DataFrame as CSV to a binary buffer, chunk_rows rows at a time"""
+    for start in range(0, len(df), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(
+            buffer, index=False, header=(start == 0), encoding="utf-8", mode="wb"
+        )
 
-def create_image_report(orders):
+def create_export(writer, *args, **kwargs):
     """
-    Create an image report of orders
-    Returns a PIL Image object
+    Run an export writer into an in-memory byte buffer.
+    Returns the buffer (rewound), which st.download_button can serve directly.
     """
-    if not orders:
-        return None
-    
-    # Create an image
-    width, height = 1000, max(600, 180 + 60 * len(orders))
-    img = Image.new('RGB', (width, height), color=(40, 40, 40))
-    draw = ImageDraw.Draw(img)
-    
+    # Timed per writer (write_json_export, write_csv_export, ...)
+    with METRICS.timer(writer.__name__) as timer:
+        buffer = io.BytesIO()
+        writer(*args, buffer, **kwargs)
+        buffer.seek(0)
+        timer.bytes = buffer.getbuffer().nbytes
+        timer.orders = len(args[0])
+    return buffer
+
+# Image report layout (all sizes in pixels)
+IMAGE_REPORT_WIDTH = 1000
+IMAGE_REPORT_PAGE_HEIGHT = 1600
+IMAGE_REPORT_MIN_HEIGHT = 600
+_CONTENT_TOP = 140
+_FOOTER_SPACE = 70
+_SECTION_HEADER_HEIGHT = 30
+_SECTIONS = [("summary", "Kitchen Summary"), ("yamyam", "YamYam Orders"),
+             ("doner", "Döner Orders"), ("edeka", "Edeka Orders")]
+# Height of one entry (summary line or order; Döner orders have three
+# detail lines) and gap after each section
+_ORDER_HEIGHT = {"summary": 25, "yamyam": 25, "doner": 115, "edeka": 25}
+_SECTION_GAP = {"summary": 20, "yamyam": 20, "doner": 0, "edeka": 0}
+
+@lru_cache(maxsize=1)
+def load_report_fonts():
+    """Load the report fonts once (title, header, text)"""
+    # PIL is only needed for the PNG export, so it is imported on first use
+    from PIL import ImageFont
     try:
-        # Try to load a font (fallback to default if not available)
+        # For Linux servers
+        return (
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16),
+        )
+    except OSError:
         try:
-            # For Linux servers
-            title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28)
-            header_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-            text_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
+            # For Windows
+            return (
+                ImageFont.truetype("arial.ttf", 28),
+                ImageFont.truetype("arial.ttf", 20),
+                ImageFont.truetype("arial.ttf", 16),
+            )
         except OSError:
-            try:
-                # For Windows
-                title_font = ImageFont.truetype("arial.ttf", 28)
-                header_font = ImageFont.truetype("arial.ttf", 20)
-                text_font = ImageFont.truetype("arial.ttf", 16)
-            except OSError:
-                # Fallback
-                title_font = ImageFont.load_default()
-                header_font = ImageFont.load_default()
-                text_font = ImageFont.load_default()
+            # Fallback
+            default_font = ImageFont.load_default()
+            return default_font, default_font, default_font
+
+def _count_entries(summary, summary_lines):
+    """Number of entries per report section"""
+    counts = {order_type: summary.restaurants.get(order_type, 0) for order_type in _ORDER_HEIGHT}
+    counts["summary"] = len(summary_lines)
+    return counts
+
+def _plan_image_pages(counts, page_height=IMAGE_REPORT_PAGE_HEIGHT):
+    """
+    Plan the pages of the image report from the number of orders per type.
+    Every order has a fixed height, so no text needs to be rendered here.
+    
+    Returns:
+        tuple: (pages, content_end) - each page is a list of
+        (order_type, order_count, continued) runs; content_end is the
+        y position below the last order on the last page
+    """
+    limit = page_height - _FOOTER_SPACE
+    pages = [[]]
+    y_pos = _CONTENT_TOP
+    for order_type, _ in _SECTIONS:
+        remaining = counts.get(order_type, 0)
+        order_height = _ORDER_HEIGHT[order_type]
+        continued = False
+        while remaining:
+            # Start a new page if not even the header and one order fit
+            if pages[-1] and y_pos + _SECTION_HEADER_HEIGHT + order_height > limit:
+                pages.append([])
+                y_pos = _CONTENT_TOP
+            y_pos += _SECTION_HEADER_HEIGHT
+            fitting = max(1, min(remaining, (limit - y_pos) // order_height))
+            pages[-1].append((order_type, fitting, continued))
+            y_pos += fitting * order_height
+            remaining -= fitting
+            continued = True
+        if continued:
+            y_pos += _SECTION_GAP[order_type]
+    return pages, y_pos
+
+def image_report_page_count(orders, summary=None):
+    """Number of pages the image report of orders has (0 if there are no orders)"""
+    if not orders:
+        return 0
+    if summary is None:
+        summary = OrderSummary.from_orders(orders)
+    return len(_plan_image_pages(_count_entries(summary, summary.lines()))[0])
+
+def iter_image_report_pages(orders, summary=None):
+    """
+    Create the image report page by page, starting with the kitchen summary.
+    Yields PIL Image objects; only one page is held in memory at a time.
+    """
+    if not orders:
+        return
+    
+    if summary is None:
+        summary = OrderSummary.from_orders(orders)
+    summary_lines = summary.lines()
+    pages, content_end = _plan_image_pages(_count_entries(summary, summary_lines))
+    from PIL import Image, ImageDraw
+    title_font, header_font, text_font = load_report_fonts()
+    section_titles = dict(_SECTIONS)
+    # One running iterator per section, so every page continues where the last one stopped
+    entries = {order_type: _iter_rendered(orders, order_type) for order_type, _ in _SECTIONS}
+    entries["summary"] = iter(summary_lines)
+    width = IMAGE_REPORT_WIDTH
+    
+    for page_number, runs in enumerate(pages, start=1):
+        if len(pages) == 1:
+            height = max(IMAGE_REPORT_MIN_HEIGHT, content_end + _FOOTER_SPACE)
+        else:
+            height = IMAGE_REPORT_PAGE_HEIGHT
+        img = Image.new('RGB', (width, height), color=(40, 40, 40))
+        draw = ImageDraw.Draw(img)
         
         # Draw title
-        draw.text((50, 40), "LunchSquad - Team Lunch Orders", fill=(255, 255, 255), font=title_font)
+        title = "LunchSquad - Team Lunch Orders"
+        if len(pages) > 1:
+            title += f" (Seite {page_number}/{len(pages)})"
+        draw.text((50, 40), title, fill=(255, 255, 255), font=title_font)
         draw.text((50, 80), f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", fill=(180, 180, 180), font=text_font)
         draw.line([(50, 120), (width-50, 120)], fill=(100, 100, 100), width=2)
         
-        # Group by restaurant type
-        yamyam_orders = [o for o in orders if o.get("type") == "yamyam"]
-        doner_orders = [o for o in orders if o.get("type") == "doner"]
-        edeka_orders = [o for o in orders if o.get("type") == "edeka"]
-        
-        y_pos = 140
-        
-        # YamYam orders
-        if yamyam_orders:
-            draw.text((50, y_pos), "YamYam Orders:", fill=(255, 220, 100), font=header_font)
-            y_pos += 30
-            for order in yamyam_orders:
-                draw.text((70, y_pos), f"{order.get('name', '')}: #{order.get('number', '')}", 
+        y_pos = _CONTENT_TOP
+        for order_type, order_count, continued in runs:
+            header = section_titles[order_type] + (" (Fortsetzung):" if continued else ":")
+            draw.text((50, y_pos), header, fill=(255, 220, 100), font=header_font)
+            y_pos += _SECTION_HEADER_HEIGHT
+            if order_type == "summary":
+                for level, text in islice(entries["summary"], order_count):
+                    draw.text((70 + 20 * level, y_pos), text,
+                             fill=(255, 255, 255) if level == 0 else (200, 200, 200), font=text_font)
+                    y_pos += 25
+                y_pos += _SECTION_GAP[order_type]
+                continue
+            for rendered in islice(entries[order_type], order_count):
+                draw.text((70, y_pos), f"{_display_name(rendered)}: {rendered.summary}", 
                          fill=(255, 255, 255), font=text_font)
                 y_pos += 25
-            y_pos += 20
-        
-        # Döner orders
-        if doner_orders:
-            draw.text((50, y_pos), "Döner Orders:", fill=(255, 220, 100), font=header_font)
-            y_pos += 30
-            for order in doner_orders:
-                product_map = {
-                    "doner": "Döner",
-                    "durum": "Dürüm",
-                    "falafel-doner": "Falafel-Döner",
-                    "falafel-durum": "Falafel-Dürüm",
-                    "box": "Dönerbox"
-                }
-                shop_map = {
-                    "bruder": "Döner Bruder",
-                    "king": "King Kebabo's",
-                    "aldi": "Aldi Döner"
-                }
-                product = product_map.get(order.get("product", ""), order.get("product", ""))
-                shop = shop_map.get(order.get("shop", ""), order.get("shop", ""))
-                
-                box_type = ""
-                if order.get("product") == "box" and "boxType" in order:
-                    box_map = {"pommes": "mit Pommes", "salat": "mit Salat"}
-                    box_type = f" ({box_map.get(order['boxType'], order['boxType'])})"
-                
-                draw.text((70, y_pos), f"{order.get('name', '')}: {product}{box_type} ({shop})", 
-                         fill=(255, 255, 255), font=text_font)
-                y_pos += 25
-                
-                sauces = ", ".join(order.get("sauces", [])) or "keine"
-                draw.text((90, y_pos), f"Soßen: {sauces}", fill=(200, 200, 200), font=text_font)
-                y_pos += 25
-                
-                extras = []
-                for extra in order.get("extras", []):
-                    if isinstance(extra, str) and extra.startswith("custom:"):
-                        extras.append(extra[7:])  # Remove "custom:" prefix
-                    else:
-                        extras.append(extra)
-                extras_str = ", ".join(extras) or "keine"
-                draw.text((90, y_pos), f"Extras: {extras_str}", fill=(200, 200, 200), font=text_font)
-                y_pos += 25
-                
-                spice_map = {"none": "nicht scharf", "normal": "normal scharf", "extra": "sehr scharf"}
-                spice = spice_map.get(order.get("spiceLevel", ""), order.get("spiceLevel", ""))
-                draw.text((90, y_pos), f"Schärfe: {spice}", fill=(200, 200, 200), font=text_font)
-                y_pos += 40
-        
-        # Edeka orders
-        if edeka_orders:
-            draw.text((50, y_pos), "Edeka Orders:", fill=(255, 220, 100), font=header_font)
-            y_pos += 30
-            for order in edeka_orders:
-                product = order.get("product", "")
-                if product == "Salat":
-                    draw.text((70, y_pos), f"{order.get('name', '')}: Salatbar - {order.get('salatType', '')}", 
-                             fill=(255, 255, 255), font=text_font)
-                elif product == "Bäcker":
-                    draw.text((70, y_pos), f"{order.get('name', '')}: Bäcker - {order.get('baeckerItem', '')}", 
-                             fill=(255, 255, 255), font=text_font)
-                else:
-                    draw.text((70, y_pos), f"{order.get('name', '')}: {product} - Sauce: {order.get('sauce', 'keine')}", 
-                             fill=(255, 255, 255), font=text_font)
-                y_pos += 25
+                if order_type == "doner":
+                    for detail in rendered.details:
+                        draw.text((90, y_pos), detail, fill=(200, 200, 200), font=text_font)
+                        y_pos += 25
+                    y_pos += 15
+            y_pos += _SECTION_GAP[order_type]
         
         # Footer
         draw.line([(50, height-60), (width-50, height-60)], fill=(100, 100, 100), width=2)
         draw.text((50, height-40), "Enjoy your meal! | LunchSquad - Team Lunch Organizer", 
                  fill=(180, 180, 180), font=text_font)
         
-        return img
-        
+        yield img
+
+@timed("create_image_report", _image_orders)
+def create_image_report(orders, summary=None):
+    """
+    Create an image report of orders
+    Returns a PIL Image object (the first page for reports with several
+    pages, see iter_image_report_pages)
+    """
+    try:
+        return next(iter_image_report_pages(orders, summary), None)
     except Exception as e:
         print(f"Error creating image: {e}")
         return None
 
-def create_download_link_image(img, filename="orders.png", link_text="Download PNG"):
+def write_image_export(orders, buffer, summary=None):
     """
-    Create a download link for an image
+    Write the image report to a binary buffer: a PNG for a single page,
+    otherwise a ZIP archive with one PNG per page
     """
-    try:
-        buf = io.BytesIO()
-        img.save(buf, format='PNG')
-        buf.seek(0)
-        b64 = base64.b64encode(buf.read()).decode()
-        href = f'data:image/png;base64,{b64}'
-        return href
-    except Exception as e:
-        print(f"Error creating image download link: {e}")
-        return ""
+    if summary is None:
+        summary = OrderSummary.from_orders(orders)
+    if image_report_page_count(orders, summary) <= 1:
+        img = create_image_report(orders, summary)
+        if img is None:
+            raise ValueError("Could not create image report")
+        img.save(buffer, format='PNG')
+        return
+    
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for page_number, img in enumerate(iter_image_report_pages(orders, summary), start=1):
+            page_buffer = io.BytesIO()
+            img.save(page_buffer, format='PNG', compress_level=1)
+            archive.writestr(f"lunch_orders_{page_number}.png", page_buffer.getvalue())
 
 def format_timestamp(timestamp):
     """Format an ISO timestamp into a readable format"""
@@ -330,69 +339,21 @@ def format_timestamp(timestamp):
     except (ValueError, TypeError):
         return str(timestamp)
 
+def _validate_single(order, order_type):
+    """Validate one order (see validation.validate_order)"""
+    error = validate_order(order, order_type=order_type)
+    if error is not None:
+        return (False, error)
+    return (True, "")
+
 def validate_yamyam_order(order):
     """Validate YamYam order specifics"""
-    name = order.get("name", "").strip()
-    number = order.get("number", "").strip()
-    
-    if not name:
-        return (False, "Bitte gib deinen Namen ein.")
-    
-    if not number:
-        return (False, "Bitte gib eine Nummer ein.")
-    
-    try:
-        num = int(number)
-        if num < 1 or num > 100:  # Assuming max 100 items on menu
-            return (False, "Bitte gib eine gültige Nummer ein (1-100).")
-    except ValueError:
-        return (False, "Bitte gib eine gültige Nummer ein.")
-    
-    return (True, "")
+    return _validate_single(order, "yamyam")
 
 def validate_doner_order(order):
     """Validate Döner order specifics"""
-    name = order.get("name", "").strip()
-    shop = order.get("shop", "")
-    product = order.get("product", "")
-    sauces = order.get("sauces", [])
-    
-    if not name:
-        return (False, "Bitte gib deinen Namen ein.")
-    
-    if not shop:
-        return (False, "Bitte wähle einen Laden aus.")
-    
-    if not product:
-        return (False, "Bitte wähle ein Produkt aus.")
-    
-    if product == "box" and "boxType" not in order:
-        return (False, "Bitte wähle einen Box-Typ aus.")
-    
-    if len(sauces) > 2:
-        return (False, "Bitte wähle maximal 2 Soßen aus.")
-    
-    extras = [e for e in order.get("extras", []) if not (isinstance(e, str) and e.startswith("custom:"))]
-    if len(extras) > 3:
-        return (False, "Bitte wähle maximal 3 Standard-Extras aus.")
-    
-    return (True, "")
+    return _validate_single(order, "doner")
 
 def validate_edeka_order(order):
     """Validate Edeka order specifics"""
-    name = order.get("name", "").strip()
-    product = order.get("product", "")
-    
-    if not name:
-        return (False, "Bitte gib deinen Namen ein.")
-    
-    if not product:
-        return (False, "Bitte wähle ein Produkt aus.")
-    
-    if product == "Salat" and not order.get("salatType"):
-        return (False, "Bitte wähle eine Salat-Option aus.")
-    
-    if product == "Bäcker" and not order.get("baeckerItem", "").strip():
-        return (False, "Bitte gib an, was du vom Bäcker möchtest.")
-    
-    return (True, "")
\ No newline at end of file
+    return _validate_single(order, "edeka")
\ No newline at end of file
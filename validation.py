@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Order validation for the LunchSquad application.
+
+validate_orders checks a whole list (or DataFrame) of orders at once: the
+fields are pulled out column by column and every rule is evaluated as a
+mask over all orders of a type, so validating an import of 100k orders
+costs a few list passes instead of 100k validator calls. validate_order
+applies the same rules to a single order (the form validators in utils.py)
+with plain comparisons, as the array setup would cost more than the check.
+"""
+
+import re
+import sys
+from itertools import repeat
+from config import DONER_OPTIONS, EDEKA_OPTIONS, YAMYAM_OPTIONS
+
+# numpy is imported by the functions that use it, so importing this module
+# (the form validators in utils.py do) doesn't load it at startup
+
+MAX_SAUCES = 2
+MAX_EXTRAS = 3
+
+_SAUCES = frozenset(DONER_OPTIONS["sauce_values"])
+_EXTRAS = frozenset(DONER_OPTIONS["extra_values"])
+_SHOPS = frozenset(DONER_OPTIONS["shop_values"])
+_BOX_TYPES = frozenset(DONER_OPTIONS["box_values"])
+_SPICE_LEVELS = frozenset(DONER_OPTIONS["spice_values"])
+_EDEKA_SAUCES = frozenset(EDEKA_OPTIONS["sauces"])
+_WHOLE_NUMBER = re.compile(r"[+-]?\d+")
+
+
+def _is_missing(value):
+    # None or NaN (missing cell of a DataFrame)
+    return value is None or value != value
+
+
+def _strip(value):
+    """Stripped text of a value ("" for missing or non-text values)"""
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _as_list(value):
+    """A value as a list (missing value as empty list, other values as None)"""
+    return value if isinstance(value, list) else ([] if _is_missing(value) else None)
+
+
+def _is_unknown(value, allowed):
+    """Check whether a value is given but not one of allowed (also non-text values)"""
+    return not (_is_missing(value) or value == "") and not (isinstance(value, str) and value in allowed)
+
+
+def _is_not_text(value):
+    return not (_is_missing(value) or isinstance(value, str))
+
+
+def _standard_extras(items):
+    # Custom extras ("custom:...") are free text and don't count
+    return None if items is None else [e for e in items if not (isinstance(e, str) and e.startswith("custom:"))]
+
+
+def _text(values):
+    """Stripped text of each value ("" for missing or non-text values)"""
+    import numpy as np
+    return np.array(list(map(_strip, values)), dtype=object)
+
+
+def _items(values):
+    """Each value as a list (missing values as empty list, other values as None)"""
+    return list(map(_as_list, values))
+
+
+def _unknown(values, allowed):
+    """Values that are given but not one of allowed (also non-text values)"""
+    return _flags(map(_is_unknown, values, repeat(allowed)))
+
+
+def _not_text(values):
+    """Values that are given but not text"""
+    return _flags(map(_is_not_text, values))
+
+
+def _number(texts):
+    """Menu numbers entered as text as floats (NaN if not a whole number)"""
+    import numpy as np
+    return np.array([float(text) if _WHOLE_NUMBER.fullmatch(text) else np.nan for text in texts])
+
+
+def _is_frame(orders):
+    # pandas is imported lazily; without it loaded there can't be a DataFrame
+    pandas = sys.modules.get("pandas")
+    return pandas is not None and isinstance(orders, pandas.DataFrame)
+
+
+def _flags(values):
+    import numpy as np
+    return np.fromiter(values, dtype=bool)
+
+
+class _Columns:
+    """Column access for the orders of one type (order dicts or a DataFrame)"""
+
+    def __init__(self, orders):
+        self._orders = orders
+        self._is_frame = _is_frame(orders)
+
+    def get(self, name):
+        """Values of one field as a list (None or NaN where it is missing)"""
+        if self._is_frame:
+            if name not in self._orders:
+                return [None] * len(self._orders)
+            return self._orders[name].tolist()
+        return list(map(dict.get, self._orders, repeat(name)))
+
+
+def _yamyam_rules(columns):
+    import numpy as np
+    max_number = YAMYAM_OPTIONS["max_number"]
+    numbers = columns.get("number")
+    number = _text(numbers)
+    value = _number(number)
+    return [
+        (_text(columns.get("name")) == "", "Bitte gib deinen Namen ein."),
+        (_not_text(numbers), 'Ungültige Nummer-Angabe (Text erwartet, z. B. "12").'),
+        (number == "", "Bitte gib eine Nummer ein."),
+        (np.isnan(value), "Bitte gib eine gültige Nummer ein."),
+        (~((value >= 1) & (value <= max_number)), f"Bitte gib eine gültige Nummer ein (1-{max_number})."),
+    ]
+
+
+def _doner_rules(columns):
+    product = _text(columns.get("product"))
+    shop = columns.get("shop")
+    sauces = _items(columns.get("sauces"))
+    extras = _items(columns.get("extras"))
+    standard_extras = list(map(_standard_extras, extras))
+    return [
+        (_text(columns.get("name")) == "", "Bitte gib deinen Namen ein."),
+        (_text(shop) == "", "Bitte wähle einen Laden aus."),
+        (_unknown(shop, _SHOPS), "Unbekannter Laden."),
+        (product == "", "Bitte wähle ein Produkt aus."),
+        ((product == "box") & _flags(map(_is_missing, columns.get("boxType"))),
+         "Bitte wähle einen Box-Typ aus."),
+        (_unknown(columns.get("boxType"), _BOX_TYPES), "Unbekannter Box-Typ."),
+        (_unknown(columns.get("spiceLevel"), _SPICE_LEVELS), "Unbekannte Schärfe."),
+        (_flags(items is None for items in sauces), "Ungültige Soßen-Angabe."),
+        (_flags(items is None for items in extras), "Ungültige Extras-Angabe."),
+        (_flags(items is not None and len(items) > MAX_SAUCES for items in sauces),
+         f"Bitte wähle maximal {MAX_SAUCES} Soßen aus."),
+        (_flags(items is not None and len(items) > MAX_EXTRAS for items in standard_extras),
+         f"Bitte wähle maximal {MAX_EXTRAS} Standard-Extras aus."),
+        (_flags(items is not None and not _SAUCES.issuperset(items) for items in sauces),
+         "Unbekannte Soße."),
+        (_flags(items is not None and not _EXTRAS.issuperset(items) for items in standard_extras),
+         "Unbekanntes Extra."),
+    ]
+
+
+def _edeka_rules(columns):
+    product = _text(columns.get("product"))
+    return [
+        (_text(columns.get("name")) == "", "Bitte gib deinen Namen ein."),
+        (product == "", "Bitte wähle ein Produkt aus."),
+        ((product == "Salat") & (_text(columns.get("salatType")) == ""),
+         "Bitte wähle eine Salat-Option aus."),
+        ((product == "Bäcker") & (_text(columns.get("baeckerItem")) == ""),
+         "Bitte gib an, was du vom Bäcker möchtest."),
+        (_unknown(columns.get("sauce"), _EDEKA_SAUCES), "Unbekannte Sauce."),
+    ]
+
+
+_RULES = {
+    "yamyam": _yamyam_rules,
+    "doner": _doner_rules,
+    "edeka": _edeka_rules,
+}
+
+
+# Single orders: the rules above in the same order, as plain comparisons
+
+def _yamyam_error(order):
+    max_number = YAMYAM_OPTIONS["max_number"]
+    number = _strip(order.get("number"))
+    if not _strip(order.get("name")):
+        return "Bitte gib deinen Namen ein."
+    if _is_not_text(order.get("number")):
+        return 'Ungültige Nummer-Angabe (Text erwartet, z. B. "12").'
+    if not number:
+        return "Bitte gib eine Nummer ein."
+    if not _WHOLE_NUMBER.fullmatch(number):
+        return "Bitte gib eine gültige Nummer ein."
+    if not 1 <= int(number) <= max_number:
+        return f"Bitte gib eine gültige Nummer ein (1-{max_number})."
+    return None
+
+
+def _doner_error(order):
+    product = _strip(order.get("product"))
+    shop = order.get("shop")
+    sauces = _as_list(order.get("sauces"))
+    extras = _as_list(order.get("extras"))
+    standard_extras = _standard_extras(extras)
+    if not _strip(order.get("name")):
+        return "Bitte gib deinen Namen ein."
+    if not _strip(shop):
+        return "Bitte wähle einen Laden aus."
+    if _is_unknown(shop, _SHOPS):
+        return "Unbekannter Laden."
+    if not product:
+        return "Bitte wähle ein Produkt aus."
+    if product == "box" and _is_missing(order.get("boxType")):
+        return "Bitte wähle einen Box-Typ aus."
+    if _is_unknown(order.get("boxType"), _BOX_TYPES):
+        return "Unbekannter Box-Typ."
+    if _is_unknown(order.get("spiceLevel"), _SPICE_LEVELS):
+        return "Unbekannte Schärfe."
+    if sauces is None:
+        return "Ungültige Soßen-Angabe."
+    if extras is None:
+        return "Ungültige Extras-Angabe."
+    if len(sauces) > MAX_SAUCES:
+        return f"Bitte wähle maximal {MAX_SAUCES} Soßen aus."
+    if len(standard_extras) > MAX_EXTRAS:
+        return f"Bitte wähle maximal {MAX_EXTRAS} Standard-Extras aus."
+    if not _SAUCES.issuperset(sauces):
+        return "Unbekannte Soße."
+    if not _EXTRAS.issuperset(standard_extras):
+        return "Unbekanntes Extra."
+    return None
+
+
+def _edeka_error(order):
+    product = _strip(order.get("product"))
+    if not _strip(order.get("name")):
+        return "Bitte gib deinen Namen ein."
+    if not product:
+        return "Bitte wähle ein Produkt aus."
+    if product == "Salat" and not _strip(order.get("salatType")):
+        return "Bitte wähle eine Salat-Option aus."
+    if product == "Bäcker" and not _strip(order.get("baeckerItem")):
+        return "Bitte gib an, was du vom Bäcker möchtest."
+    if _is_unknown(order.get("sauce"), _EDEKA_SAUCES):
+        return "Unbekannte Sauce."
+    return None
+
+
+_SINGLE_RULES = {
+    "yamyam": _yamyam_error,
+    "doner": _doner_error,
+    "edeka": _edeka_error,
+}
+
+
+def validate_order(order, order_type=None):
+    """
+    Validate a single order dict (same rules and messages as validate_orders).
+
+    Args:
+        order (dict): The order to check
+        order_type (str): Validate the order as this type instead of its
+            "type" field
+
+    Returns:
+        str: Error message of the first failed rule (None if the order is valid)
+    """
+    if not isinstance(order, dict):
+        return "Keine Bestellung (JSON-Objekt erwartet)."
+    if order_type is None:
+        order_type = order.get("type")
+    rules = _SINGLE_RULES.get(order_type) if isinstance(order_type, str) else None
+    if rules is None:
+        return f"Unbekannter Bestelltyp: {order_type}"
+    return rules(order)
+
+
+def validate_orders(orders, order_type=None):
+    """
+    Validate a list of order dicts or a DataFrame of orders.
+
+    Args:
+        orders (list or pd.DataFrame): The orders to check
+        order_type (str): Validate all orders as this type instead of
+            their "type" field (used by the single-order validators)
+
+    Returns:
+        dict: Error message per invalid row (list position, or index label
+              for a DataFrame); only the first failed rule is reported
+    """
+    import numpy as np
+    is_frame = _is_frame(orders)
+    if is_frame:
+        is_order = np.ones(len(orders), dtype=bool)
+    else:
+        is_order = _flags(isinstance(order, dict) for order in orders)
+    messages = np.full(len(orders), None, dtype=object)
+    if order_type is None:
+        types = np.array(_Columns(orders if is_frame else [
+            order if isinstance(order, dict) else {} for order in orders
+        ]).get("type"), dtype=object)
+        unknown = np.flatnonzero(~np.isin(types, list(_RULES)) & is_order)
+        messages[unknown] = [f"Unbekannter Bestelltyp: {types[row]}" for row in unknown]
+    else:
+        types = np.full(len(orders), order_type, dtype=object)
+    messages[~is_order] = "Keine Bestellung (JSON-Objekt erwartet)."
+
+    for name, rules in _RULES.items():
+        rows = np.flatnonzero((types == name) & is_order)
+        if not len(rows):
+            continue
+        subset = orders.iloc[rows] if is_frame else [orders[row] for row in rows]
+        # Apply the rules in reverse, so the first failed rule wins
+        for mask, message in reversed(rules(_Columns(subset))):
+            messages[rows[mask]] = message
+
+    invalid = np.flatnonzero(messages != None)  # noqa: E711 (element-wise)
+    if is_frame:
+        return {orders.index[row]: messages[row] for row in invalid}
+    return {int(row): messages[row] for row in invalid}
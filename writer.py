@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Debounced background writer for the LunchSquad application.
+
+With coalesced durability (see DURABILITY in config.py) the OrderManager
+only applies a change in memory and marks the writer dirty. A background
+thread then persists all changes of the debounce window in one write, so
+a burst of adds and removes costs one write and a submit never waits for
+the file. Pending changes are also written on demand (flush, e.g. the
+"Speichern" button) and when the process exits.
+"""
+
+import atexit
+import threading
+import time
+import weakref
+
+# Writers of this process, flushed at exit (weak, so managers can be freed)
+_WRITERS = weakref.WeakSet()
+
+
+class DebouncedWriter:
+    """
+    Calls flush in a background thread at most debounce seconds after the
+    first change that is not written yet.
+
+    The window starts with the first unwritten change (not the last one),
+    so a steady stream of changes is still written every debounce seconds
+    and at most one window of changes is at risk. The thread only runs
+    while there is something to write.
+    """
+
+    def __init__(self, flush, debounce):
+        self._flush = flush
+        self.debounce = debounce
+        self.dirty = False
+        self._dirty_since = None
+        self._condition = threading.Condition()
+        self._thread = None
+        _WRITERS.add(self)
+
+    def mark_dirty(self):
+        """Note a change; it is written within the debounce window"""
+        with self._condition:
+            if self.dirty:
+                return
+            self.dirty = True
+            self._dirty_since = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="order-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Write pending changes now (in the calling thread)"""
+        with self._condition:
+            self.dirty = False
+        self._flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self.dirty:
+                    # Nothing left to write: the next change starts a new thread
+                    self._thread = None
+                    return
+                delay = self._dirty_since + self.debounce - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                self.dirty = False
+            try:
+                self._flush()
+            except Exception as e:
+                print(f"Error writing orders in the background: {e}")
+
+
+@atexit.register
+def flush_all():
+    """Write the pending changes of all writers (at interpreter exit)"""
+    for writer in list(_WRITERS):
+        try:
+            writer.flush()
+        except Exception as e:
+            print(f"Error writing orders at exit: {e}")